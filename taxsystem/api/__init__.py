@@ -9,7 +9,8 @@ from ninja.security import django_auth
 from django.conf import settings
 
 # AA TaxSystem
-from taxsystem.api import admin, corporation, filters, logs, payments
+from taxsystem.api import admin, corporation, exports, filters, logs, payments
+from taxsystem.decorators import instrument_operation
 
 api = NinjaAPI(
     title="TaxSystem API",
@@ -26,6 +27,8 @@ def setup(ninja_api):
     payments.PaymentsApiEndpoints(ninja_api)
     logs.LogsApiEndpoints(ninja_api)
     filters.FilterApiEndpoints(ninja_api)
+    exports.ExportApiEndpoints(ninja_api)
+    ninja_api.add_decorator(instrument_operation)
 
 
 # Initialize API endpoints
@@ -6,33 +6,45 @@ from ninja import NinjaAPI, Schema
 
 # Django
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import Sum
+from django.db.models import BooleanField, Case, CharField, Q, Sum, Value, When
 from django.utils import timezone
 from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
+from allianceauth.authentication.models import CharacterOwnership
 from allianceauth.services.hooks import get_extension_logger
 
 # AA TaxSystem
 from taxsystem import __title__
-from taxsystem.api.helpers import core
+from taxsystem.api.helpers import compact, core, datatables
 from taxsystem.api.helpers.icons import (
     get_taxsystem_manage_action_icons,
 )
 from taxsystem.api.helpers.statistics import (
     StatisticsResponse,
     create_dashboard_common_data,
+    get_dashboard_snapshot,
+    set_dashboard_snapshot,
 )
 from taxsystem.api.schema import (
     AccountSchema,
+    CompactAccountSchema,
+    CompactDataTableResponseSchema,
+    CompactResponseSchema,
     DashboardDivisionsSchema,
+    DataTableResponseSchema,
     DataTableSchema,
     OwnerSchema,
+    PaymentSystemCompactSchema,
     PaymentSystemSchema,
     UpdateStatusSchema,
 )
 from taxsystem.helpers import lazy
+from taxsystem.helpers.cache import (
+    invalidate_dashboard_statistics,
+    invalidate_menu_badges,
+)
 from taxsystem.models.corporation import (
     CorporationOwner,
     CorporationWalletJournalEntry,
@@ -43,6 +55,22 @@ from taxsystem.providers import AppLogger
 
 logger = AppLogger(get_extension_logger(__name__), __title__)
 
+# DataTables column data name -> ORM field used for server-side ordering
+TAX_ACCOUNTS_ORDERABLE_COLUMNS = {
+    "account.character_name": "user__profile__main_character__character_name",
+    "status": "status",
+    "deposit": "deposit",
+    "has_paid": "paid",
+    "last_paid": "last_paid",
+    "next_due": "next_due",
+}
+# DataTables column data name -> ORM lookup used for per-column filters
+TAX_ACCOUNTS_COLUMN_FILTERS = {
+    "account.character_name": "user__profile__main_character__character_name__icontains",
+    "has_paid": "payment_state",
+}
+TAX_ACCOUNTS_SEARCH_FIELDS = ["name", "user__profile__main_character__character_name"]
+
 
 class DashboardResponse(Schema):
     owner: OwnerSchema
@@ -83,6 +111,11 @@ class AdminApiEndpoints:
             if perms is False:
                 return 403, {"error": _("Permission Denied.")}
 
+            # Serve the dashboard from the cache until the owner changes
+            dashboard = get_dashboard_snapshot(owner)
+            if dashboard is not None:
+                return dashboard
+
             divisions = (
                 CorporationWalletDivision.objects.filter(corporation=owner)
                 if isinstance(owner, CorporationOwner)
@@ -118,17 +151,32 @@ class AdminApiEndpoints:
                 activity=wallet_activity,
                 **common_data,
             )
+            set_dashboard_snapshot(owner, dashboard_response)
             return dashboard_response
 
         @api.get(
             "owner/{owner_id}/manage/tax-accounts/",
-            response={200: list, 403: dict, 404: dict},
+            response={
+                200: list
+                | CompactDataTableResponseSchema
+                | DataTableResponseSchema
+                | CompactResponseSchema,
+                403: dict,
+                404: dict,
+            },
             tags=self.tags,
         )
         def get_tax_accounts(request, owner_id: int):
             """
             This Endpoint retrieves the tax accounts associated with a specific owner.
 
+            If the request is sent by a DataTable in server-side mode (``draw`` parameter),
+            search, ordering and pagination are applied in the database and only the
+            requested page is returned wrapped in a DataTables envelope.
+
+            With the ``compact`` parameter the rows only contain their state, the client
+            renders the actions from the row state and the capabilities of the response.
+
             Args:
                 request (WSGIRequest): The HTTP request object.
                 owner_id (int): The ID of the owner whose tax accounts are to be retrieved.
@@ -145,6 +193,7 @@ class AdminApiEndpoints:
                 return 403, {"error": _("Permission Denied.")}
 
             # Get Tax Accounts for Owner except those missing main character
+            now = timezone.now()
             tax_accounts = (
                 owner.account_model.objects.filter(
                     owner=owner,
@@ -154,41 +203,130 @@ class AdminApiEndpoints:
                 .select_related(
                     "user", "user__profile", "user__profile__main_character"
                 )
-                .prefetch_related("user__character_ownerships__character")
-            )
-
-            tax_accounts_list: list[PaymentSystemSchema] = []
-            for account in tax_accounts:
-                # Build tax account data
-                tax_account_data = PaymentSystemSchema(
-                    account=AccountSchema(
-                        character_id=account.user.profile.main_character.character_id,
-                        character_name=account.user.profile.main_character.character_name,
-                        character_portrait=lazy.get_character_portrait_url(
-                            account.user.profile.main_character.character_id,
-                            size=32,
-                            as_html=True,
+                .annotate(
+                    paid=Case(
+                        When(
+                            owner.account_model.get_paid_filter(now),
+                            then=Value(True),
                         ),
-                        alt_ids=account.get_alt_ids(),
+                        default=Value(False),
+                        output_field=BooleanField(),
                     ),
-                    status=account.get_payment_status(),
-                    deposit=account.deposit,
-                    has_paid=DataTableSchema(
-                        raw=account.has_paid,
-                        display=account.has_paid_icon(badge=True),
-                        sort=str(int(account.has_paid)),
+                )
+                .annotate(
+                    payment_state=Case(
+                        When(~Q(status=AccountStatus.ACTIVE), then=Value("inactive")),
+                        When(paid=True, then=Value("paid")),
+                        default=Value("unpaid"),
+                        output_field=CharField(),
                     ),
-                    last_paid=account.last_paid,
-                    next_due=account.next_due,
-                    is_active=account.is_active,
-                    actions=str(
-                        get_taxsystem_manage_action_icons(
-                            request=request, account=account, checkbox=True
+                )
+            )
+
+            is_compact = compact.is_compact(request)
+
+            def _build_tax_account_rows(accounts) -> list[PaymentSystemSchema]:
+                accounts = list(accounts)
+                # Alt IDs of all users of the page with a single query
+                alt_ids: dict[int, list[int]] = {}
+                for user_id, character_id in CharacterOwnership.objects.filter(
+                    user_id__in={account.user_id for account in accounts}
+                ).values_list("user_id", "character__character_id"):
+                    alt_ids.setdefault(user_id, []).append(character_id)
+
+                rows = []
+                for account in accounts:
+                    # The owner is already loaded, avoid a lazy load per row
+                    account.owner = owner
+                    main_character = account.user.profile.main_character
+                    if is_compact:
+                        rows.append(
+                            PaymentSystemCompactSchema(
+                                account_id=account.pk,
+                                account=CompactAccountSchema(
+                                    character_id=main_character.character_id,
+                                    character_name=main_character.character_name,
+                                    alt_ids=alt_ids.get(account.user_id, []),
+                                ),
+                                status=account.get_payment_status(),
+                                deposit=account.deposit,
+                                has_paid=account.paid,
+                                last_paid=account.last_paid,
+                                next_due=account.next_due,
+                                is_active=account.is_active,
+                            )
                         )
-                    ),
+                        continue
+                    rows.append(
+                        PaymentSystemSchema(
+                            account=AccountSchema(
+                                character_id=main_character.character_id,
+                                character_name=main_character.character_name,
+                                character_portrait=lazy.get_character_portrait_url(
+                                    main_character.character_id,
+                                    size=32,
+                                    as_html=True,
+                                ),
+                                alt_ids=alt_ids.get(account.user_id, []),
+                            ),
+                            status=account.get_payment_status(),
+                            deposit=account.deposit,
+                            has_paid=DataTableSchema(
+                                raw=account.paid,
+                                display=account.has_paid_icon(
+                                    badge=True, paid=account.paid
+                                ),
+                                sort=str(int(account.paid)),
+                            ),
+                            last_paid=account.last_paid,
+                            next_due=account.next_due,
+                            is_active=account.is_active,
+                            actions=str(
+                                get_taxsystem_manage_action_icons(
+                                    request=request, account=account, checkbox=True
+                                )
+                            ),
+                        )
+                    )
+                return rows
+
+            # The endpoint already requires manage permissions for the owner
+            capabilities = (
+                compact.Capability.MANAGE_ACCOUNTS | compact.Capability.BULK_ACTIONS
+            )
+
+            if datatables.is_server_side(request):
+                dt_request = datatables.parse_datatable_request(
+                    request, orderable=TAX_ACCOUNTS_ORDERABLE_COLUMNS
+                )
+                page = datatables.paginate_datatable(
+                    queryset=tax_accounts,
+                    dt_request=dt_request,
+                    search_fields=TAX_ACCOUNTS_SEARCH_FIELDS,
+                    column_filters=TAX_ACCOUNTS_COLUMN_FILTERS,
+                    default_order=["user__profile__main_character__character_name"],
                 )
-                tax_accounts_list.append(tax_account_data)
-            return tax_accounts_list
+                if is_compact:
+                    return CompactDataTableResponseSchema(
+                        draw=dt_request.draw,
+                        recordsTotal=page.records_total,
+                        recordsFiltered=page.records_filtered,
+                        capabilities=capabilities,
+                        data=_build_tax_account_rows(page.queryset),
+                    )
+                return DataTableResponseSchema(
+                    draw=dt_request.draw,
+                    recordsTotal=page.records_total,
+                    recordsFiltered=page.records_filtered,
+                    data=_build_tax_account_rows(page.queryset),
+                )
+
+            if is_compact:
+                return CompactResponseSchema(
+                    capabilities=capabilities,
+                    data=_build_tax_account_rows(tax_accounts),
+                )
+            return _build_tax_account_rows(tax_accounts)
 
         @api.post(
             "owner/{owner_id}/account/{account_pk}/manage/switch-account/",
@@ -295,6 +433,8 @@ class AdminApiEndpoints:
 
             owner.tax_amount = value
             owner.save()
+            invalidate_dashboard_statistics(owner)
+            invalidate_menu_badges()
 
             # Create log message
             msg = format_lazy(
@@ -356,6 +496,12 @@ class AdminApiEndpoints:
 
             owner.tax_period = value
             owner.save()
+            # The due dates depend on the tax period
+            owner.account_model.objects.filter(owner=owner).update(
+                **owner.account_model.payment_state_expressions(value)
+            )
+            invalidate_dashboard_statistics(owner)
+            invalidate_menu_badges()
 
             # Create log message
             msg = format_lazy(
@@ -427,6 +573,12 @@ class AdminApiEndpoints:
             else:
                 msg = _("Please select a valid action")
                 return 400, {"success": False, "message": msg}
+            # Sync the payment state with the new status
+            owner.account_model.objects.filter(owner=owner, pk__in=pks_ids).update(
+                **owner.account_model.payment_state_expressions(owner.tax_period)
+            )
+            invalidate_dashboard_statistics(owner)
+            invalidate_menu_badges()
 
             # Create log message
             msg = format_lazy(
@@ -14,12 +14,15 @@ from allianceauth.services.hooks import get_extension_logger
 
 # AA TaxSystem
 from taxsystem import __title__
-from taxsystem.api.helpers import core
+from taxsystem.api.helpers import compact, core
 from taxsystem.api.helpers.icons import (
     get_members_delete_button,
 )
 from taxsystem.api.schema import (
     CharacterSchema,
+    CompactCharacterSchema,
+    CompactResponseSchema,
+    MembersCompactSchema,
     MembersSchema,
 )
 from taxsystem.forms import DeleteMemberForm
@@ -43,13 +46,16 @@ class CorporationApiEndpoints:
     def __init__(self, api: NinjaAPI):
         @api.get(
             "owner/{owner_id}/view/members/",
-            response={200: list, 403: dict, 404: dict},
+            response={200: list | CompactResponseSchema, 403: dict, 404: dict},
             tags=self.tags,
         )
         def get_members(request, owner_id: int):
             """
             This Endpoint retrieves the members of the according Owner.
 
+            With the ``compact`` parameter the rows only contain their state, the client
+            renders the actions from the row state and the capabilities of the response.
+
             Args:
                 request (WSGIRequest): The HTTP request object.
                 owner_id (int): The ID of the owner whose members are to be retrieved.
@@ -77,6 +83,29 @@ class CorporationApiEndpoints:
                     .order_by("character_name")
                 )
 
+            if compact.is_compact(request):
+                capabilities = compact.Capability(0)
+                # Missing members can only be deleted from Corporation Owners
+                if isinstance(owner, CorporationOwner):
+                    capabilities |= compact.Capability.MANAGE_MEMBERS
+                return CompactResponseSchema(
+                    capabilities=capabilities,
+                    data=[
+                        MembersCompactSchema(
+                            member_id=member.pk,
+                            character=CompactCharacterSchema(
+                                character_id=member.character_id,
+                                character_name=member.character_name,
+                            ),
+                            is_missing=member.is_missing,
+                            is_noaccount=member.is_noaccount,
+                            status=member.get_status_display(),
+                            joined=member.joined,
+                        )
+                        for member in members
+                    ],
+                )
+
             response_members_list: list[MembersSchema] = []
             for member in members:
                 actions = ""
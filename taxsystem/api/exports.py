@@ -0,0 +1,80 @@
+# Standard Library
+import datetime as dt
+
+# Third Party
+from ninja import NinjaAPI
+
+# Django
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA TaxSystem
+from taxsystem import __title__
+from taxsystem.api.helpers import core
+from taxsystem.helpers.export import (
+    EXPORT_TYPES,
+    get_export_filename,
+    get_export_queryset,
+    iter_csv,
+)
+from taxsystem.providers import AppLogger
+
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+
+class ExportApiEndpoints:
+    tags = ["Export"]
+
+    def __init__(self, api: NinjaAPI):
+        @api.get(
+            "owner/{owner_id}/manage/export/{export_type}/",
+            response={400: dict, 403: dict, 404: dict},
+            tags=self.tags,
+        )
+        def export_owner_data(
+            request: WSGIRequest,
+            owner_id: int,
+            export_type: str,
+            start: dt.date | None = None,
+            end: dt.date | None = None,
+        ):
+            """
+            This Endpoint streams the payments, tax accounts or wallet journal of an owner as CSV.
+
+            The rows are read in chunks and written to the response as they are read,
+            so large exports do not have to fit into memory.
+
+            Args:
+                request (WSGIRequest): The HTTP request object.
+                owner_id (int): The ID of the owner whose data is exported.
+                export_type (str): ``payments``, ``accounts`` or ``journal``.
+                start (date | None): First day of the exported payments or journal entries.
+                end (date | None): Last day of the exported payments or journal entries.
+            Returns:
+                StreamingHttpResponse: The CSV file, or an error message with appropriate status code.
+            """
+            if export_type not in EXPORT_TYPES:
+                return 400, {"error": _("Invalid export type.")}
+
+            # pylint: disable=duplicate-code
+            owner, perms = core.get_manage_owner(request, owner_id)
+
+            if owner is None:
+                return 404, {"error": _("Owner not Found.")}
+
+            if perms is False:
+                return 403, {"error": _("Permission Denied.")}
+
+            queryset = get_export_queryset(owner, export_type, start=start, end=end)
+            response = StreamingHttpResponse(
+                iter_csv(queryset, export_type), content_type="text/csv"
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="{get_export_filename(owner, export_type)}"'
+            )
+            logger.info("%s exported %s of %s", request.user, export_type, owner.name)
+            return response
@@ -205,6 +205,7 @@ class FilterApiEndpoints:
                     name=filter_set.name,
                     description=filter_set.description,
                     enabled=filter_set.enabled,
+                    hits=filter_set.hits,
                     status=DataTableSchema(
                         raw=filter_set.enabled,
                         display=get_filter_set_active_icon(filter_set=filter_set),
@@ -0,0 +1,38 @@
+# Standard Library
+from enum import IntFlag
+
+# Django
+from django.core.handlers.wsgi import WSGIRequest
+
+# AA TaxSystem
+from taxsystem.api.schema import RequestStatusSchema
+from taxsystem.models.helpers.textchoices import PaymentRequestStatus
+
+
+class Capability(IntFlag):
+    """
+    Actions the requesting user can perform on the rows of a compact response.
+
+    The bitmap is sent once per response, the client renders the action buttons
+    of each row from the row state and these flags.
+    """
+
+    MANAGE_PAYMENTS = 1
+    MANAGE_ACCOUNTS = 2
+    MANAGE_MEMBERS = 4
+    BULK_ACTIONS = 8
+
+
+def is_compact(request: WSGIRequest) -> bool:
+    """Return True if the client requested rows without rendered HTML."""
+    return request.GET.get("compact", "").lower() in ("1", "true")
+
+
+def get_request_statuses() -> dict[str, RequestStatusSchema]:
+    """Get the label and color of every payment request status."""
+    return {
+        status.value: RequestStatusSchema(
+            status=str(status.label), color=status.color()
+        )
+        for status in PaymentRequestStatus
+    }
@@ -3,9 +3,75 @@ from django.core.handlers.wsgi import WSGIRequest
 from django.utils.translation import gettext_lazy as _
 
 # AA TaxSystem
+from taxsystem.helpers.cache import (
+    OwnerRef,
+    get_cached_owner_ref,
+    invalidate_owner_ref,
+    set_cached_owner_ref,
+)
 from taxsystem.models.alliance import AllianceOwner
 from taxsystem.models.corporation import CorporationOwner
 
+OWNER_TYPES = {
+    "corporation": CorporationOwner,
+    "alliance": AllianceOwner,
+}
+
+# Permissions that show the manage actions of payments
+MANAGE_PERMISSIONS = {
+    "taxsystem.manage_own_corp",
+    "taxsystem.manage_corps",
+    "taxsystem.manage_own_alliance",
+    "taxsystem.manage_alliances",
+}
+
+# Related objects that are used by almost every API endpoint
+OWNER_SELECT_RELATED = {
+    "corporation": ["eve_corporation"],
+    "alliance": ["eve_alliance", "corporation", "corporation__eve_corporation"],
+}
+
+
+def _get_owner_queryset(owner_type: str):
+    return OWNER_TYPES[owner_type].objects.select_related(
+        *OWNER_SELECT_RELATED[owner_type]
+    )
+
+
+def resolve_owner(owner_id: int) -> CorporationOwner | AllianceOwner | None:
+    """
+    Get the corporation or alliance owner of an Eve ID.
+
+    The owner type of an ID is cached, so a known owner costs a single query.
+    Args:
+        owner_id (int): The Eve corporation or alliance ID of the owner
+    Returns:
+        CorporationOwner | AllianceOwner | None: The owner with its Eve data or None if not found
+    """
+    lookups = {
+        "corporation": {"eve_corporation__corporation_id": owner_id},
+        "alliance": {"eve_alliance__alliance_id": owner_id},
+    }
+
+    owner_ref = get_cached_owner_ref(owner_id)
+    if owner_ref is not None:
+        # The pk of a deleted owner can be reused by another owner
+        owner = (
+            _get_owner_queryset(owner_ref.owner_type)
+            .filter(pk=owner_ref.pk, **lookups[owner_ref.owner_type])
+            .first()
+        )
+        if owner is not None:
+            return owner
+        invalidate_owner_ref(owner_id)
+
+    for owner_type, lookup in lookups.items():
+        owner = _get_owner_queryset(owner_type).filter(**lookup).first()
+        if owner is not None:
+            set_cached_owner_ref(owner_id, OwnerRef(owner_type, owner.pk))
+            return owner
+    return None
+
 
 def get_manage_owner(
     request: WSGIRequest, owner_id: int
@@ -18,20 +84,10 @@ def get_manage_owner(
     Returns:
         tuple: A tuple containing the owner object (or None if not found) and a boolean indicating permission
     """
-    perms = True
-    try:
-        owner = CorporationOwner.objects.get(eve_corporation__corporation_id=owner_id)
-        visible = CorporationOwner.objects.manage_to(request.user)
-        if owner not in visible:
-            perms = False
-    except CorporationOwner.DoesNotExist:
-        try:
-            owner = AllianceOwner.objects.get(eve_alliance__alliance_id=owner_id)
-            visible = AllianceOwner.objects.manage_to(request.user)
-            if owner not in visible:
-                perms = False
-        except AllianceOwner.DoesNotExist:
-            return None, None
+    owner = resolve_owner(owner_id)
+    if owner is None:
+        return None, None
+    perms = type(owner).objects.manage_to(request.user).filter(pk=owner.pk).exists()
     return owner, perms
 
 
@@ -46,23 +102,24 @@ def get_owner(
     Returns:
         tuple: A tuple containing the owner object (or None if not found) and a boolean indicating permission
     """
-    perms = True
-    try:
-        owner = CorporationOwner.objects.get(eve_corporation__corporation_id=owner_id)
-        visible = CorporationOwner.objects.visible_to(request.user)
-        if owner not in visible:
-            perms = False
-    except CorporationOwner.DoesNotExist:
-        try:
-            owner = AllianceOwner.objects.get(eve_alliance__alliance_id=owner_id)
-            visible = AllianceOwner.objects.visible_to(request.user)
-            if owner not in visible:
-                perms = False
-        except AllianceOwner.DoesNotExist:
-            return None, False
+    owner = resolve_owner(owner_id)
+    if owner is None:
+        return None, False
+    perms = type(owner).objects.visible_to(request.user).filter(pk=owner.pk).exists()
     return owner, perms
 
 
+def has_manage_permission(request: WSGIRequest) -> bool:
+    """
+    Check if the user has any manage permission.
+    Args:
+        request (WSGIRequest): The HTTP request object containing user information from Alliance Auth
+    Returns:
+        bool: True if the user has at least one manage permission, False otherwise
+    """
+    return bool(request.user.get_user_permissions().intersection(MANAGE_PERMISSIONS))
+
+
 def get_character_permissions(request, character_id) -> bool:
     """
     Check if the user has permissions for the character.
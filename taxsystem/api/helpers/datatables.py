@@ -0,0 +1,165 @@
+# Standard Library
+from typing import NamedTuple
+
+# Django
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import models
+
+# Maximum page size a client can request in server-side mode
+DATATABLE_MAX_LENGTH = 1000
+
+
+class DataTableRequest(NamedTuple):
+    """
+    Parsed DataTables server-side processing request.
+
+    Attributes:
+        draw (int): Draw counter, echoed back to the client.
+        start (int): Offset of the first row.
+        length (int): Number of rows to return.
+        search (str): Global search value.
+        order_by (list[str]): ORM ordering expressions.
+        column_search (dict[str, str]): Per-column search values keyed by column data name.
+    """
+
+    draw: int
+    start: int
+    length: int
+    search: str
+    order_by: list[str]
+    column_search: dict[str, str]
+
+
+class DataTablePage(NamedTuple):
+    """
+    A single page of a DataTables server-side query.
+
+    Attributes:
+        records_total (int): Number of rows before filtering.
+        records_filtered (int): Number of rows after filtering.
+        queryset (QuerySet): The sliced queryset for the requested page.
+    """
+
+    records_total: int
+    records_filtered: int
+    queryset: models.QuerySet
+
+
+def is_server_side(request: WSGIRequest) -> bool:
+    """Return True if the request was sent by a DataTable in server-side mode."""
+    return "draw" in request.GET
+
+
+def _to_int(value: str | None, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_datatable_request(
+    request: WSGIRequest, orderable: dict[str, str]
+) -> DataTableRequest:
+    """
+    Parse the DataTables server-side query parameters.
+
+    Args:
+        request (WSGIRequest): The incoming HTTP request.
+        orderable (dict[str, str]): Mapping of column data names to ORM fields.
+    Returns:
+        DataTableRequest: The parsed request, only known columns are used for ordering.
+    """
+    params = request.GET
+
+    length = _to_int(params.get("length"), 10)
+    if length < 0 or length > DATATABLE_MAX_LENGTH:
+        length = DATATABLE_MAX_LENGTH
+
+    # Map column index -> column data name
+    columns: dict[int, str] = {}
+    column_search: dict[str, str] = {}
+    index = 0
+    while f"columns[{index}][data]" in params:
+        name = params.get(f"columns[{index}][data]", "")
+        columns[index] = name
+        # ColumnControl sends its header search separately from the column search
+        value = (
+            params.get(f"columns[{index}][search][value]", "").strip()
+            or params.get(f"columns[{index}][columnControl][search][value]", "").strip()
+        )
+        if value:
+            column_search[name] = value
+        index += 1
+
+    order_by: list[str] = []
+    index = 0
+    while f"order[{index}][column]" in params:
+        column = columns.get(_to_int(params.get(f"order[{index}][column]"), -1))
+        field = orderable.get(column)
+        if field:
+            prefix = "-" if params.get(f"order[{index}][dir]") == "desc" else ""
+            order_by.append(f"{prefix}{field}")
+        index += 1
+
+    return DataTableRequest(
+        draw=_to_int(params.get("draw"), 0),
+        start=max(_to_int(params.get("start"), 0), 0),
+        length=length,
+        search=params.get("search[value]", "").strip(),
+        order_by=order_by,
+        column_search=column_search,
+    )
+
+
+def paginate_datatable(
+    queryset: models.QuerySet,
+    dt_request: DataTableRequest,
+    search_fields: list[str],
+    column_filters: dict[str, str] | None = None,
+    default_order: list[str] | None = None,
+) -> DataTablePage:
+    """
+    Apply search, ordering and pagination of a DataTables request in SQL.
+
+    Args:
+        queryset (QuerySet): Base queryset, already restricted to visible rows.
+        dt_request (DataTableRequest): The parsed DataTables request.
+        search_fields (list[str]): ORM fields used for the global search.
+        column_filters (dict[str, str]): Mapping of column data names to ORM lookups,
+            values of ``__in`` lookups are comma separated.
+        default_order (list[str]): Ordering used when the client sends none.
+    Returns:
+        DataTablePage: Counts and the sliced queryset of the requested page.
+    """
+    records_total = queryset.count()
+
+    filtered = queryset
+    is_filtered = False
+    if dt_request.search and search_fields:
+        query = models.Q()
+        for field in search_fields:
+            query |= models.Q(**{f"{field}__icontains": dt_request.search})
+        filtered = filtered.filter(query)
+        is_filtered = True
+
+    for column, value in dt_request.column_search.items():
+        lookup = (column_filters or {}).get(column)
+        if lookup is None:
+            continue
+        if lookup.endswith("__in"):
+            value = [item for item in value.split(",") if item]
+        filtered = filtered.filter(**{lookup: value})
+        is_filtered = True
+
+    records_filtered = filtered.count() if is_filtered else records_total
+
+    # Always append the primary key so pages are stable
+    order_by = dt_request.order_by or list(default_order or [])
+    filtered = filtered.order_by(*order_by, "-pk")
+
+    page = filtered[dt_request.start : dt_request.start + dt_request.length]
+    return DataTablePage(
+        records_total=records_total,
+        records_filtered=records_filtered,
+        queryset=page,
+    )
@@ -8,6 +8,7 @@ from django.utils.translation import gettext_lazy as _
 from allianceauth.authentication.decorators import permissions_required
 
 # AA TaxSystem
+from taxsystem.api.helpers.core import has_manage_permission
 from taxsystem.models.alliance import (
     AllianceFilter,
     AllianceFilterSet,
@@ -117,6 +118,7 @@ def get_taxsystem_payments_action_icons(
     request: WSGIRequest,
     payment: CorporationPayments | AlliancePayments,
     checkbox: bool = False,
+    can_manage: bool | None = None,
 ) -> str | HttpResponse:
     """
     Generate HTML Action Icons for the Tax System Payments view.
@@ -130,19 +132,16 @@ def get_taxsystem_payments_action_icons(
         request (WSGIRequest): The HTTP request object containing user information.
         payment (CorporationPayments | AlliancePayments): The payment object.
         checkbox (bool): Whether to include a checkbox for bulk actions.
+        can_manage (bool | None): The precomputed manage permission of the user, checked if not given.
     Returns:
         SafeString: HTML string containing the action icons.
     """
-    manage_permission = [
-        "taxsystem.manage_own_corp",
-        "taxsystem.manage_corps",
-        "taxsystem.manage_own_alliance",
-        "taxsystem.manage_alliances",
-    ]
+    if can_manage is None:
+        can_manage = has_manage_permission(request)
 
     taxsystem_request_icons = "<div class='d-flex justify-content-end'>"
     taxsystem_request_icons += get_payments_info_button(payment=payment)
-    if request.user.get_user_permissions().intersection(set(manage_permission)):
+    if can_manage:
         # Only show approve/reject buttons for pending or needs approval payments
         if payment.request_status in [
             PaymentRequestStatus.PENDING,
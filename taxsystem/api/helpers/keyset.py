@@ -0,0 +1,104 @@
+# Standard Library
+import datetime as dt
+from typing import NamedTuple
+
+# Django
+from django.db import models
+
+# Default and maximum number of rows of a history page
+HISTORY_PAGE_SIZE = 100
+HISTORY_MAX_PAGE_SIZE = 1000
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+
+class KeysetPage(NamedTuple):
+    """
+    A single page of a keyset paginated query.
+
+    Attributes:
+        rows (list): The rows of the page.
+        next_cursor (str | None): Cursor to continue in the same direction, None if there are no more rows.
+        since_cursor (str | None): Cursor to poll for rows newer than the newest row seen.
+    """
+
+    rows: list
+    next_cursor: str | None
+    since_cursor: str | None
+
+
+def encode_cursor(date: dt.datetime, pk: int) -> str:
+    """Encode the position of a row as ``<microseconds since epoch>_<pk>``."""
+    return f"{(date - _EPOCH) // dt.timedelta(microseconds=1)}_{pk}"
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    micros, pk = cursor.split("_")
+    try:
+        return _EPOCH + dt.timedelta(microseconds=int(micros)), int(pk)
+    except OverflowError as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def paginate_keyset(
+    queryset: models.QuerySet,
+    limit: int = HISTORY_PAGE_SIZE,
+    before: str | None = None,
+    since: str | None = None,
+) -> KeysetPage:
+    """
+    Paginate a queryset by ``(date, pk)`` instead of an offset.
+
+    Without ``since`` the rows are returned newest first, starting after ``before``.
+    With ``since`` only rows newer than the cursor are returned oldest first,
+    so a client can poll for new rows by passing the returned since_cursor again.
+
+    Args:
+        queryset (QuerySet): Base queryset with a ``date`` field, already restricted to the owner.
+        limit (int): Number of rows, clamped to HISTORY_MAX_PAGE_SIZE.
+        before (str | None): Cursor of the last row of the previous page.
+        since (str | None): Cursor of the newest row seen, takes precedence over ``before``.
+    Returns:
+        KeysetPage: The rows and the cursors of the adjacent pages.
+    Raises:
+        ValueError: If a cursor is malformed.
+    """
+    limit = min(max(limit, 1), HISTORY_MAX_PAGE_SIZE)
+
+    if since:
+        date, pk = decode_cursor(since)
+        queryset = queryset.filter(
+            models.Q(date__gt=date) | models.Q(date=date, pk__gt=pk)
+        ).order_by("date", "pk")
+    else:
+        if before:
+            date, pk = decode_cursor(before)
+            queryset = queryset.filter(
+                models.Q(date__lt=date) | models.Q(date=date, pk__lt=pk)
+            )
+        queryset = queryset.order_by("-date", "-pk")
+
+    # Fetch one extra row to know if there is another page
+    rows = list(queryset[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last_cursor = encode_cursor(rows[-1].date, rows[-1].pk) if rows else None
+
+    if since:
+        since_cursor = last_cursor or since
+    elif before is None and rows:
+        since_cursor = encode_cursor(rows[0].date, rows[0].pk)
+    else:
+        since_cursor = None
+
+    return KeysetPage(
+        rows=rows,
+        next_cursor=last_cursor if has_more else None,
+        since_cursor=since_cursor,
+    )
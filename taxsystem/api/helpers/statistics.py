@@ -2,6 +2,7 @@
 from ninja import Schema
 
 # Django
+from django.core.cache import cache
 from django.db.models import Count, F, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -16,6 +17,8 @@ from taxsystem.api.schema import (
     DivisionSchema,
     UpdateStatusSchema,
 )
+from taxsystem.app_settings import TAXSYSTEM_DASHBOARD_CACHE_TIMEOUT
+from taxsystem.helpers.cache import get_dashboard_cache_name, get_owner_cache_key
 from taxsystem.models.alliance import (
     AllianceOwner,
 )
@@ -60,6 +63,27 @@ class StatisticsResponse(Schema):
     members: MembersStatisticsSchema
 
 
+def get_dashboard_snapshot(owner: CorporationOwner | AllianceOwner) -> dict | None:
+    """
+    Get the cached dashboard data of an owner in the active language.
+
+    Returns:
+        dict | None: The cached dashboard data or None if it has to be rebuilt.
+    """
+    return cache.get(get_owner_cache_key(owner, get_dashboard_cache_name()))
+
+
+def set_dashboard_snapshot(
+    owner: CorporationOwner | AllianceOwner, dashboard: Schema
+) -> None:
+    """Cache the dashboard data of an owner in the active language until it changes."""
+    cache.set(
+        get_owner_cache_key(owner, get_dashboard_cache_name()),
+        dashboard.model_dump(),
+        TAXSYSTEM_DASHBOARD_CACHE_TIMEOUT,
+    )
+
+
 def create_dashboard_common_data(owner, divisions):
     """
     Create common dashboard data structure
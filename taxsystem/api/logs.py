@@ -2,6 +2,7 @@
 from ninja import NinjaAPI
 
 # Django
+from django.core.handlers.wsgi import WSGIRequest
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -11,9 +12,12 @@ from allianceauth.services.hooks import get_extension_logger
 # AA TaxSystem
 from taxsystem import __title__
 from taxsystem.api.helpers import core
+from taxsystem.api.helpers.keyset import HISTORY_PAGE_SIZE, paginate_keyset
 from taxsystem.api.schema import (
+    AdminHistoryPageSchema,
     AdminHistorySchema,
     DataTableSchema,
+    PaymentHistoryPageSchema,
     PaymentHistorySchema,
 )
 from taxsystem.providers import AppLogger
@@ -27,18 +31,32 @@ class LogsApiEndpoints:
     def __init__(self, api: NinjaAPI):
         @api.get(
             "owner/{owner_id}/view/payment-history/",
-            response={200: list[PaymentHistorySchema], 403: dict, 404: dict},
+            response={200: PaymentHistoryPageSchema, 400: dict, 403: dict, 404: dict},
             tags=self.tags,
         )
-        def get_payments_history(request, owner_id: int):
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        def get_payments_history(
+            request: WSGIRequest,
+            owner_id: int,
+            limit: int = HISTORY_PAGE_SIZE,
+            before: str | None = None,
+            since: str | None = None,
+            action: str | None = None,
+            user: str | None = None,
+        ):
             """
-            This Endpoint retrieves the payments logs associated with a specific owner.
+            This Endpoint retrieves a page of the payments logs associated with a specific owner.
 
             Args:
                 request (WSGIRequest): The HTTP request object.
                 owner_id (int): The ID of the owner whose payments logs are to be retrieved.
+                limit (int): Number of logs per page.
+                before (str | None): Cursor of the last log of the previous page.
+                since (str | None): Only return logs newer than this cursor, oldest first.
+                action (str | None): Only return logs with this action.
+                user (str | None): Only return logs of the user with this username.
             Returns:
-                list[PaymentHistorySchema]: A response object containing the list of payments logs.
+                PaymentHistoryPageSchema: A response object containing the page of payments logs.
             """
             # pylint: disable=duplicate-code
             owner, perms = core.get_manage_owner(request, owner_id)
@@ -49,39 +67,67 @@ class LogsApiEndpoints:
             if perms is False:
                 return 403, {"error": _("Permission Denied.")}
 
-            logs = (
-                owner.admin_log_model.objects.filter(owner=owner)
-                .select_related("user")
-                .order_by("-date")
-            )
-
-            # Use generic helper function
-            response_admin_logs_list: list[PaymentHistorySchema] = []
-            for log in logs:
+            logs = owner.payment_history_model.objects.filter(
+                owner=owner
+            ).select_related("user")
+            if action:
+                logs = logs.filter(action=action)
+            if user:
+                logs = logs.filter(user__username=user)
+
+            try:
+                page = paginate_keyset(logs, limit=limit, before=before, since=since)
+            except ValueError:
+                return 400, {"error": _("Invalid cursor.")}
+
+            response_payment_logs_list: list[PaymentHistorySchema] = []
+            for log in page.rows:
                 response_log = PaymentHistorySchema(
                     log_id=log.pk,
-                    user_name=log.user.username,
+                    payment_id=log.payment_id,
+                    reviser=log.user.username if log.user else _("System"),
                     date=timezone.localtime(log.date).strftime("%Y-%m-%d %H:%M"),
                     action=log.get_action_display(),
                     comment=log.comment,
+                    status=log.get_new_status_display(),
                 )
-                response_admin_logs_list.append(response_log)
-            return response_admin_logs_list
+                response_payment_logs_list.append(response_log)
+            return PaymentHistoryPageSchema(
+                data=response_payment_logs_list,
+                next_cursor=page.next_cursor,
+                since_cursor=page.since_cursor,
+            )
 
         @api.get(
             "owner/{owner_id}/view/admin-history/",
-            response={200: list[AdminHistorySchema], 403: dict, 404: dict},
+            response={200: AdminHistoryPageSchema, 400: dict, 403: dict, 404: dict},
             tags=self.tags,
         )
-        def get_admin_history(request, owner_id: int):
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        def get_admin_history(
+            request: WSGIRequest,
+            owner_id: int,
+            limit: int = HISTORY_PAGE_SIZE,
+            before: str | None = None,
+            since: str | None = None,
+            action: str | None = None,
+            target: str | None = None,
+            user: str | None = None,
+        ):
             """
-            This Endpoint retrieves the admin logs associated with a specific owner.
+            This Endpoint retrieves a page of the admin logs associated with a specific owner.
 
             Args:
                 request (WSGIRequest): The HTTP request object.
                 owner_id (int): The ID of the owner whose admin logs are to be retrieved.
+                limit (int): Number of logs per page.
+                before (str | None): Cursor of the last log of the previous page.
+                since (str | None): Only return logs newer than this cursor, oldest first.
+                action (str | None): Only return logs with this action.
+                target (str | None): Only return logs with this target type.
+                user (str | None): Only return logs of the user with this username.
             Returns:
-                list[AdminHistorySchema]: A response object containing the list of admin logs.
+                AdminHistoryPageSchema: A response object containing the page of admin logs.
             """
             # pylint: disable=duplicate-code
             owner, perms = core.get_manage_owner(request, owner_id)
@@ -92,15 +138,23 @@ class LogsApiEndpoints:
             if perms is False:
                 return 403, {"error": _("Permission Denied.")}
 
-            logs = (
-                owner.admin_log_model.objects.filter(owner=owner)
-                .select_related("user")
-                .order_by("-date")
+            logs = owner.admin_log_model.objects.filter(owner=owner).select_related(
+                "user"
             )
+            if action:
+                logs = logs.filter(action=action)
+            if target:
+                logs = logs.filter(target=target)
+            if user:
+                logs = logs.filter(user__username=user)
+
+            try:
+                page = paginate_keyset(logs, limit=limit, before=before, since=since)
+            except ValueError:
+                return 400, {"error": _("Invalid cursor.")}
 
-            # Use generic helper function
             response_admin_logs_list: list[AdminHistorySchema] = []
-            for log in logs:
+            for log in page.rows:
                 response_log = AdminHistorySchema(
                     log_id=log.pk,
                     user_name=log.user.username,
@@ -114,4 +168,8 @@ class LogsApiEndpoints:
                     comment=log.comment,
                 )
                 response_admin_logs_list.append(response_log)
-            return response_admin_logs_list
+            return AdminHistoryPageSchema(
+                data=response_admin_logs_list,
+                next_cursor=page.next_cursor,
+                since_cursor=page.since_cursor,
+            )
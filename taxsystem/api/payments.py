@@ -18,20 +18,29 @@ from allianceauth.services.hooks import get_extension_logger
 
 # AA TaxSystem
 from taxsystem import __title__, forms
-from taxsystem.api.helpers import core
+from taxsystem.api.helpers import compact, core, datatables
 from taxsystem.api.helpers.icons import (
     get_taxsystem_manage_payments_action_icons,
     get_taxsystem_payments_action_icons,
 )
 from taxsystem.api.schema import (
     CharacterSchema,
+    CompactCharacterSchema,
+    CompactDataTableResponseSchema,
+    CompactResponseSchema,
+    DataTableResponseSchema,
     MembersSchema,
     OwnerSchema,
+    PaymentCompactSchema,
     PaymentHistorySchema,
     PaymentSchema,
     RequestStatusSchema,
 )
 from taxsystem.helpers import lazy
+from taxsystem.helpers.cache import (
+    invalidate_dashboard_statistics,
+    invalidate_menu_badges,
+)
 from taxsystem.models.corporation import (
     CorporationOwner,
 )
@@ -46,6 +55,23 @@ from taxsystem.providers import AppLogger
 
 logger = AppLogger(get_extension_logger(__name__), __title__)
 
+# DataTables column data name -> ORM field used for ordering
+PAYMENTS_ORDERABLE_COLUMNS = {
+    "character.character_name": "account__name",
+    "amount": "amount",
+    "date": "date",
+    "request_status.status": "request_status",
+    # Compact rows only carry the status code
+    "request_status": "request_status",
+}
+# DataTables column data name -> ORM lookup used for per-column filters
+PAYMENTS_COLUMN_FILTERS = {
+    "character.character_name": "account__name__icontains",
+    "request_status.status": "request_status__in",
+    "request_status": "request_status__in",
+}
+PAYMENTS_SEARCH_FIELDS = ["account__name", "reason", "reviser"]
+
 
 class PaymentCorporationSchema(PaymentSchema):
     character: CharacterSchema
@@ -70,6 +96,23 @@ class PaymentsDetailsResponse(Schema):
     payment_histories: list[PaymentHistorySchema]
 
 
+def _build_compact_payment_row(payment) -> PaymentCompactSchema:
+    return PaymentCompactSchema(
+        payment_id=payment.pk,
+        character=CompactCharacterSchema(
+            character_id=payment.character_id,
+            character_name=payment.account.name,
+        ),
+        amount=payment.amount,
+        date=payment.formatted_payment_date,
+        request_status=payment.request_status,
+        division_name=payment.division_name,
+        reviser=payment.reviser,
+        reason=payment.reason,
+        has_journal=payment.journal_id is not None,
+    )
+
+
 class PaymentsApiEndpoints:
     tags = ["Payments"]
 
@@ -77,7 +120,14 @@ class PaymentsApiEndpoints:
     def __init__(self, api: NinjaAPI):
         @api.get(
             "owner/{owner_id}/view/payments/",
-            response={200: list, 403: dict, 404: dict},
+            response={
+                200: list
+                | CompactDataTableResponseSchema
+                | DataTableResponseSchema
+                | CompactResponseSchema,
+                403: dict,
+                404: dict,
+            },
             tags=self.tags,
         )
         def get_payments(request: WSGIRequest, owner_id: int):
@@ -86,11 +136,19 @@ class PaymentsApiEndpoints:
             It checks for the owner's existence and the user's permissions
             before fetching and returning the payment data.
 
+            If the request is sent by a DataTable in server-side mode (``draw`` parameter),
+            search, ordering and pagination are applied in the database and only the
+            requested page is returned wrapped in a DataTables envelope.
+
+            With the ``compact`` parameter the rows only contain their state, the client
+            renders the actions from the row state and the capabilities of the response.
+
             Args:
                 request (WSGIRequest): The incoming HTTP request.
                 owner_id (int): The ID of the owner whose payments are to be retrieved.
             Returns:
-                A list of payment data if successful, or an error message with appropriate status code.
+                A list of payment data or a DataTables envelope if successful,
+                or an error message with appropriate status code.
             """
             owner, perms = core.get_owner(request, owner_id)
 
@@ -103,28 +161,30 @@ class PaymentsApiEndpoints:
             # Get Payments
             payments = (
                 owner.payment_model.objects.get_visible(user=request.user)
+                .filter(owner=owner)
                 .select_related(
                     "account",
                     "account__user",
                     "account__user__profile",
                     "account__user__profile__main_character",
+                    "journal__division",
                 )
                 .order_by("-date")
             )
 
-            # TODO for Larger datasets implement pagination and server side DataTables
-            # Limit to last 10,000 payments
-            payments = payments[:10000]
+            can_manage = core.has_manage_permission(request)
 
-            response_payments_list: list[PaymentCorporationSchema] = []
-            for payment in payments:
+            def _build_payment_row(payment) -> PaymentCorporationSchema:
                 character_portrait = lazy.get_character_portrait_url(
                     payment.character_id, size=32, as_html=True
                 )
                 # Create the action buttons
                 actions_html = str(
                     get_taxsystem_payments_action_icons(
-                        request=request, payment=payment, checkbox=True
+                        request=request,
+                        payment=payment,
+                        checkbox=True,
+                        can_manage=can_manage,
                     )
                 )
 
@@ -134,7 +194,7 @@ class PaymentsApiEndpoints:
                     color=PaymentRequestStatus(payment.request_status).color(),
                 )
 
-                response_payment = PaymentCorporationSchema(
+                return PaymentCorporationSchema(
                     payment_id=payment.pk,
                     character=CharacterSchema(
                         character_id=payment.character_id,
@@ -149,8 +209,56 @@ class PaymentsApiEndpoints:
                     reason=payment.reason,
                     actions=actions_html,
                 )
-                response_payments_list.append(response_payment)
-            return response_payments_list
+
+            is_compact = compact.is_compact(request)
+            if is_compact:
+                build_row = _build_compact_payment_row
+                capabilities = compact.Capability(0)
+                if can_manage:
+                    capabilities |= (
+                        compact.Capability.MANAGE_PAYMENTS
+                        | compact.Capability.BULK_ACTIONS
+                    )
+            else:
+                build_row = _build_payment_row
+
+            if datatables.is_server_side(request):
+                dt_request = datatables.parse_datatable_request(
+                    request, orderable=PAYMENTS_ORDERABLE_COLUMNS
+                )
+                page = datatables.paginate_datatable(
+                    queryset=payments,
+                    dt_request=dt_request,
+                    search_fields=PAYMENTS_SEARCH_FIELDS,
+                    column_filters=PAYMENTS_COLUMN_FILTERS,
+                    default_order=["-date"],
+                )
+                rows = [build_row(payment) for payment in page.queryset]
+                if is_compact:
+                    return CompactDataTableResponseSchema(
+                        draw=dt_request.draw,
+                        recordsTotal=page.records_total,
+                        recordsFiltered=page.records_filtered,
+                        capabilities=capabilities,
+                        statuses=compact.get_request_statuses(),
+                        data=rows,
+                    )
+                return DataTableResponseSchema(
+                    draw=dt_request.draw,
+                    recordsTotal=page.records_total,
+                    recordsFiltered=page.records_filtered,
+                    data=rows,
+                )
+
+            # Limit to last 10,000 payments
+            rows = [build_row(payment) for payment in payments[:10000]]
+            if is_compact:
+                return CompactResponseSchema(
+                    capabilities=capabilities,
+                    statuses=compact.get_request_statuses(),
+                    data=rows,
+                )
+            return rows
 
         @api.get(
             "owner/{owner_id}/view/my-payments/",
@@ -307,7 +415,11 @@ class PaymentsApiEndpoints:
 
         @api.get(
             "owner/{owner_id}/character/{character_id}/view/payments/",
-            response={200: list[PaymentSchema], 403: dict, 404: dict},
+            response={
+                200: list[PaymentSchema] | CompactResponseSchema,
+                403: dict,
+                404: dict,
+            },
             tags=self.tags,
         )
         def get_member_payments(request, owner_id: int, character_id: int):
@@ -322,13 +434,26 @@ class PaymentsApiEndpoints:
                 return 403, {"error": _("Permission Denied.")}
 
             # Filter payments by character
-            payments = owner.payment_model.objects.filter(
-                account__user__profile__main_character__character_id=character_id,
-                owner=owner,
-            ).order_by("-date")
+            payments = (
+                owner.payment_model.objects.filter(
+                    account__user__profile__main_character__character_id=character_id,
+                    owner=owner,
+                )
+                .select_related(
+                    "account__user__profile__main_character", "journal__division"
+                )
+                .order_by("-date")
+            )
             # Limit to last 10,000 payments
             payments = payments[:10000]
 
+            if compact.is_compact(request):
+                return CompactResponseSchema(
+                    capabilities=compact.Capability.MANAGE_PAYMENTS,
+                    statuses=compact.get_request_statuses(),
+                    data=[_build_compact_payment_row(payment) for payment in payments],
+                )
+
             response_payments_list: list[PaymentSchema] = []
             for payment in payments:
                 # Create the actions
@@ -869,6 +994,8 @@ class PaymentsApiEndpoints:
             else:
                 msg = _("Please select a valid action")
                 return 400, {"success": False, "message": msg}
+            invalidate_dashboard_statistics(owner)
+            invalidate_menu_badges()
 
             # Create log message
             msg = format_lazy(
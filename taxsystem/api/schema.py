@@ -13,6 +13,13 @@ class DataTableSchema(Schema):
     dropdown_text: str | None = None
 
 
+class DataTableResponseSchema(Schema):
+    draw: int
+    recordsTotal: int
+    recordsFiltered: int
+    data: list
+
+
 class RequestStatusSchema(Schema):
     status: str
     color: str | None = None
@@ -20,6 +27,17 @@ class RequestStatusSchema(Schema):
     html: str | None = None
 
 
+class CompactResponseSchema(Schema):
+    capabilities: int
+    statuses: dict[str, RequestStatusSchema] | None = None
+    data: list
+
+
+class CompactDataTableResponseSchema(DataTableResponseSchema):
+    capabilities: int
+    statuses: dict[str, RequestStatusSchema] | None = None
+
+
 class UpdateStatusSchema(RequestStatusSchema):
     status: dict
 
@@ -63,6 +81,15 @@ class AccountSchema(CharacterSchema):
     alt_ids: list[int] | None = None
 
 
+class CompactCharacterSchema(Schema):
+    character_id: int
+    character_name: str
+
+
+class CompactAccountSchema(CompactCharacterSchema):
+    alt_ids: list[int]
+
+
 class MembersSchema(Schema):
     character: CharacterSchema
     is_missing: bool
@@ -72,6 +99,15 @@ class MembersSchema(Schema):
     actions: str | None = None
 
 
+class MembersCompactSchema(Schema):
+    member_id: int
+    character: CompactCharacterSchema
+    is_missing: bool
+    is_noaccount: bool
+    status: str
+    joined: datetime
+
+
 class PaymentSchema(Schema):
     payment_id: int
     amount: int
@@ -83,6 +119,18 @@ class PaymentSchema(Schema):
     actions: str | None = None
 
 
+class PaymentCompactSchema(Schema):
+    payment_id: int
+    character: CompactCharacterSchema
+    amount: int
+    date: str
+    request_status: str
+    division_name: str
+    reason: str
+    reviser: str
+    has_journal: bool
+
+
 class PaymentSystemSchema(Schema):
     account: AccountSchema
     status: str
@@ -94,6 +142,17 @@ class PaymentSystemSchema(Schema):
     actions: str
 
 
+class PaymentSystemCompactSchema(Schema):
+    account_id: int
+    account: CompactAccountSchema
+    status: str
+    deposit: int
+    has_paid: bool
+    last_paid: datetime | None = None
+    next_due: datetime | None = None
+    is_active: bool
+
+
 class DivisionSchema(Schema):
     name: str
     balance: float
@@ -111,6 +170,7 @@ class PaymentHistorySchema(Schema):
     action: str
     comment: str
     status: str
+    payment_id: int | None = None
 
 
 class AdminHistorySchema(Schema):
@@ -122,11 +182,25 @@ class AdminHistorySchema(Schema):
     comment: str
 
 
+class HistoryPageSchema(Schema):
+    next_cursor: str | None = None
+    since_cursor: str | None = None
+
+
+class PaymentHistoryPageSchema(HistoryPageSchema):
+    data: list[PaymentHistorySchema]
+
+
+class AdminHistoryPageSchema(HistoryPageSchema):
+    data: list[AdminHistorySchema]
+
+
 class FilterSetModelSchema(Schema):
     owner_id: int
     name: str
     description: str
     enabled: bool
+    hits: int = 0
     status: DataTableSchema | None = None
     actions: str | None = None
 
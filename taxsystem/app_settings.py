@@ -27,9 +27,59 @@ TAXSYSTEM_STALE_TYPES = getattr(
     },
 )
 
+# Run all due sections of an owner in one task instead of a chain of section tasks
+TAXSYSTEM_UPDATE_PIPELINE = getattr(settings, "TAXSYSTEM_UPDATE_PIPELINE", False)
+
 # Controls how many database records are inserted in a single batch operation.
 TAXSYSTEM_BULK_BATCH_SIZE = getattr(settings, "TAXSYSTEM_BULK_BATCH_SIZE", 500)
 
+# Number of rows fetched from the database per chunk when exporting data
+TAXSYSTEM_EXPORT_CHUNK_SIZE = getattr(settings, "TAXSYSTEM_EXPORT_CHUNK_SIZE", 2000)
+
+# Maximum number of concurrent ESI requests for the wallet journal pages
+TAXSYSTEM_WALLET_MAX_WORKERS = getattr(settings, "TAXSYSTEM_WALLET_MAX_WORKERS", 4)
+
+# Maximum number of notification delivery tasks queued at the same time
+TAXSYSTEM_NOTIFICATION_MAX_WORKERS = getattr(
+    settings, "TAXSYSTEM_NOTIFICATION_MAX_WORKERS", 4
+)
+
+# Days after which a cached Eve entity name is refreshed in the background
+TAXSYSTEM_EVE_ENTITY_STALE_DAYS = getattr(
+    settings, "TAXSYSTEM_EVE_ENTITY_STALE_DAYS", 30
+)
+
+# Maximum time in seconds the dashboard statistics of an owner are cached.
+# The cache is also cleared when an update section finishes or accounts/payments change.
+TAXSYSTEM_DASHBOARD_CACHE_TIMEOUT = getattr(
+    settings, "TAXSYSTEM_DASHBOARD_CACHE_TIMEOUT", 3600
+)
+
+# Sinks that receive the duration, query, ESI call and written row counts
+# of every update section and API request
+TAXSYSTEM_METRICS_SINKS = getattr(
+    settings,
+    "TAXSYSTEM_METRICS_SINKS",
+    [
+        "taxsystem.helpers.instrumentation.LoggingSink",
+        "taxsystem.helpers.instrumentation.DatabaseSink",
+    ],
+)
+
+# Name prefixes the database sink does not store, every API request would
+# otherwise write to the shared rollup row of its operation
+TAXSYSTEM_METRICS_DATABASE_EXCLUDE = getattr(
+    settings, "TAXSYSTEM_METRICS_DATABASE_EXCLUDE", ["api."]
+)
+
+# Days the hourly metric rollups of the database sink are kept
+TAXSYSTEM_METRICS_RETENTION_DAYS = getattr(
+    settings, "TAXSYSTEM_METRICS_RETENTION_DAYS", 14
+)
+
+# Bearer token for the Prometheus metrics endpoint, superusers can always access it
+TAXSYSTEM_METRICS_TOKEN = getattr(settings, "TAXSYSTEM_METRICS_TOKEN", "")
+
 # Set Days when a notification is expired in days
 TAXSYSTEM_NOTIFICATION_EXPIRATION_DAYS = getattr(
     settings, "TAXSYSTEM_NOTIFICATION_EXPIRATION_DAYS", 1
@@ -1,6 +1,8 @@
 """Hook into Alliance Auth"""
 
 # Django
+from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
@@ -10,6 +12,8 @@ from allianceauth.services.hooks import MenuItemHook, UrlHook, get_extension_log
 
 # AA TaxSystem
 from taxsystem import __title__, app_settings, urls
+from taxsystem.helpers.cache import get_cached_menu_badge, set_cached_menu_badge
+from taxsystem.models.alliance import AlliancePaymentAccount, AlliancePayments
 from taxsystem.models.corporation import (
     CorporationPaymentAccount,
     CorporationPayments,
@@ -32,25 +36,47 @@ class TaxSystemMenuItem(MenuItemHook):
 
     def render(self, request: UserProfile):
         if request.user.has_perm("taxsystem.basic_access"):
-            # Check if the User has Paid for the current period and set count to 1 if not paid, otherwise 0
-            try:
-                payment_user = CorporationPaymentAccount.objects.get(user=request.user)
-                self.count = 1 if not payment_user.has_paid else 0
-            except CorporationPaymentAccount.DoesNotExist:
-                self.count = 0
-
-            if request.user.has_perm(
-                "taxsystem.manage_own_corp"
-            ) or request.user.has_perm("taxsystem.manage_corps"):
-                # Get the count of open invoices for the Managing user
-                invoices = CorporationPayments.objects.get_visible_open_invoices(
-                    request.user
-                )
-                self.count = invoices if invoices and invoices > 0 else self.count
+            count, version = get_cached_menu_badge(request.user.pk)
+            if count is None:
+                count = get_menu_badge_count(request.user)
+                set_cached_menu_badge(request.user.pk, count, version)
+            self.count = count
             return MenuItemHook.render(self, request)
         return ""
 
 
+def get_menu_badge_count(user: User) -> int:
+    """
+    Get the menu badge count of a user.
+
+    Managers see the count of their visible open invoices,
+    other users 1 if one of their tax accounts is not paid.
+    """
+    # Check if the User has Paid for the current period and set count to 1 if not paid, otherwise 0
+    now = timezone.now()
+    count = 0
+    for account_model in (CorporationPaymentAccount, AlliancePaymentAccount):
+        if (
+            account_model.objects.filter(user=user)
+            .exclude(account_model.get_paid_filter(now))
+            .exists()
+        ):
+            count = 1
+            break
+
+    # Get the count of open invoices for the Managing user
+    invoices = 0
+    if user.has_perm("taxsystem.manage_own_corp") or user.has_perm(
+        "taxsystem.manage_corps"
+    ):
+        invoices += CorporationPayments.objects.get_visible_open_invoices(user) or 0
+    if user.has_perm("taxsystem.manage_own_alliance") or user.has_perm(
+        "taxsystem.manage_alliances"
+    ):
+        invoices += AlliancePayments.objects.get_visible_open_invoices(user) or 0
+    return invoices if invoices > 0 else count
+
+
 @hooks.register("menu_item_hook")
 def register_menu():
     """Register the menu item"""
@@ -62,4 +88,10 @@ def register_menu():
 def register_urls():
     """Register app urls"""
 
-    return UrlHook(urls, "taxsystem", r"^taxsystem/")
+    # The metrics are scraped with the bearer token, the view checks the access itself
+    return UrlHook(
+        urls,
+        "taxsystem",
+        r"^taxsystem/",
+        excluded_views=["taxsystem.views.metrics"],
+    )
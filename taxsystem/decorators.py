@@ -3,27 +3,35 @@ Decorators
 """
 
 # Standard Library
-import time
+from functools import wraps
 
+# AA TaxSystem
+from taxsystem.helpers.instrumentation import measure
 
-def log_timing(logs):
+
+def instrument(name: str | None = None):
     """
-    A Decorator to log the time a function takes to run.
+    A Decorator to measure each call of a function.
+
+    The owner is taken from the ``owner_id`` keyword argument, if given.
+
+    Args:
+        name (str | None): The metric name, defaults to the function name.
     """
 
     def decorator(func):
+        metric_name = name or func.__name__
+
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            end_time = time.time()
-            logs.debug(
-                "TIME: %s run for %s seconds with args: %s",
-                end_time - start_time,
-                func.__name__,
-                args,
-            )
-            return result
+            with measure(metric_name, owner_id=kwargs.get("owner_id")):
+                return func(*args, **kwargs)
 
         return wrapper
 
     return decorator
+
+
+def instrument_operation(func):
+    """Measure an API operation as ``api.<operation>``, see ``NinjaAPI.add_decorator``."""
+    return instrument(f"api.{func.__name__}")(func)
@@ -0,0 +1,214 @@
+"""Cache keys and invalidation for data that is cached per owner."""
+
+# Standard Library
+import threading
+from typing import TYPE_CHECKING, NamedTuple, Union
+from uuid import uuid4
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+if TYPE_CHECKING:
+    # AA TaxSystem
+    from taxsystem.models.alliance import AllianceOwner
+    from taxsystem.models.corporation import CorporationOwner
+
+DASHBOARD_CACHE = "dashboard"
+FILTER_ENGINE_CACHE = "filter-engine"
+TOKEN_CACHE = "token"
+MENU_BADGE_CACHE = "menu-badge"
+OWNER_REF_CACHE = "owner-ref"
+
+# ESI caches the corporation roles of a character for one hour
+TOKEN_CACHE_TIMEOUT = 60 * 60
+
+# Menu badges are recalculated at least every 5 minutes, an account becomes unpaid without a write
+MENU_BADGE_CACHE_TIMEOUT = 60 * 5
+
+# The type of an owner ID never changes, a deleted owner is resolved again
+OWNER_REF_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Version of all menu badges, changed when payments of any owner change
+MENU_BADGE_VERSION_KEY = f"taxsystem-{MENU_BADGE_CACHE}-version"
+
+
+def get_owner_cache_key(
+    owner: Union["CorporationOwner", "AllianceOwner"], name: str
+) -> str:
+    """Return the cache key of a cached object for an owner."""
+    return f"taxsystem-{name}-{owner._meta.model_name}-{owner.pk}"
+
+
+def invalidate_owner_cache(
+    owner: Union["CorporationOwner", "AllianceOwner"], *names: str
+) -> None:
+    """Drop the given cached objects of an owner."""
+    if owner is None:
+        return
+    cache.delete_many([get_owner_cache_key(owner, name) for name in names])
+
+
+def get_dashboard_cache_name(language: str | None = None) -> str:
+    """Return the cache name of the dashboard, the dashboard contains translated texts."""
+    return f"{DASHBOARD_CACHE}-{language or get_language() or settings.LANGUAGE_CODE}"
+
+
+def invalidate_dashboard_statistics(
+    owner: Union["CorporationOwner", "AllianceOwner"],
+) -> None:
+    """Drop the cached dashboard statistics of an owner in all languages."""
+    languages = {language[0] for language in settings.LANGUAGES}
+    languages.add(settings.LANGUAGE_CODE)
+    invalidate_owner_cache(
+        owner, *[get_dashboard_cache_name(language) for language in languages]
+    )
+
+
+class CacheCounter:
+    """Count the hits and misses of a cache in this process."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return the counters of the cache."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class CachedToken(NamedTuple):
+    """
+    The last token of an owner that had the required roles.
+
+    Attributes:
+        token_pk (int): The primary key of the token.
+        roles (list[str]): The corporation roles of the token character.
+    """
+
+    token_pk: int
+    roles: list[str]
+
+
+token_cache_counter = CacheCounter(TOKEN_CACHE)
+
+
+def _get_token_selection_key(scopes: list[str], req_roles: list[str]) -> str:
+    return f"{','.join(sorted(scopes))}|{','.join(sorted(req_roles))}"
+
+
+def get_cached_token(
+    owner: Union["CorporationOwner", "AllianceOwner"],
+    scopes: list[str],
+    req_roles: list[str],
+) -> CachedToken | None:
+    """Return the cached token selection of an owner for the scopes and roles."""
+    selections = cache.get(get_owner_cache_key(owner, TOKEN_CACHE)) or {}
+    cached = selections.get(_get_token_selection_key(scopes, req_roles))
+    return CachedToken(*cached) if cached is not None else None
+
+
+def set_cached_token(
+    owner: Union["CorporationOwner", "AllianceOwner"],
+    scopes: list[str],
+    req_roles: list[str],
+    token: CachedToken,
+) -> None:
+    """Remember the token selection of an owner for the scopes and roles."""
+    key = get_owner_cache_key(owner, TOKEN_CACHE)
+    selections = cache.get(key) or {}
+    selections[_get_token_selection_key(scopes, req_roles)] = tuple(token)
+    cache.set(key, selections, TOKEN_CACHE_TIMEOUT)
+
+
+def invalidate_token_cache(owner: Union["CorporationOwner", "AllianceOwner"]) -> None:
+    """Drop all cached token selections of an owner."""
+    invalidate_owner_cache(owner, TOKEN_CACHE)
+
+
+def _get_menu_badge_key(user_id: int) -> str:
+    return f"taxsystem-{MENU_BADGE_CACHE}-{user_id}"
+
+
+def get_cached_menu_badge(user_id: int) -> tuple[int | None, str | None]:
+    """
+    Return the cached menu badge count of a user with a single cache lookup.
+
+    Returns:
+        tuple: The count or None if it is not cached or outdated,
+            and the current badge version to pass to ``set_cached_menu_badge``.
+    """
+    key = _get_menu_badge_key(user_id)
+    values = cache.get_many([MENU_BADGE_VERSION_KEY, key])
+    version = values.get(MENU_BADGE_VERSION_KEY)
+    cached = values.get(key)
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1], version
+    return None, version
+
+
+def set_cached_menu_badge(user_id: int, count: int, version: str | None) -> None:
+    """Remember the menu badge count of a user for the badge version it was calculated for."""
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(MENU_BADGE_VERSION_KEY, version, None):
+            # Another process set the version first, calculate again on the next page
+            return
+    cache.set(_get_menu_badge_key(user_id), (version, count), MENU_BADGE_CACHE_TIMEOUT)
+
+
+def invalidate_menu_badges(user_id: int | None = None) -> None:
+    """Drop the cached menu badge of a user, or of all users if no user is given."""
+    if user_id is None:
+        cache.set(MENU_BADGE_VERSION_KEY, uuid4().hex, None)
+    else:
+        cache.delete(_get_menu_badge_key(user_id))
+
+
+class OwnerRef(NamedTuple):
+    """
+    The owner model and primary key of an Eve corporation or alliance ID.
+
+    Attributes:
+        owner_type (str): ``corporation`` or ``alliance``.
+        pk (int): The primary key of the owner.
+    """
+
+    owner_type: str
+    pk: int
+
+
+def _get_owner_ref_key(owner_id: int) -> str:
+    return f"taxsystem-{OWNER_REF_CACHE}-{owner_id}"
+
+
+def get_cached_owner_ref(owner_id: int) -> OwnerRef | None:
+    """Return the cached owner reference of an Eve corporation or alliance ID."""
+    cached = cache.get(_get_owner_ref_key(owner_id))
+    return OwnerRef(*cached) if cached is not None else None
+
+
+def set_cached_owner_ref(owner_id: int, owner_ref: OwnerRef) -> None:
+    """Remember the owner reference of an Eve corporation or alliance ID."""
+    cache.set(_get_owner_ref_key(owner_id), tuple(owner_ref), OWNER_REF_CACHE_TIMEOUT)
+
+
+def invalidate_owner_ref(owner_id: int) -> None:
+    """Drop the cached owner reference of an Eve corporation or alliance ID."""
+    cache.delete(_get_owner_ref_key(owner_id))
@@ -0,0 +1,38 @@
+"""Database helpers shared by the managers."""
+
+# Django
+from django.db import connections, models
+
+
+def bulk_upsert(
+    manager: models.Manager,
+    objs: list[models.Model],
+    unique_fields: list[str],
+    update_fields: list[str],
+    batch_size: int | None = None,
+) -> list[models.Model]:
+    """
+    Insert the objects and update the given fields of rows that already exist.
+
+    MySQL upserts on any unique key and does not accept a conflict target,
+    so the unique fields are only passed to backends that support them.
+
+    Args:
+        manager: The manager of the model to write.
+        objs: The objects to insert or update.
+        unique_fields: The fields of the unique key the rows conflict on.
+        update_fields: The fields to update on a conflict.
+        batch_size: Maximum number of objects per statement.
+    Returns:
+        list: The written objects.
+    """
+    features = connections[manager.db].features
+    return manager.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=(
+            unique_fields if features.supports_update_conflicts_with_target else None
+        ),
+        update_fields=update_fields,
+    )
@@ -0,0 +1,216 @@
+# Standard Library
+import csv
+import datetime as dt
+from collections.abc import Iterator
+from typing import NamedTuple
+
+# Django
+from django.db import models
+from django.utils import timezone
+
+# AA TaxSystem
+from taxsystem.app_settings import TAXSYSTEM_EXPORT_CHUNK_SIZE
+from taxsystem.models.alliance import AllianceOwner
+from taxsystem.models.corporation import CorporationOwner
+from taxsystem.models.wallet import CorporationWalletJournalEntry
+
+
+class ExportColumn(NamedTuple):
+    """
+    A single column of an export.
+
+    Attributes:
+        header (str): The CSV header of the column.
+        field (str): The ORM lookup of the value.
+    """
+
+    header: str
+    field: str
+
+
+class ExportDefinition(NamedTuple):
+    """
+    The columns of an export type.
+
+    Attributes:
+        columns (tuple[ExportColumn, ...]): The exported columns in order.
+        date_field (str | None): The field the date range applies to, None to ignore the date range.
+    """
+
+    columns: tuple[ExportColumn, ...]
+    date_field: str | None
+
+
+PAYMENTS_EXPORT = ExportDefinition(
+    columns=(
+        ExportColumn("payment_id", "pk"),
+        ExportColumn("entry_id", "entry_id"),
+        ExportColumn("account_id", "account_id"),
+        ExportColumn("name", "name"),
+        ExportColumn(
+            "character_id", "account__user__profile__main_character__character_id"
+        ),
+        ExportColumn("amount", "amount"),
+        ExportColumn("date", "date"),
+        ExportColumn("reason", "reason"),
+        ExportColumn("request_status", "request_status"),
+        ExportColumn("reviser", "reviser"),
+    ),
+    date_field="date",
+)
+
+ACCOUNTS_EXPORT = ExportDefinition(
+    columns=(
+        ExportColumn("account_id", "pk"),
+        ExportColumn("name", "name"),
+        ExportColumn("character_id", "user__profile__main_character__character_id"),
+        ExportColumn("character_name", "user__profile__main_character__character_name"),
+        ExportColumn("status", "status"),
+        ExportColumn("deposit", "deposit"),
+        ExportColumn("last_paid", "last_paid"),
+        ExportColumn("next_due", "next_due"),
+        ExportColumn("paid_until", "paid_until"),
+        ExportColumn("created", "date"),
+    ),
+    date_field=None,
+)
+
+JOURNAL_EXPORT = ExportDefinition(
+    columns=(
+        ExportColumn("entry_id", "entry_id"),
+        ExportColumn("division_id", "division__division_id"),
+        ExportColumn("date", "date"),
+        ExportColumn("ref_type", "ref_type"),
+        ExportColumn("amount", "amount"),
+        ExportColumn("balance", "balance"),
+        ExportColumn("first_party_id", "first_party_id"),
+        ExportColumn("first_party_name", "first_party__name"),
+        ExportColumn("second_party_id", "second_party_id"),
+        ExportColumn("second_party_name", "second_party__name"),
+        ExportColumn("reason", "reason"),
+        ExportColumn("description", "description"),
+        ExportColumn("context_id", "context_id"),
+        ExportColumn("context_id_type", "context_id_type"),
+        ExportColumn("tax", "tax"),
+        ExportColumn("tax_receiver_id", "tax_receiver_id"),
+    ),
+    date_field="date",
+)
+
+EXPORT_TYPES = {
+    "payments": PAYMENTS_EXPORT,
+    "accounts": ACCOUNTS_EXPORT,
+    "journal": JOURNAL_EXPORT,
+}
+
+
+# Spreadsheets evaluate cells that start with these characters as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object that returns each written line instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _escape_cell(value):
+    """Prefix player controlled text that a spreadsheet would run as formula."""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _start_of_day(day: dt.date) -> dt.datetime:
+    return timezone.make_aware(dt.datetime.combine(day, dt.time.min))
+
+
+def get_export_queryset(
+    owner: CorporationOwner | AllianceOwner,
+    export_type: str,
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+) -> models.QuerySet:
+    """
+    Get the rows of an export as tuples of the primary key and the columns in order.
+
+    The wallet journal of an Alliance Owner is the journal of its main corporation.
+
+    Args:
+        owner (CorporationOwner | AllianceOwner): The owner of the exported data
+        export_type (str): One of EXPORT_TYPES
+        start (date | None): First day of the date range
+        end (date | None): Last day of the date range, inclusive
+    Returns:
+        QuerySet: The values_list queryset ordered by primary key.
+    Raises:
+        KeyError: If the export type is unknown.
+    """
+    definition = EXPORT_TYPES[export_type]
+
+    if export_type == "payments":
+        queryset = owner.payment_model.objects.filter(owner=owner)
+    elif export_type == "accounts":
+        queryset = owner.account_model.objects.filter(owner=owner)
+    else:
+        corporation = (
+            owner if isinstance(owner, CorporationOwner) else owner.corporation
+        )
+        queryset = CorporationWalletJournalEntry.objects.filter(
+            division__corporation=corporation
+        )
+
+    # Compare with datetimes so the date index can be used
+    if definition.date_field and start:
+        queryset = queryset.filter(
+            **{f"{definition.date_field}__gte": _start_of_day(start)}
+        )
+    if definition.date_field and end:
+        queryset = queryset.filter(
+            **{
+                f"{definition.date_field}__lt": _start_of_day(
+                    end + dt.timedelta(days=1)
+                )
+            }
+        )
+
+    return queryset.order_by("pk").values_list(
+        "pk", *[column.field for column in definition.columns]
+    )
+
+
+def iter_csv(queryset: models.QuerySet, export_type: str) -> Iterator[str]:
+    """
+    Stream an export queryset as CSV lines.
+
+    Rows are fetched in primary key chunks of TAXSYSTEM_EXPORT_CHUNK_SIZE,
+    so the memory usage does not grow with the number of rows. MySQL loads the
+    whole result of a query into memory, even with ``QuerySet.iterator()``.
+
+    Args:
+        queryset (QuerySet): The queryset from get_export_queryset
+        export_type (str): One of EXPORT_TYPES
+    Yields:
+        str: The header line followed by one line per row.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(
+        [column.header for column in EXPORT_TYPES[export_type].columns]
+    )
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:TAXSYSTEM_EXPORT_CHUNK_SIZE])
+        for _, *values in rows:
+            yield writer.writerow([_escape_cell(value) for value in values])
+        if len(rows) < TAXSYSTEM_EXPORT_CHUNK_SIZE:
+            return
+        last_pk = rows[-1][0]
+
+
+def get_export_filename(
+    owner: CorporationOwner | AllianceOwner, export_type: str
+) -> str:
+    """Get the file name of an export, e.g. ``taxsystem-98000001-payments-2025-01-01.csv``."""
+    return f"taxsystem-{owner.eve_id}-{export_type}-{timezone.now():%Y-%m-%d}.csv"
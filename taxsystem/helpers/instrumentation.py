@@ -0,0 +1,229 @@
+# Standard Library
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import cache
+
+# Django
+from django.db import connection
+from django.utils.module_loading import import_string
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA TaxSystem
+from taxsystem import __title__
+from taxsystem.app_settings import (
+    TAXSYSTEM_METRICS_DATABASE_EXCLUDE,
+    TAXSYSTEM_METRICS_SINKS,
+)
+from taxsystem.providers import AppLogger
+
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+_WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_current_measurement: ContextVar["Measurement | None"] = ContextVar(
+    "taxsystem_measurement", default=None
+)
+
+
+@dataclass
+class Measurement:
+    """
+    The cost of a single run of an update section or API request.
+
+    Attributes:
+        name (str): The measured section or endpoint, e.g. ``section.wallet``.
+        owner_id (int | None): The Eve ID of the owner, None if unknown.
+        duration (float): Wall time in seconds.
+        queries (int): Number of database queries of the measuring thread.
+        esi_calls (int): Number of ESI requests that were not answered from the cache.
+        rows_written (int): Rows the database reported for insert, update and delete statements.
+        is_success (bool): False if the run raised an exception or had a token error.
+    """
+
+    name: str
+    owner_id: int | None = None
+    duration: float = 0.0
+    queries: int = 0
+    esi_calls: int = 0
+    rows_written: int = 0
+    is_success: bool = True
+    parent: "Measurement | None" = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count_query(self, execute, sql, params, many, context):
+        """Count a query, used as database execute wrapper."""
+        result = execute(sql, params, many, context)
+        self.queries += 1
+        if sql.lstrip()[:7].upper().startswith(_WRITE_STATEMENTS):
+            rowcount = context["cursor"].rowcount
+            if rowcount and rowcount > 0:
+                self.rows_written += rowcount
+        return result
+
+    def add_esi_call(self) -> None:
+        """Count an ESI request, ESI requests can be sent from worker threads."""
+        with self._lock:
+            self.esi_calls += 1
+        if self.parent is not None:
+            self.parent.add_esi_call()
+
+
+class MetricsSink:
+    """Receives every finished measurement, configured with TAXSYSTEM_METRICS_SINKS."""
+
+    def emit(self, measurement: Measurement) -> None:
+        raise NotImplementedError("Create emit method")
+
+
+class LoggingSink(MetricsSink):
+    """Write each measurement as one ``key=value`` debug log line."""
+
+    def emit(self, measurement: Measurement) -> None:
+        logger.debug(
+            "METRIC name=%s owner_id=%s duration=%.3f queries=%s esi_calls=%s rows_written=%s success=%s",
+            measurement.name,
+            measurement.owner_id,
+            measurement.duration,
+            measurement.queries,
+            measurement.esi_calls,
+            measurement.rows_written,
+            measurement.is_success,
+        )
+
+
+class DatabaseSink(MetricsSink):
+    """
+    Add each measurement to the hourly rollup of its name and owner.
+
+    Names that start with a prefix of TAXSYSTEM_METRICS_DATABASE_EXCLUDE are skipped.
+    """
+
+    def emit(self, measurement: Measurement) -> None:
+        if measurement.name.startswith(tuple(TAXSYSTEM_METRICS_DATABASE_EXCLUDE)):
+            return
+
+        # pylint: disable=import-outside-toplevel
+        # AA TaxSystem
+        from taxsystem.models.general import MetricRollup
+
+        MetricRollup.objects.record(measurement)
+
+
+@cache
+def get_sinks() -> list[MetricsSink]:
+    """Get the configured metric sinks."""
+    return [import_string(path)() for path in TAXSYSTEM_METRICS_SINKS]
+
+
+def _emit(measurement: Measurement) -> None:
+    for sink in get_sinks():
+        # A failing sink must not fail the measured section or request
+        try:
+            sink.emit(measurement)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error(
+                "Metric sink %s failed: %s", type(sink).__name__, exc, exc_info=True
+            )
+
+
+def current_measurement() -> Measurement | None:
+    """Get the measurement of the running section or request."""
+    return _current_measurement.get()
+
+
+def bind_measurement(measurement: Measurement | None) -> None:
+    """
+    Use the given measurement in the current thread.
+
+    Intended as ``ThreadPoolExecutor`` initializer,
+    so ESI calls of worker threads are counted for the section that started them.
+    """
+    _current_measurement.set(measurement)
+
+
+def count_esi_call() -> None:
+    """Count an ESI request for the running measurement."""
+    measurement = _current_measurement.get()
+    if measurement is not None:
+        measurement.add_esi_call()
+
+
+@contextmanager
+def measure(name: str, owner_id: int | None = None) -> Iterator[Measurement]:
+    """
+    Measure the enclosed block and send the result to the metric sinks.
+
+    Queries are counted on the database connection of the current thread,
+    ESI calls of all threads that are bound to the measurement.
+
+    Args:
+        name (str): The measured section or endpoint.
+        owner_id (int | None): The Eve ID of the owner.
+    Yields:
+        Measurement: The running measurement.
+    """
+    measurement = Measurement(
+        name=name, owner_id=owner_id, parent=_current_measurement.get()
+    )
+    token = _current_measurement.set(measurement)
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(measurement.count_query):
+            yield measurement
+    except Exception:
+        measurement.is_success = False
+        raise
+    finally:
+        measurement.duration = time.perf_counter() - start
+        _current_measurement.reset(token)
+        _emit(measurement)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(rows: Iterable[dict], owner_names: dict[int, str]) -> str:
+    """
+    Render metric rollup summaries in the Prometheus text format.
+
+    Args:
+        rows (Iterable[dict]): Summaries from ``MetricRollup.objects.summary()``.
+        owner_names (dict[int, str]): Mapping of owner Eve IDs to their names.
+    Returns:
+        str: The exposition text, one gauge family per measured value.
+    """
+    families = (
+        ("runs", "taxsystem_runs", "Number of runs"),
+        ("errors", "taxsystem_errors", "Number of failed runs"),
+        ("duration", "taxsystem_duration_seconds", "Total duration in seconds"),
+        (
+            "max_duration",
+            "taxsystem_duration_seconds_max",
+            "Longest run in seconds",
+        ),
+        ("queries", "taxsystem_queries", "Number of database queries"),
+        ("esi_calls", "taxsystem_esi_calls", "Number of ESI requests"),
+        ("rows_written", "taxsystem_rows_written", "Number of written rows"),
+    )
+    rows = list(rows)
+    lines = []
+    for key, metric, description in families:
+        lines.append(f"# HELP {metric} {description} in the summary window")
+        lines.append(f"# TYPE {metric} gauge")
+        for row in rows:
+            labels = ",".join(
+                [
+                    f'name="{_escape_label(row["name"])}"',
+                    f'owner_id="{row["owner_id"]}"',
+                    f'owner="{_escape_label(owner_names.get(row["owner_id"], ""))}"',
+                ]
+            )
+            lines.append(f"{metric}{{{labels}}} {row[key]}")
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,8 @@
 """This module provides lazy loading of some common functions and objects that are not needed for every request."""
 
+# Standard Library
+from functools import lru_cache
+
 # Django
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
@@ -12,6 +15,9 @@ from allianceauth.eveonline.evelinks.eveimageserver import (
     type_render_url,
 )
 
+# Number of logos kept per process, logos only depend on their arguments
+LOGO_CACHE_MAX_SIZE = 2048
+
 
 def get_character_portrait_url(
     character_id: int, size: int = 32, character_name: str = None, as_html: bool = False
@@ -32,6 +38,7 @@ def get_character_portrait_url(
     return render_url
 
 
+@lru_cache(maxsize=LOGO_CACHE_MAX_SIZE)
 def get_corporation_logo_url(
     corporation_id: int,
     size: int = 32,
@@ -52,6 +59,7 @@ def get_corporation_logo_url(
     return render_url
 
 
+@lru_cache(maxsize=LOGO_CACHE_MAX_SIZE)
 def get_alliance_logo_url(
     alliance_id: int,
     size: int = 32,
@@ -0,0 +1,62 @@
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA TaxSystem
+from taxsystem import __title__
+from taxsystem.models.alliance import AllianceOwner
+from taxsystem.models.corporation import CorporationOwner
+from taxsystem.providers import AppLogger
+
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+
+class Command(BaseCommand):
+    help = "Calculate the payment state (next due, paid until, next notification) of all tax accounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show how many accounts would be updated without updating them",
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+
+        total_updated = 0
+        for owner_model in (CorporationOwner, AllianceOwner):
+            for owner in owner_model.objects.all():
+                accounts = owner.account_model.objects.filter(owner=owner)
+                if dry_run:
+                    count = accounts.count()
+                else:
+                    with transaction.atomic():
+                        count = accounts.update(
+                            **owner.account_model.payment_state_expressions(
+                                owner.tax_period
+                            )
+                        )
+                    logger.debug(
+                        "Backfilled payment state of %s accounts for %s",
+                        count,
+                        owner.name,
+                    )
+                total_updated += count
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Dry run: Would update the payment state of {total_updated} tax account(s)"
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Successfully updated the payment state of {total_updated} tax account(s)"
+                )
+            )
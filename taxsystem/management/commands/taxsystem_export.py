@@ -0,0 +1,67 @@
+# Standard Library
+import datetime as dt
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA TaxSystem
+from taxsystem import __title__
+from taxsystem.api.helpers.core import resolve_owner
+from taxsystem.helpers.export import EXPORT_TYPES, get_export_queryset, iter_csv
+from taxsystem.providers import AppLogger
+
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+
+class Command(BaseCommand):
+    help = "Export the payments, tax accounts or wallet journal of an owner as CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "export_type",
+            choices=sorted(EXPORT_TYPES),
+            help="The data to export",
+        )
+        parser.add_argument(
+            "owner_id",
+            type=int,
+            help="The Eve corporation or alliance ID of the owner",
+        )
+        parser.add_argument(
+            "--start",
+            type=dt.date.fromisoformat,
+            help="First day of the exported payments or journal entries (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--end",
+            type=dt.date.fromisoformat,
+            help="Last day of the exported payments or journal entries (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the export to, defaults to stdout",
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        export_type = options["export_type"]
+        owner = resolve_owner(options["owner_id"])
+        if owner is None:
+            raise CommandError(f"Owner {options['owner_id']} not found")
+
+        queryset = get_export_queryset(
+            owner, export_type, start=options["start"], end=options["end"]
+        )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(iter_csv(queryset, export_type))
+            logger.info(
+                "Exported %s of %s to %s", export_type, owner.name, options["output"]
+            )
+        else:
+            for line in iter_csv(queryset, export_type):
+                self.stdout.write(line, ending="")
@@ -1,4 +1,5 @@
 # Standard Library
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 # Django
@@ -6,14 +7,22 @@ from django.db import models, transaction
 from django.utils import timezone
 
 # Alliance Auth
-from allianceauth.authentication.models import User, UserProfile
+from allianceauth.authentication.models import (
+    CharacterOwnership,
+    User,
+    UserProfile,
+)
 from allianceauth.services.hooks import get_extension_logger
 
 # AA TaxSystem
 from taxsystem import __title__
 from taxsystem.app_settings import TAXSYSTEM_BULK_BATCH_SIZE
-from taxsystem.decorators import log_timing
-from taxsystem.models.general import EveEntity, UpdateSectionResult
+from taxsystem.helpers.cache import invalidate_menu_badges
+from taxsystem.models.general import (
+    EveEntity,
+    TaxAccountReconciliation,
+    UpdateSectionResult,
+)
 from taxsystem.models.helpers.textchoices import (
     AccountStatus,
     CorporationUpdateSection,
@@ -38,10 +47,10 @@ if TYPE_CHECKING:
     )
     from taxsystem.models.corporation import CorporationPayments as PaymentsContext
     from taxsystem.models.corporation import Members as MembersContext
+    from taxsystem.models.helpers.payments import DeadlineResult
 
 
 class CorporationAccountManager(models.Manager["PaymentAccountContext"]):
-    @log_timing(logger)
     def update_or_create_tax_accounts(
         self, owner: "OwnerContext", force_refresh: bool = False
     ) -> UpdateSectionResult:
@@ -53,18 +62,14 @@ class CorporationAccountManager(models.Manager["PaymentAccountContext"]):
         )
 
     @transaction.atomic()
-    # pylint: disable=unused-argument, too-many-locals
+    # pylint: disable=unused-argument
     def _update_or_create_objs(
         self, owner: "OwnerContext", force_refresh: bool = False, runs: int = 0
     ) -> None:
         """Update or Create tax accounts entries from objs data."""
         # pylint: disable=import-outside-toplevel, cyclic-import
         # AA TaxSystem
-        from taxsystem.models.corporation import (
-            CorporationFilterSet,
-            CorporationPaymentHistory,
-            CorporationPayments,
-        )
+        from taxsystem.models.helpers.payments import PaymentApprover
 
         # TODO Create a Hash Tag to track changes better
         logger.debug(
@@ -72,73 +77,12 @@ class CorporationAccountManager(models.Manager["PaymentAccountContext"]):
             owner.name,
         )
 
-        payments = CorporationPayments.objects.filter(
-            account__owner=owner,
-            request_status__in=[
-                PaymentRequestStatus.PENDING,
-                PaymentRequestStatus.NEEDS_APPROVAL,
-            ],
-        )
-
-        _current_payment_ids = set(payments.values_list("id", flat=True))
-        _automatic_payment_ids = []
-
         # Check tax accounts before we process payments
         self._check_tax_accounts(owner)
 
-        # Check for any automatic payments
-        filters_obj = CorporationFilterSet.objects.filter(owner=owner)
-        for filter_obj in filters_obj:
-            f_payments = filter_obj.filter(payments)
-            for payment in f_payments:
-                # Process only pending or needs approval payments
-                if payment.request_status in [
-                    PaymentRequestStatus.PENDING,
-                    PaymentRequestStatus.NEEDS_APPROVAL,
-                ]:
-                    # Ensure all transfers are processed in a single transaction
-                    with transaction.atomic():
-                        payment.request_status = PaymentRequestStatus.APPROVED
-                        payment.reviser = "System"
-
-                        # Update payment pool for user
-                        self.filter(owner=owner, user=payment.account.user).update(
-                            deposit=payment.account.deposit + payment.amount
-                        )
-
-                        payment.save()
-
-                        CorporationPaymentHistory(
-                            user=payment.account.user,
-                            payment=payment,
-                            action=PaymentActions.STATUS_CHANGE,
-                            new_status=PaymentRequestStatus.APPROVED,
-                            comment=PaymentSystemText.AUTOMATIC,
-                        ).save()
-
-                        runs = runs + 1
-                        _automatic_payment_ids.append(payment.pk)
-
-        # Check for any payments that need approval
-        needs_approval = _current_payment_ids - set(_automatic_payment_ids)
-        approvals = CorporationPayments.objects.filter(
-            id__in=needs_approval,
-            request_status=PaymentRequestStatus.PENDING,
-        )
-
-        for payment in approvals:
-            payment.request_status = PaymentRequestStatus.NEEDS_APPROVAL
-            payment.save()
-
-            CorporationPaymentHistory(
-                user=payment.account.user,
-                payment=payment,
-                action=PaymentActions.STATUS_CHANGE,
-                new_status=PaymentRequestStatus.NEEDS_APPROVAL,
-                comment=PaymentSystemText.REVISER,
-            ).save()
-
-            runs = runs + 1
+        # Approve or flag all open payments in one batch
+        result = PaymentApprover(owner).run()
+        runs = runs + result.approved + result.needs_approval
 
         logger.debug(
             "Finished %s: Tax Account entrys for %s",
@@ -148,57 +92,138 @@ class CorporationAccountManager(models.Manager["PaymentAccountContext"]):
 
         return ("Finished Tax Accounts for %s", owner.name)
 
-    def _check_tax_accounts(self, owner: "OwnerContext"):
+    def _check_tax_accounts(self, owner: "OwnerContext") -> TaxAccountReconciliation:
         """
-        Check tax accounts for a corporation.
-        Create new accounts, update existing ones, and remove orphaned accounts.
+        Reconcile the tax accounts of a corporation with the Auth users.
+
+        The diff is computed in memory from one query per side, every account is
+        classified as new, orphaned, missing, returned or moved and the changes
+        are applied with bulk statements.
+
+        Returns:
+            TaxAccountReconciliation: The counts of the applied changes.
         """
+        # pylint: disable=import-outside-toplevel, cyclic-import
+        # AA TaxSystem
+        from taxsystem.models.corporation import CorporationOwner
+
         logger.debug("Checking Tax Accounts for: %s", owner.name)
-        items = []
 
-        # Get all existing accounts with a Main Character
-        auth_accounts = UserProfile.objects.filter(
-            main_character__isnull=False,
-        ).prefetch_related("user__profile__main_character")
-        auth_accounts_ids = set(auth_accounts.values_list("user_id", flat=True))
+        # Auth side: user_id -> (main character name, main corporation id, has account)
+        auth_users = {
+            user_id: (character_name, corporation_id, has_account)
+            for user_id, character_name, corporation_id, has_account in (
+                UserProfile.objects.filter(main_character__isnull=False)
+                .annotate(
+                    has_account=models.Exists(
+                        self.model.objects.filter(user_id=models.OuterRef("user_id"))
+                    )
+                )
+                .values_list(
+                    "user_id",
+                    "main_character__character_name",
+                    "main_character__corporation_id",
+                    "has_account",
+                )
+            )
+        }
 
         # If no valid accounts, return
-        if not auth_accounts:
+        if not auth_users:
             logger.debug("No valid accounts for skipping Check: %s", owner.name)
-            return "No Accounts"
-
-        # Get existing and new accounts
-        existing_accounts = self.filter(owner=owner).select_related("user")
-        existing_accounts_ids = set(existing_accounts.values_list("user_id", flat=True))
+            return TaxAccountReconciliation()
 
-        # Filter only new accounts
-        new_accounts = auth_accounts.exclude(
-            user__in=existing_accounts.values_list("user", flat=True)
+        # Owner side: all accounts of this owner
+        existing_accounts = list(
+            self.filter(owner=owner).only("pk", "name", "user_id", "status")
         )
+        owner_corp_id = owner.eve_corporation.corporation_id
 
-        # Cleanup orphaned accounts
-        self._cleanup_orphaned_accounts(owner, auth_accounts_ids, existing_accounts_ids)
-
-        # Update existing accounts
+        orphaned, missing, returned = [], [], []
+        moved: dict[int, list] = {}
         for tax_account in existing_accounts:
-            self._update_existing_account(tax_account)
+            auth_user = auth_users.get(tax_account.user_id)
+            if auth_user is None:
+                orphaned.append(tax_account)
+            elif auth_user[1] == owner_corp_id:
+                if tax_account.status == AccountStatus.MISSING:
+                    returned.append(tax_account)
+            else:
+                moved.setdefault(auth_user[1], []).append(tax_account)
+
+        # Resolve all target corporations with a single query
+        new_owners = {
+            new_owner.eve_corporation.corporation_id: new_owner
+            for new_owner in CorporationOwner.objects.filter(
+                eve_corporation__corporation_id__in=moved.keys()
+            ).select_related("eve_corporation")
+        }
+        for corporation_id in list(moved):
+            if corporation_id not in new_owners:
+                missing.extend(
+                    tax_account
+                    for tax_account in moved.pop(corporation_id)
+                    if tax_account.status != AccountStatus.MISSING
+                )
 
-        # Create new accounts for users without existing tax accounts
-        for account in new_accounts:
-            logger.debug(
-                "Creating new corporation tax account for user: %s",
-                account.user.username,
-            )
-            items.append(
-                self.model(
-                    name=account.main_character.character_name,
-                    owner=owner,
-                    user=account.user,
-                    status=AccountStatus.ACTIVE,
+        # Apply the changes
+        if orphaned:
+            self.filter(pk__in=[tax_account.pk for tax_account in orphaned]).delete()
+            for tax_account in orphaned:
+                logger.info(
+                    "Deleted Tax Account for user id: %s from Corporation: %s",
+                    tax_account.user_id,
+                    owner.name,
                 )
+
+        if missing:
+            self.filter(pk__in=[tax_account.pk for tax_account in missing]).update(
+                status=AccountStatus.MISSING
             )
+            for tax_account in missing:
+                logger.info("Marked Tax Account %s as MISSING", tax_account.name)
+
+        if returned:
+            self.filter(pk__in=[tax_account.pk for tax_account in returned]).update(
+                status=AccountStatus.ACTIVE,
+                notice=None,
+                deposit=0,
+                last_paid=None,
+                next_due=None,
+                paid_until=None,
+            )
+            for tax_account in returned:
+                logger.info("Reset Tax Account %s", tax_account.name)
+
+        for corporation_id, tax_accounts in moved.items():
+            new_owner = new_owners[corporation_id]
+            self.filter(pk__in=[tax_account.pk for tax_account in tax_accounts]).update(
+                owner=new_owner,
+                status=AccountStatus.ACTIVE,
+                notice=None,
+                deposit=0,
+                last_paid=None,
+                next_due=None,
+                paid_until=None,
+            )
+            for tax_account in tax_accounts:
+                logger.info(
+                    "Moved Tax Account %s to Corporation %s",
+                    tax_account.name,
+                    new_owner.eve_corporation.corporation_name,
+                )
 
-        # Bulk create new accounts
+        # Create new accounts for users without any tax account
+        items = [
+            self.model(
+                name=character_name,
+                owner=owner,
+                user_id=user_id,
+                status=AccountStatus.ACTIVE,
+            )
+            for user_id, (character_name, _, has_account) in auth_users.items()
+            if not has_account
+        ]
         if items:
             self.bulk_create(
                 items,
@@ -209,114 +234,18 @@ class CorporationAccountManager(models.Manager["PaymentAccountContext"]):
         else:
             logger.debug("No new tax accounts for: %s", owner.name)
 
-        return ("Finished checking Tax Accounts for %s", owner.name)
-
-    def _cleanup_orphaned_accounts(
-        self, owner: "OwnerContext", auth_user_ids: set, ps_user_ids: set
-    ):
-        """Delete Tax accounts for users without main characters."""
-        for ps_user_id in ps_user_ids:
-            if ps_user_id not in auth_user_ids:
-                self.filter(owner=owner, user_id=ps_user_id).delete()
-                logger.info(
-                    "Deleted Tax Account for user id: %s from Corporation: %s",
-                    ps_user_id,
-                    owner.name,
-                )
-
-    def _update_existing_account(
-        self,
-        tax_account: "PaymentAccountContext",
-    ):
-        """
-        Update an existing tax account based on current state.
-
-        Args:
-            owner (CorporationOwner): The owner of the tax account.
-            tax_account (CorporationPaymentAccount): The tax account to update.
-        """
-        # pylint: disable=import-outside-toplevel, cyclic-import
-        # AA TaxSystem
-        from taxsystem.models.corporation import CorporationOwner
-
-        # Get corporation IDs
-        pa_corp_id = tax_account.owner.eve_corporation.corporation_id
-        main_corp_id = tax_account.user.profile.main_character.corporation_id
-
-        # Reactivate Account if user returned to corporation
-        if tax_account.status == AccountStatus.MISSING and main_corp_id == pa_corp_id:
-            self._reset_account(tax_account)
-            return
-
-        # Update Account when user left the corporation
-        if pa_corp_id != main_corp_id:
-            # Mark as missing if not already
-            if not tax_account.is_missing:
-                self._mark_missing_tax_account(tax_account)
-            # Try to move to new corporation if exists
-            try:
-                new_owner = CorporationOwner.objects.get(
-                    eve_corporation__corporation_id=main_corp_id
-                )
-                # Move to new owner
-                self._move_tax_account_to_owner(tax_account, new_owner)
-            except CorporationOwner.DoesNotExist:
-                pass
-            # Save changes
-            tax_account.save()
-
-    def _reset_account(self, tax_account: "PaymentAccountContext"):
-        """
-        Reset tax account state (unsaved).
-
-        Args:
-            tax_account (CorporationPaymentAccount): The tax account to reset.
-        """
-        tax_account.status = AccountStatus.ACTIVE
-        tax_account.notice = None
-        tax_account.deposit = 0
-        tax_account.last_paid = None
-        tax_account.save()
-        logger.info(
-            "Reset Tax Account %s",
-            tax_account.name,
+        report = TaxAccountReconciliation(
+            created=len(items),
+            missing=len(missing),
+            returned=len(returned),
+            moved=sum(len(tax_accounts) for tax_accounts in moved.values()),
+            deleted=len(orphaned),
         )
+        logger.debug("Tax Account reconciliation for %s: %s", owner.name, report)
+        if any(report):
+            invalidate_menu_badges()
+        return report
 
-    def _move_tax_account_to_owner(
-        self, tax_account: "PaymentAccountContext", owner: "OwnerContext"
-    ):
-        """
-        Move a tax account to another owner.
-        Resets account state.
-
-        Args:
-            tax_account (CorporationPaymentAccount): The tax account to move.
-            owner (CorporationOwner): The new owner of the tax account.
-        """
-        tax_account.owner = owner
-        tax_account.status = AccountStatus.ACTIVE
-        tax_account.notice = None
-        tax_account.deposit = 0
-        tax_account.last_paid = None
-        tax_account.save()
-        logger.info(
-            "Moved Tax Account %s to Corporation %s",
-            tax_account.name,
-            owner.eve_corporation.corporation_name,
-        )
-
-    def _mark_missing_tax_account(self, tax_account: "PaymentAccountContext"):
-        """
-        Mark the tax account as missing (unsaved).
-
-        Args:
-            tax_account (CorporationPaymentAccount): The tax account to mark as missing.
-        """
-        tax_account.status = AccountStatus.MISSING
-        tax_account.save()
-        logger.info("Marked Tax Account %s as MISSING", tax_account.name)
-
-    @log_timing(logger)
     def check_payment_deadlines(
         self, owner: "OwnerContext", force_refresh: bool = False
     ) -> UpdateSectionResult:
@@ -334,44 +263,26 @@ class CorporationAccountManager(models.Manager["PaymentAccountContext"]):
     # pylint: disable=unused-argument
     def _payment_deadlines(
         self, owner: "OwnerContext", force_refresh: bool = False
-    ) -> None:
+    ) -> "DeadlineResult":
         """Update Deposits from Account."""
+        # pylint: disable=import-outside-toplevel, cyclic-import
+        # AA TaxSystem
+        from taxsystem.models.helpers.payments import PaymentDeadlineProcessor
+
         logger.debug(
             "Updating payment deadlines for: %s",
             owner.name,
         )
 
-        tax_accounts = self.filter(owner=owner, status=AccountStatus.ACTIVE)
-
-        items = []
-        for account in tax_accounts:
-            if account.last_paid is None:
-                # First Period is free
-                account.last_paid = timezone.now()
-            if timezone.now() - account.last_paid >= timezone.timedelta(
-                days=owner.tax_period
-            ):
-                account.deposit -= owner.tax_amount
-                account.last_paid = timezone.now()
-            items.append(account)
-
-        if not items:
-            logger.debug("No new payment deadlines for: %s", owner.name)
-            return ("No new payment deadlines for %s", owner.name)
-
-        self.bulk_update(
-            items,
-            ["deposit", "last_paid"],
-            batch_size=TAXSYSTEM_BULK_BATCH_SIZE,
-        )
+        result = PaymentDeadlineProcessor(owner).run()
 
         logger.debug(
-            "Finished %s: payment deadlines for %s",
-            len(items),
+            "Finished payment deadlines for %s: %s charged, %s initialised",
             owner.name,
+            result.charged,
+            result.initialised,
         )
-
-        return ("Finished payment deadlines for %s", owner.name)
+        return result
 
 
 class PaymentsQuerySet(models.QuerySet["PaymentsContext"]):
@@ -462,7 +373,6 @@ class PaymentsManager(models.Manager["PaymentsContext"]):
             return self.get_queryset().open_invoices(owner=owner)
         return 0
 
-    @log_timing(logger)
     def update_or_create_payments(
         self, owner: "OwnerContext", force_refresh: bool = False
     ) -> UpdateSectionResult:
@@ -474,7 +384,7 @@ class PaymentsManager(models.Manager["PaymentsContext"]):
         )
 
     @transaction.atomic()
-    # pylint: disable=too-many-locals, unused-argument
+    # pylint: disable=unused-argument
     def _update_or_create_objs(
         self, owner: "OwnerContext", force_refresh: bool = False
     ) -> None:
@@ -482,122 +392,41 @@ class PaymentsManager(models.Manager["PaymentsContext"]):
         # pylint: disable=import-outside-toplevel, cyclic-import
         # AA TaxSystem
         from taxsystem.models.corporation import (
-            CorporationPaymentAccount as PaymentAccount,
-        )
-        from taxsystem.models.corporation import (
+            CorporationPaymentAccount,
             CorporationPaymentHistory,
-            CorporationPayments,
         )
-        from taxsystem.models.wallet import CorporationWalletJournalEntry
+        from taxsystem.models.helpers.payments import PaymentMatcher
 
         logger.debug(
             "Updating payments for: %s",
             owner.name,
         )
 
-        tax_accounts = PaymentAccount.objects.filter(owner=owner)
-
-        if not tax_accounts:
-            return ("No Payment Users for %s", owner.name)
-
-        users = {}
-
-        # Build Account Map
-        for account in tax_accounts:
-            account: PaymentAccount
-            alts = account.get_alt_ids()
-            users[account] = alts
-
-        journal_qs = CorporationWalletJournalEntry.objects.filter(
-            division__corporation=owner,
-            ref_type__in=["player_donation"],
-        ).order_by("-date")
-
-        _current_entry_ids = set(
-            self.filter(account__owner=owner).values_list(
-                "journal__entry_id", flat=True
-            )
-        )
-        with transaction.atomic():
-            items = []
-            logs_items = []
-            for journal in journal_qs:
-                # Skip if already processed
-                if journal.entry_id in _current_entry_ids:
-                    continue
-
-                # Ensure first party is not null to avoid issues with journal entries without a first party
-                try:
-                    assert journal.first_party
-                except AssertionError:
-                    logger.warning(
-                        "Journal entry %s has no first party. Skipping.",
-                        journal.entry_id,
-                    )
-                    continue
-
-                for account, alts in users.items():
-                    # Check if entry belongs to user's characters
-                    if journal.first_party.id in alts:
-                        payment_item = CorporationPayments(
-                            owner=owner,
-                            journal=journal,
-                            name=account.name,
-                            account=account,
-                            amount=journal.amount,
-                            request_status=PaymentRequestStatus.PENDING,
-                            date=journal.date,
-                            reason=journal.reason,
-                        )
-                        items.append(payment_item)
-
-            if not items:
-                logger.debug("No new Payments for: %s", owner.name)
-                return ("No new Payments for %s", owner.name)
-
-            # Bulk create payments
-            payments = self.bulk_create(
-                items, batch_size=TAXSYSTEM_BULK_BATCH_SIZE, ignore_conflicts=True
-            )
+        created = PaymentMatcher(
+            owner=owner,
+            corporation=owner,
+            account_model=CorporationPaymentAccount,
+            payment_model=self.model,
+            history_model=CorporationPaymentHistory,
+        ).run()
 
-            for payment in payments:
-                # Only log created payments
-                payment_obj = self.filter(
-                    journal=payment.journal,
-                    account=payment.account,
-                    owner=owner,
-                ).first()
-
-                if not payment_obj:
-                    continue
-
-                log_items = CorporationPaymentHistory(
-                    user=payment_obj.account.user,
-                    payment=payment_obj,
-                    action=PaymentActions.STATUS_CHANGE,
-                    new_status=PaymentRequestStatus.PENDING,
-                    comment=PaymentSystemText.ADDED,
-                )
-                logs_items.append(log_items)
-
-            CorporationPaymentHistory.objects.bulk_create(
-                logs_items, batch_size=TAXSYSTEM_BULK_BATCH_SIZE, ignore_conflicts=True
-            )
+        if not created:
+            logger.debug("No new Payments for: %s", owner.name)
+            return ("No new Payments for %s", owner.name)
 
         logger.debug(
             "Finished %s Payments for %s",
-            len(items),
+            created,
             owner.name,
         )
         return (
             "Finished %s Payments for %s",
-            len(items),
+            created,
             owner.name,
         )
 
 
 class MembersManager(models.Manager["MembersContext"]):
-    @log_timing(logger)
     def update_or_create_esi(
         self, owner: "OwnerContext", force_refresh: bool = False
     ) -> None:
@@ -640,10 +469,12 @@ class MembersManager(models.Manager["MembersContext"]):
         """Update or Create Members entries from objs data."""
         logger.info("Updating Members for: %s", owner.name)
 
-        _current_members_ids = set(
-            self.filter(owner=owner).values_list("character_id", flat=True)
+        _current_statuses = dict(
+            self.filter(owner=owner).values_list("character_id", "status")
         )
         _esi_members_ids = [member.character_id for member in objs]
+        _statuses = self._classify_members(owner, _esi_members_ids)
+        _changed_statuses: dict[str, list[int]] = defaultdict(list)
         _old_members = []
         _new_members = []
 
@@ -654,6 +485,7 @@ class MembersManager(models.Manager["MembersContext"]):
             logon_date = member.logon_date
             logged_off = member.logoff_date
             character_name = characters.to_name(character_id)
+            status = _statuses[character_id]
             member_item = self.model(
                 owner=owner,
                 character_id=character_id,
@@ -661,30 +493,28 @@ class MembersManager(models.Manager["MembersContext"]):
                 joined=joined,
                 logon=logon_date,
                 logged_off=logged_off,
-                status=self.model.States.ACTIVE,
+                status=status,
             )
-            if character_id in _current_members_ids:
+            if character_id in _current_statuses:
                 _old_members.append(member_item)
+                if _current_statuses[character_id] != status:
+                    _changed_statuses[status].append(character_id)
             else:
                 _new_members.append(member_item)
 
         # Set missing members
         old_member_ids = {member.character_id for member in _old_members}
-        missing_members_ids = _current_members_ids - old_member_ids
+        missing_members_ids = _current_statuses.keys() - old_member_ids
+        _changed_statuses[self.model.States.MISSING].extend(
+            character_id
+            for character_id in missing_members_ids
+            if _current_statuses[character_id] != self.model.States.MISSING
+        )
 
-        if missing_members_ids:
-            self.filter(owner=owner, character_id__in=missing_members_ids).update(
-                status=self.model.States.MISSING
-            )
-            logger.debug(
-                "Marked %s missing members for: %s",
-                len(missing_members_ids),
-                owner.name,
-            )
         if _old_members:
             self.bulk_update(
                 _old_members,
-                ["character_name", "status", "logon", "logged_off"],
+                ["character_name", "logon", "logged_off"],
                 batch_size=TAXSYSTEM_BULK_BATCH_SIZE,
             )
             logger.debug(
@@ -705,7 +535,7 @@ class MembersManager(models.Manager["MembersContext"]):
             )
 
         # Update Members
-        self._update_members(owner, _esi_members_ids)
+        self._update_statuses(owner, _changed_statuses)
 
         logger.info(
             "%s - Old Members: %s, New Members: %s, Missing: %s",
@@ -719,54 +549,50 @@ class MembersManager(models.Manager["MembersContext"]):
             owner.name,
         )
 
-    def _update_members(self, owner: "OwnerContext", members_ids: list[int]):
-        """Update Members for a corporation."""
+    def _classify_members(
+        self, owner: "OwnerContext", members_ids: list[int]
+    ) -> dict[int, str]:
+        """
+        Classify the members of a corporation with a single ownership query.
 
-        auth_accounts = UserProfile.objects.filter(
-            main_character__isnull=False,
-            main_character__corporation_id=owner.eve_corporation.corporation_id,
-        ).prefetch_related("user__profile__main_character")
+        Mains of Auth accounts in the corporation are active, their other characters
+        are alts and all remaining members have no account.
 
-        members = self.filter(owner=owner)
+        Args:
+            owner (CorporationOwner): The corporation of the members
+            members_ids (list[int]): The character IDs of the current members
+        Returns:
+            dict[int, str]: Mapping of character_id -> member status.
+        """
+        statuses = dict.fromkeys(members_ids, self.model.States.NOACCOUNT)
 
-        if not auth_accounts:
-            logger.debug("No valid accounts for: %s", owner.name)
-            return "No Accounts"
+        ownerships = CharacterOwnership.objects.filter(
+            user__profile__main_character__corporation_id=owner.eve_corporation.corporation_id,
+        ).values_list(
+            "character__character_id", "user__profile__main_character__character_id"
+        )
+        for character_id, main_id in ownerships:
+            if character_id not in statuses:
+                continue
+            if character_id == main_id:
+                statuses[character_id] = self.model.States.ACTIVE
+            else:
+                statuses[character_id] = self.model.States.IS_ALT
+        return statuses
 
-        for account in auth_accounts:
-            # Get all alts for the user
-            alts = set(
-                account.user.character_ownerships.all().values_list(
-                    "character__character_id", flat=True
-                )
+    def _update_statuses(
+        self, owner: "OwnerContext", changed_statuses: dict[str, list[int]]
+    ) -> None:
+        """Write the changed member statuses with one update per status."""
+        for status, character_ids in changed_statuses.items():
+            if not character_ids:
+                continue
+            self.filter(owner=owner, character_id__in=character_ids).update(
+                status=status
             )
-            main = account.main_character
-
-            # Change the status of members if they are alts
-            relevant_alts = alts.intersection(members_ids)
-            for alt in relevant_alts:
-                members_ids.remove(alt)
-                if alt == main.character_id:
-                    # Update main character to active if it was previously in another state
-                    members.filter(character_id=main.character_id).exclude(
-                        status=self.model.States.ACTIVE
-                    ).update(status=self.model.States.ACTIVE)
-                else:
-                    # Update the status of the member to alt
-                    members.filter(character_id=alt).update(
-                        status=self.model.States.IS_ALT
-                    )
-
-        if members_ids:
-            # Mark members without accounts
-            for member_id in members_ids:
-                members.filter(character_id=member_id).update(
-                    status=self.model.States.NOACCOUNT
-                )
-
             logger.debug(
-                "Marked %s members without accounts for: %s",
-                len(members_ids),
+                "Marked %s members as %s for: %s",
+                len(character_ids),
+                status,
                 owner.name,
             )
-        return "Updated Members statuses for %s", owner.name
@@ -1,16 +1,86 @@
 # Standard Library
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 # Django
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+from esi.exceptions import HTTPClientError
 
 # AA TaxSystem
-from taxsystem.providers import esi
+from taxsystem import __title__
+from taxsystem.app_settings import (
+    TAXSYSTEM_BULK_BATCH_SIZE,
+    TAXSYSTEM_EVE_ENTITY_STALE_DAYS,
+)
+from taxsystem.helpers.db import bulk_upsert
+from taxsystem.providers import AppLogger, esi
 
 if TYPE_CHECKING:
     # AA TaxSystem
     from taxsystem.models.general import EveEntity
 
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+# Maximum number of IDs ESI accepts per universe/names request
+ESI_NAMES_MAX_IDS = 1000
+# Number of names kept in the per-process cache
+NAME_CACHE_MAX_SIZE = 10_000
+# Time in seconds names are kept in the shared cache
+NAME_CACHE_TIMEOUT = 60 * 60 * 24
+# Time in seconds IDs that ESI could not resolve are remembered
+INVALID_ID_CACHE_TIMEOUT = 60 * 60
+
+
+class _NameCache:
+    """Thread safe per-process LRU cache of entity names."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._names: OrderedDict[int, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, ids: Iterable[int]) -> dict[int, str]:
+        """Return the cached names for the given IDs."""
+        found = {}
+        with self._lock:
+            for eve_id in ids:
+                if eve_id in self._names:
+                    self._names.move_to_end(eve_id)
+                    found[eve_id] = self._names[eve_id]
+        return found
+
+    def set_many(self, names_map: dict[int, str]) -> None:
+        """Add names to the cache, the least recently used names are dropped."""
+        with self._lock:
+            for eve_id, name in names_map.items():
+                self._names[eve_id] = name
+                self._names.move_to_end(eve_id)
+            while len(self._names) > self._max_size:
+                self._names.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._names.clear()
+
+
+_name_cache = _NameCache(NAME_CACHE_MAX_SIZE)
+
+
+def _get_cache_key(eve_id: int) -> str:
+    return f"taxsystem-eveentity-{eve_id}"
+
+
+def clear_name_cache() -> None:
+    """Clear the per-process name cache."""
+    _name_cache.clear()
+
 
 class EveEntityNameResolver:
     """
@@ -39,32 +109,164 @@ class EveEntityNameResolver:
 
 class EveEntityManager(models.Manager["EveEntity"]):
     def bulk_resolve_names(self, ids: list[int]) -> EveEntityNameResolver:
-        """Bulk resolve Eve IDs to names and categories using ESI."""
+        """
+        Bulk resolve Eve IDs to names.
+
+        The names are looked up in the per-process cache, the shared cache and the
+        database before the remaining IDs are resolved with ESI. Stale names are
+        served and refreshed in the background.
+        """
         if not ids:
             return EveEntityNameResolver({})
 
-        names_map = {
-            entity.id: entity.name
-            for entity in self.filter(id__in=ids).only("id", "name")
-        }
-        new_ids = set(ids).difference(names_map.keys())
+        ids = set(ids)
+        names_map = _name_cache.get_many(ids)
+
+        missing = ids.difference(names_map)
+        if missing:
+            shared = cache.get_many([_get_cache_key(eve_id) for eve_id in missing])
+            shared_map = {
+                eve_id: shared[_get_cache_key(eve_id)]
+                for eve_id in missing
+                if _get_cache_key(eve_id) in shared
+            }
+            _name_cache.set_many(shared_map)
+            names_map.update(shared_map)
+            missing.difference_update(shared_map)
 
+        if missing:
+            names_map.update(self._resolve_from_db_or_esi(missing))
+
+        # Invalid IDs are cached with an empty name
+        return EveEntityNameResolver(
+            {eve_id: name for eve_id, name in names_map.items() if name}
+        )
+
+    def _resolve_from_db_or_esi(self, ids: set[int]) -> dict[int, str]:
+        """Resolve IDs from the database and ESI and add them to the caches."""
+        stale_before = timezone.now() - timezone.timedelta(
+            days=TAXSYSTEM_EVE_ENTITY_STALE_DAYS
+        )
+        names_map = {}
+        stale_ids = []
+        for eve_id, name, last_updated in self.filter(id__in=ids).values_list(
+            "id", "name", "last_updated"
+        ):
+            names_map[eve_id] = name
+            if last_updated < stale_before:
+                stale_ids.append(eve_id)
+
+        new_ids = ids.difference(names_map)
         if new_ids:
-            response = esi.client.Universe.PostUniverseNames(
-                body=list(new_ids)
-            ).results(use_etag=False)
-            new_entities = []
-
-            for entity_data in response:
-                new_entities.append(
-                    self.model(
-                        id=entity_data.id,
-                        name=entity_data.name,
-                        category=entity_data.category,
-                    )
-                )
-                names_map[entity_data.id] = entity_data.name
-
-            if new_entities:
-                self.bulk_create(new_entities, batch_size=500, ignore_conflicts=True)
-        return EveEntityNameResolver(names_map)
+            resolved = self.update_or_create_from_esi(new_ids)
+            names_map.update(resolved)
+            invalid_ids = new_ids.difference(resolved)
+            if invalid_ids:
+                names_map.update(dict.fromkeys(invalid_ids, ""))
+                logger.warning("Could not resolve Eve IDs: %s", sorted(invalid_ids))
+
+        self._set_cached_names(names_map, using=self.db)
+
+        if stale_ids:
+            # pylint: disable=import-outside-toplevel, cyclic-import
+            # AA TaxSystem
+            from taxsystem.tasks import refresh_eve_entities
+
+            refresh_eve_entities.delay(ids=stale_ids)
+        return names_map
+
+    def update_or_create_from_esi(self, ids: Iterable[int]) -> dict[int, str]:
+        """
+        Resolve IDs with ESI and store them, IDs that can not be resolved are skipped.
+
+        Args:
+            ids: The Eve IDs to resolve
+        Returns:
+            dict[int, str]: Mapping of the resolved IDs to their names.
+        """
+        ids = list(ids)
+        entities = []
+        for i in range(0, len(ids), ESI_NAMES_MAX_IDS):
+            entities.extend(self._fetch_names(ids[i : i + ESI_NAMES_MAX_IDS]))
+
+        if entities:
+            bulk_upsert(
+                self,
+                entities,
+                unique_fields=["id"],
+                update_fields=["name", "category", "last_updated"],
+                batch_size=TAXSYSTEM_BULK_BATCH_SIZE,
+            )
+        return {entity.id: entity.name for entity in entities}
+
+    def _fetch_names(self, ids: list[int]) -> list["EveEntity"]:
+        """
+        Fetch names of up to ESI_NAMES_MAX_IDS IDs.
+
+        ESI rejects the whole request if one ID is invalid,
+        so a rejected chunk is split until the invalid IDs are isolated.
+        """
+        try:
+            response = esi.client.Universe.PostUniverseNames(body=ids).results(
+                use_etag=False
+            )
+        except HTTPClientError as exc:
+            if exc.status_code != 404:
+                raise
+            if len(ids) == 1:
+                return []
+            middle = len(ids) // 2
+            return self._fetch_names(ids[:middle]) + self._fetch_names(ids[middle:])
+
+        return [
+            self.model(
+                id=entity_data.id,
+                name=entity_data.name,
+                category=entity_data.category,
+            )
+            for entity_data in response
+        ]
+
+    def refresh_names(self, ids: list[int]) -> int:
+        """
+        Refresh the names of existing entities with ESI.
+
+        Returns:
+            int: The number of refreshed entities.
+        """
+        names_map = self.update_or_create_from_esi(ids)
+        self._set_cached_names(names_map, using=self.db)
+        return len(names_map)
+
+    @staticmethod
+    def _set_cached_names(names_map: dict[int, str], using: str) -> None:
+        """
+        Add resolved names to the per-process and the shared cache.
+
+        The caches are written when the surrounding transaction commits,
+        so a rollback does not leave cached names without their rows.
+        Invalid IDs are cached with an empty name for a shorter time.
+        """
+        if not names_map:
+            return
+
+        def set_cached_names():
+            _name_cache.set_many(names_map)
+            cache.set_many(
+                {
+                    _get_cache_key(eve_id): name
+                    for eve_id, name in names_map.items()
+                    if name
+                },
+                NAME_CACHE_TIMEOUT,
+            )
+            cache.set_many(
+                {
+                    _get_cache_key(eve_id): name
+                    for eve_id, name in names_map.items()
+                    if not name
+                },
+                INVALID_ID_CACHE_TIMEOUT,
+            )
+
+        transaction.on_commit(set_cached_names, using=using)
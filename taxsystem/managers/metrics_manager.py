@@ -0,0 +1,93 @@
+# Standard Library
+import datetime as dt
+from typing import TYPE_CHECKING
+
+# Django
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+# AA TaxSystem
+from taxsystem.app_settings import TAXSYSTEM_METRICS_RETENTION_DAYS
+
+if TYPE_CHECKING:
+    # AA TaxSystem
+    from taxsystem.helpers.instrumentation import Measurement
+    from taxsystem.models.general import MetricRollup
+
+
+class MetricRollupManager(models.Manager["MetricRollup"]):
+    def record(self, measurement: "Measurement") -> None:
+        """
+        Add a measurement to the rollup of its name, owner and hour.
+
+        Args:
+            measurement (Measurement): The finished measurement.
+        """
+        lookup = {
+            "name": measurement.name,
+            "owner_id": measurement.owner_id or 0,
+            "bucket": timezone.now().replace(minute=0, second=0, microsecond=0),
+        }
+        errors = 0 if measurement.is_success else 1
+        if self.filter(**lookup).update(
+            runs=models.F("runs") + 1,
+            errors=models.F("errors") + errors,
+            duration=models.F("duration") + measurement.duration,
+            max_duration=Greatest(
+                "max_duration",
+                models.Value(measurement.duration, output_field=models.FloatField()),
+            ),
+            queries=models.F("queries") + measurement.queries,
+            esi_calls=models.F("esi_calls") + measurement.esi_calls,
+            rows_written=models.F("rows_written") + measurement.rows_written,
+        ):
+            return
+
+        try:
+            with transaction.atomic():
+                self.create(
+                    **lookup,
+                    runs=1,
+                    errors=errors,
+                    duration=measurement.duration,
+                    max_duration=measurement.duration,
+                    queries=measurement.queries,
+                    esi_calls=measurement.esi_calls,
+                    rows_written=measurement.rows_written,
+                )
+        except IntegrityError:
+            # Another process created the rollup of this hour in the meantime
+            self.record(measurement)
+
+    def summary(self, since: dt.datetime) -> models.QuerySet:
+        """
+        Sum the rollups since the given time per name and owner.
+
+        Args:
+            since (datetime): Start of the summary window.
+        Returns:
+            QuerySet: Dicts with the summed values, ordered by the total duration.
+        """
+        return (
+            self.filter(bucket__gte=since)
+            .values("name", "owner_id")
+            .annotate(
+                runs=models.Sum("runs"),
+                errors=models.Sum("errors"),
+                duration=models.Sum("duration"),
+                max_duration=models.Max("max_duration"),
+                queries=models.Sum("queries"),
+                esi_calls=models.Sum("esi_calls"),
+                rows_written=models.Sum("rows_written"),
+            )
+            .order_by("-duration", "name", "owner_id")
+        )
+
+    def prune(self) -> int:
+        """Delete the rollups older than TAXSYSTEM_METRICS_RETENTION_DAYS."""
+        deleted, _ = self.filter(
+            bucket__lt=timezone.now()
+            - dt.timedelta(days=TAXSYSTEM_METRICS_RETENTION_DAYS)
+        ).delete()
+        return deleted
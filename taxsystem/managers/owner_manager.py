@@ -3,7 +3,8 @@ from typing import TYPE_CHECKING
 
 # Django
 from django.db import models
-from django.db.models import Case, Count, Q, Value, When
+from django.db.models import Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
@@ -13,6 +14,7 @@ from taxsystem import __title__
 from taxsystem.models.helpers.textchoices import (
     AllianceUpdateSection,
     CorporationUpdateSection,
+    PaymentRequestStatus,
     UpdateStatus,
 )
 from taxsystem.providers import AppLogger
@@ -25,6 +27,24 @@ if TYPE_CHECKING:
     from taxsystem.models.corporation import CorporationOwner
 
 
+def _open_invoices_subquery(payment_model) -> Coalesce:
+    """Return a subquery counting the open invoices of the outer owner."""
+    open_invoices = (
+        payment_model.objects.filter(
+            owner=OuterRef("pk"),
+            request_status__in=[
+                PaymentRequestStatus.PENDING,
+                PaymentRequestStatus.NEEDS_APPROVAL,
+            ],
+        )
+        .order_by()
+        .values("owner")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(open_invoices), Value(0))
+
+
 class CorporationOwnerQuerySet(models.QuerySet["CorporationOwner"]):
     """QuerySet for CorporationOwner with common filtering logic."""
 
@@ -171,6 +191,14 @@ class CorporationOwnerQuerySet(models.QuerySet["CorporationOwner"]):
 
         return qs
 
+    def annotate_open_invoices(self):
+        """Annotate the number of open invoices of each corporation."""
+        # pylint: disable=import-outside-toplevel, cyclic-import
+        # AA TaxSystem
+        from taxsystem.models.corporation import CorporationPayments
+
+        return self.annotate(open_invoices=_open_invoices_subquery(CorporationPayments))
+
 
 class CorporationOwnerManager(models.Manager["CorporationOwner"]):
     def get_queryset(self):
@@ -185,6 +213,9 @@ class CorporationOwnerManager(models.Manager["CorporationOwner"]):
     def annotate_total_update_status(self):
         return self.get_queryset().annotate_total_update_status()
 
+    def annotate_open_invoices(self):
+        return self.get_queryset().annotate_open_invoices()
+
 
 class AllianceOwnerQuerySet(models.QuerySet["AllianceOwner"]):
     """QuerySet for AllianceOwner with common filtering logic."""
@@ -324,6 +355,14 @@ class AllianceOwnerQuerySet(models.QuerySet["AllianceOwner"]):
 
         return qs
 
+    def annotate_open_invoices(self):
+        """Annotate the number of open invoices of each alliance."""
+        # pylint: disable=import-outside-toplevel, cyclic-import
+        # AA TaxSystem
+        from taxsystem.models.alliance import AlliancePayments
+
+        return self.annotate(open_invoices=_open_invoices_subquery(AlliancePayments))
+
 
 class AllianceOwnerManager(models.Manager["AllianceOwner"]):
     def get_queryset(self):
@@ -337,3 +376,6 @@ class AllianceOwnerManager(models.Manager["AllianceOwner"]):
 
     def annotate_total_update_status(self):
         return self.get_queryset().annotate_total_update_status()
+
+    def annotate_open_invoices(self):
+        return self.get_queryset().annotate_open_invoices()
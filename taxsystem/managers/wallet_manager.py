@@ -1,8 +1,10 @@
 # Standard Library
-from typing import TYPE_CHECKING
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 # Django
-from django.db import models, transaction
+from django.db import connections, models, transaction
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
@@ -11,9 +13,12 @@ from esi.exceptions import HTTPNotModified
 
 # AA TaxSystem
 from taxsystem import __title__
-from taxsystem.app_settings import TAXSYSTEM_BULK_BATCH_SIZE
-from taxsystem.decorators import log_timing
-from taxsystem.errors import DatabaseError
+from taxsystem.app_settings import (
+    TAXSYSTEM_BULK_BATCH_SIZE,
+    TAXSYSTEM_WALLET_MAX_WORKERS,
+)
+from taxsystem.helpers.db import bulk_upsert
+from taxsystem.helpers.instrumentation import bind_measurement, current_measurement
 from taxsystem.models.general import EveEntity
 from taxsystem.models.helpers.textchoices import CorporationUpdateSection
 from taxsystem.providers import AppLogger, esi
@@ -65,8 +70,24 @@ class CorporationWalletContext:
     balance: float
 
 
+class JournalPage(NamedTuple):
+    """
+    A single fetched wallet journal page.
+
+    Attributes:
+        division_id (int): The wallet division of the page.
+        page (int): The page number.
+        total_pages (int): The number of pages reported by ESI.
+        items (list | None): The journal items, None if the page hit the ETag.
+    """
+
+    division_id: int
+    page: int
+    total_pages: int
+    items: list[CorporationJournalContext] | None
+
+
 class CorporationWalletManager(models.Manager["CorporationWalletJournalEntry"]):
-    @log_timing(logger)
     def update_or_create_esi(
         self, owner: "CorporationOwner", force_refresh: bool = False
     ) -> None:
@@ -81,7 +102,12 @@ class CorporationWalletManager(models.Manager["CorporationWalletJournalEntry"]):
     def _fetch_esi_data(
         self, owner: "CorporationOwner", force_refresh: bool = False
     ) -> None:
-        """Fetch wallet journal entries from ESI data."""
+        """Fetch wallet journal entries from ESI data.
+
+        Divisions and their pages are fetched concurrently, every page is written
+        as soon as it arrives. If only some pages of a division hit the ETag, these
+        pages are fetched again without ETag, like the ESI client does for `results()`.
+        """
         # pylint: disable=import-outside-toplevel
         # AA TaxSystem
         from taxsystem.models.wallet import CorporationWalletDivision
@@ -93,99 +119,247 @@ class CorporationWalletManager(models.Manager["CorporationWalletJournalEntry"]):
         req_roles = ["CEO", "Director", "Accountant", "Junior_Accountant"]
 
         token = owner.get_token(scopes=req_scopes, req_roles=req_roles)
-
-        divisions = CorporationWalletDivision.objects.filter(corporation=owner)
+        # Refresh once here, the worker threads must not refresh the same token
+        if token:
+            token.valid_access_token()
+
+        divisions = {
+            division.division_id: division
+            for division in CorporationWalletDivision.objects.filter(corporation=owner)
+        }
+        # division_id -> state of the division fetch
+        states = {
+            division_id: {
+                "total_pages": None,
+                "changed": False,
+                "not_modified": set(),
+                "refetched": set(),
+                "last": None,
+            }
+            for division_id in divisions
+        }
         is_updated = False
 
-        for division in divisions:
-            # Make the ESI request
+        executor = ThreadPoolExecutor(
+            max_workers=max(TAXSYSTEM_WALLET_MAX_WORKERS, 1),
+            thread_name_prefix="taxsystem-wallet",
+            # Count the ESI calls of the workers for the wallet section
+            initializer=bind_measurement,
+            initargs=(current_measurement(),),
+        )
+        try:
+            pending = {
+                executor.submit(
+                    self._fetch_journal_page,
+                    owner,
+                    division_id,
+                    token,
+                    1,
+                    force_refresh,
+                )
+                for division_id in divisions
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = future.result()
+                    state = states[page.division_id]
+                    division = divisions[page.division_id]
+
+                    if page.page == 1 and state["total_pages"] is None:
+                        state["total_pages"] = page.total_pages
+                        pending |= {
+                            executor.submit(
+                                self._fetch_journal_page,
+                                owner,
+                                page.division_id,
+                                token,
+                                number,
+                                force_refresh,
+                            )
+                            for number in range(2, page.total_pages + 1)
+                        }
+
+                    if page.items is None:
+                        state["not_modified"].add(page.page)
+                    else:
+                        is_updated = True
+                        state["changed"] = True
+                        last = self._update_or_create_objs(
+                            division=division, objs=page.items
+                        )
+                        if last and (
+                            state["last"] is None or last.id > state["last"].id
+                        ):
+                            state["last"] = last
+
+                    # Not all pages hit the ETag, fetch the unchanged pages again
+                    refetch = state["not_modified"] - state["refetched"]
+                    if state["changed"] and refetch:
+                        state["refetched"] |= refetch
+                        pending |= {
+                            executor.submit(
+                                self._fetch_journal_page,
+                                owner,
+                                page.division_id,
+                                token,
+                                number,
+                                force_refresh,
+                                False,
+                            )
+                            for number in refetch
+                        }
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        for division_id, state in states.items():
+            if state["last"] is not None:
+                self._update_high_water_mark(divisions[division_id], state["last"])
+
+        # Raise if no update happened at all
+        if not is_updated:
+            raise HTTPNotModified(304, {"msg": "Wallet Journal has Not Modified"})
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def _fetch_journal_page(
+        self,
+        owner: "CorporationOwner",
+        division_id: int,
+        token,
+        page: int,
+        force_refresh: bool = False,
+        use_etag: bool = True,
+    ) -> JournalPage:
+        """Fetch a single wallet journal page from ESI, runs in a worker thread."""
+        try:
             journal_items_ob = (
                 esi.client.Wallet.GetCorporationsCorporationIdWalletsDivisionJournal(
                     corporation_id=owner.eve_corporation.corporation_id,
-                    division=division.division_id,
+                    division=division_id,
+                    page=page,
                     token=token,
                 )
             )
-
             try:
-                journal_items, response = journal_items_ob.results(
-                    return_response=True, force_refresh=force_refresh
+                journal_items, response = journal_items_ob.result(
+                    use_etag=use_etag,
+                    return_response=True,
+                    force_refresh=force_refresh,
                 )
-                is_updated = True
-                logger.debug("ESI response Status: %s", response.status_code)
-            except HTTPNotModified:
-                continue
-
-            self._update_or_create_objs(division=division, objs=journal_items)
-        # Raise if no update happened at all
-        if not is_updated:
-            raise HTTPNotModified(304, {"msg": "Wallet Journal has Not Modified"})
+            except HTTPNotModified as exc:
+                return JournalPage(
+                    division_id=division_id,
+                    page=page,
+                    total_pages=int((exc.headers or {}).get("X-Pages", 1)),
+                    items=None,
+                )
+            logger.debug(
+                "ESI response Status: %s Division: %s Page: %s",
+                response.status_code,
+                division_id,
+                page,
+            )
+            return JournalPage(
+                division_id=division_id,
+                page=page,
+                total_pages=int(response.headers.get("X-Pages", 1)),
+                items=journal_items,
+            )
+        finally:
+            # Worker threads open their own database connections (token scopes)
+            connections.close_all()
 
     @transaction.atomic()
     def _update_or_create_objs(
         self,
         division: "CorporationWalletDivision",
         objs: list[CorporationJournalContext],
-    ) -> None:
-        """Update or Create wallet journal entries from objs data."""
-        _new_names = []
+    ) -> CorporationJournalContext | None:
+        """Update or Create wallet journal entries from objs data.
+
+        The high-water mark of the division is not moved here, pages can arrive in
+        any order. Returns the newest item above the mark, if any.
+        """
+        # Skip everything at or below the division high-water mark
+        last_entry_id = division.journal_last_entry_id or 0
+        new_objs = {item.id: item for item in objs if item.id > last_entry_id}
+        if not new_objs:
+            return None
+
+        # Dedup only against the entries of this page window
         _current_journal = set(
-            list(
-                self.filter(division=division)
-                .order_by("-date")
-                .values_list("entry_id", flat=True)[:20000]
+            self.filter(division=division, entry_id__in=new_objs.keys()).values_list(
+                "entry_id", flat=True
             )
         )
-        _current_eve_ids = set(
-            list(EveEntity.objects.all().values_list("id", flat=True))
+
+        pending = {
+            entry_id: item
+            for entry_id, item in new_objs.items()
+            if entry_id not in _current_journal
+        }
+        party_ids = {
+            party_id
+            for item in pending.values()
+            for party_id in (item.first_party_id, item.second_party_id)
+            if party_id
+        }
+
+        # Create Entities for the parties of this batch only
+        known_ids = set(
+            EveEntity.objects.filter(id__in=party_ids).values_list("id", flat=True)
         )
+        _new_names = party_ids.difference(known_ids)
+        if _new_names:
+            resolver = EveEntity.objects.bulk_resolve_names(list(_new_names))
+            # IDs that ESI reports as invalid are stored without a party
+            known_ids.update(
+                party_id for party_id in _new_names if resolver.to_name(party_id)
+            )
 
         items = []
-        for item in objs:
-            if item.id not in _current_journal:
-                if item.second_party_id not in _current_eve_ids:
-                    _new_names.append(item.second_party_id)
-                    _current_eve_ids.add(item.second_party_id)
-                if item.first_party_id not in _current_eve_ids:
-                    _new_names.append(item.first_party_id)
-                    _current_eve_ids.add(item.first_party_id)
-
-                wallet_item = self.model(
-                    division=division,
-                    amount=item.amount,
-                    balance=item.balance,
-                    context_id=item.context_id,
-                    context_id_type=item.context_id_type,
-                    date=item.date,
-                    description=item.description,
-                    first_party_id=item.first_party_id,
-                    entry_id=item.id,
-                    reason=item.reason,
-                    ref_type=item.ref_type,
-                    second_party_id=item.second_party_id,
-                    tax=item.tax,
-                    tax_receiver_id=item.tax_receiver_id,
-                )
-
-                items.append(wallet_item)
+        for entry_id, item in pending.items():
+            wallet_item = self.model(
+                division=division,
+                amount=item.amount,
+                balance=item.balance,
+                context_id=item.context_id,
+                context_id_type=item.context_id_type,
+                date=item.date,
+                description=item.description,
+                first_party_id=(
+                    item.first_party_id if item.first_party_id in known_ids else None
+                ),
+                entry_id=entry_id,
+                reason=item.reason,
+                ref_type=item.ref_type,
+                second_party_id=(
+                    item.second_party_id if item.second_party_id in known_ids else None
+                ),
+                tax=item.tax,
+                tax_receiver_id=item.tax_receiver_id,
+            )
+            items.append(wallet_item)
 
-        # Create Entities
-        EveEntity.objects.bulk_resolve_names(_new_names)
-        # Check if created
-        all_exist = EveEntity.objects.filter(id__in=_new_names).count() == len(
-            _new_names
+        # The unique (division, entry_id) index guards against races
+        self.bulk_create(
+            items, batch_size=TAXSYSTEM_BULK_BATCH_SIZE, ignore_conflicts=True
         )
 
-        if all_exist:
-            self.bulk_create(
-                items, batch_size=TAXSYSTEM_BULK_BATCH_SIZE, ignore_conflicts=True
-            )
-        else:
-            raise DatabaseError("DB Fail")
+        return max(new_objs.values(), key=lambda item: item.id)
+
+    def _update_high_water_mark(
+        self,
+        division: "CorporationWalletDivision",
+        last_item: CorporationJournalContext,
+    ) -> None:
+        """Move the journal high-water mark of the division forward."""
+        division.journal_last_entry_id = last_item.id
+        division.journal_last_date = last_item.date
+        division.save(update_fields=["journal_last_entry_id", "journal_last_date"])
 
 
 class CorporationDivisionManager(models.Manager["CorporationWalletDivision"]):
-    @log_timing(logger)
     def update_or_create_esi(
         self, owner: "CorporationOwner", force_refresh: bool = False
     ) -> None:
@@ -196,7 +370,6 @@ class CorporationDivisionManager(models.Manager["CorporationWalletDivision"]):
             force_refresh=force_refresh,
         )
 
-    @log_timing(logger)
     def update_or_create_esi_names(
         self, owner: "CorporationOwner", force_refresh: bool = False
     ) -> None:
@@ -253,49 +426,77 @@ class CorporationDivisionManager(models.Manager["CorporationWalletDivision"]):
 
         self._update_or_create_objs(owner=owner, objs=division_items)
 
-    @transaction.atomic()
     def _update_or_create_objs_division(
         self,
         owner: "CorporationOwner",
         objs: list[CorporationDivisionContext],
     ) -> None:
         """Update or Create division entries from objs data."""
+        names = {}
         for division in objs:  # list (hanger, wallet)
             for wallet_data in division.wallet:
                 if wallet_data.division == 1:
                     name = _("Master Wallet")
                 else:
                     name = getattr(wallet_data, "name", _("Unknown"))
+                names[wallet_data.division] = None if name is None else str(name)
 
-                obj, created = self.get_or_create(
-                    corporation=owner,
-                    division_id=wallet_data.division,
-                    defaults={
-                        "balance": 0,
-                        "name": name,
-                    },
-                )
-                if not created:
-                    obj.name = name
-                    obj.save()
+        self._bulk_upsert_divisions(owner=owner, field="name", values=names)
 
-    @transaction.atomic()
     def _update_or_create_objs(
         self,
         owner: "CorporationOwner",
         objs: list[CorporationWalletContext],
     ) -> None:
         """Update or Create division entries from objs data."""
-        for division in objs:
-            obj, created = self.get_or_create(
-                corporation=owner,
-                division_id=division.division,
-                defaults={
-                    "balance": division.balance,
-                    "name": _("Unknown"),
-                },
+        balances = {
+            division.division: Decimal(str(division.balance)).quantize(Decimal("0.01"))
+            for division in objs
+        }
+
+        self._bulk_upsert_divisions(owner=owner, field="balance", values=balances)
+
+    def _bulk_upsert_divisions(
+        self, owner: "CorporationOwner", field: str, values: dict[int, Any]
+    ) -> int:
+        """
+        Write one field of the divisions of an owner with a single upsert.
+
+        Divisions whose stored value already matches are skipped.
+
+        Args:
+            owner (CorporationOwner): The owner of the divisions
+            field (str): The field to write, ``name`` or ``balance``
+            values (dict[int, Any]): Mapping of division ID to the new value
+        Returns:
+            int: The number of written divisions.
+        """
+        snapshot = dict(
+            self.filter(corporation=owner).values_list("division_id", field)
+        )
+        defaults = {"balance": 0, "name": str(_("Unknown"))}
+        divisions = [
+            self.model(
+                **{
+                    **defaults,
+                    "corporation": owner,
+                    "division_id": division_id,
+                    field: value,
+                }
             )
-
-            if not created:
-                obj.balance = division.balance
-                obj.save()
+            for division_id, value in values.items()
+            if division_id not in snapshot or snapshot[division_id] != value
+        ]
+        if not divisions:
+            return 0
+
+        bulk_upsert(
+            self,
+            divisions,
+            unique_fields=["corporation", "division_id"],
+            update_fields=[field],
+        )
+        logger.debug(
+            "Updated %s division %ss for %s", len(divisions), field, owner.name
+        )
+        return len(divisions)
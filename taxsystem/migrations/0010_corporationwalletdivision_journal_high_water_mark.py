@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+# Django
+from django.db import migrations, models
+
+
+def remove_duplicate_journal_entries(apps, schema_editor):
+    """Remove duplicate journal entries so the unique constraint can be created."""
+    CorporationWalletJournalEntry = apps.get_model(
+        "taxsystem", "CorporationWalletJournalEntry"
+    )
+    payment_models = [
+        apps.get_model("taxsystem", "CorporationPayments"),
+        apps.get_model("taxsystem", "AlliancePayments"),
+    ]
+
+    duplicates = (
+        CorporationWalletJournalEntry.objects.values("division_id", "entry_id")
+        .annotate(count=models.Count("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        pks = list(
+            CorporationWalletJournalEntry.objects.filter(
+                division_id=duplicate["division_id"], entry_id=duplicate["entry_id"]
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        # Prefer an entry that is already linked to a payment
+        referenced = [
+            pk
+            for pk in pks
+            if any(
+                model.objects.filter(journal_id=pk).exists() for model in payment_models
+            )
+        ]
+        keeper = referenced[0] if referenced else pks[0]
+        others = [pk for pk in pks if pk != keeper]
+
+        for model in payment_models:
+            if not model.objects.filter(journal_id=keeper).exists():
+                # Move the first payment that is only linked to a duplicated entry
+                payment = (
+                    model.objects.filter(journal_id__in=others).order_by("pk").first()
+                )
+                if payment:
+                    payment.journal_id = keeper
+                    payment.save(update_fields=["journal_id"])
+            # Keep the remaining payments of the duplicated entries without their
+            # journal entry instead of deleting them and their history with it
+            model.objects.filter(journal_id__in=others).update(journal_id=None)
+
+        CorporationWalletJournalEntry.objects.filter(pk__in=others).delete()
+
+
+def set_journal_high_water_mark(apps, schema_editor):
+    """Initialize the journal high-water mark of all divisions."""
+    CorporationWalletDivision = apps.get_model("taxsystem", "CorporationWalletDivision")
+    CorporationWalletJournalEntry = apps.get_model(
+        "taxsystem", "CorporationWalletJournalEntry"
+    )
+
+    for division in CorporationWalletDivision.objects.all():
+        mark = CorporationWalletJournalEntry.objects.filter(
+            division=division
+        ).aggregate(last_entry_id=models.Max("entry_id"), last_date=models.Max("date"))
+        division.journal_last_entry_id = mark["last_entry_id"]
+        division.journal_last_date = mark["last_date"]
+        division.save(update_fields=["journal_last_entry_id", "journal_last_date"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0009_alter_allianceadminhistory_target_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="corporationwalletdivision",
+            name="journal_last_date",
+            field=models.DateTimeField(default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name="corporationwalletdivision",
+            name="journal_last_entry_id",
+            field=models.BigIntegerField(default=None, null=True),
+        ),
+        migrations.RunPython(
+            remove_duplicate_journal_entries, migrations.RunPython.noop
+        ),
+        migrations.RunPython(set_journal_high_water_mark, migrations.RunPython.noop),
+    ]
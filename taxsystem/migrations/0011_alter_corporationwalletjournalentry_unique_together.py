@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+# Django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0010_corporationwalletdivision_journal_high_water_mark"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="corporationwalletjournalentry",
+            unique_together={("division", "entry_id")},
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:07
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0011_alter_corporationwalletjournalentry_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="alliancefilterset",
+            name="hits",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of payments approved by this filter set"
+            ),
+        ),
+        migrations.AddField(
+            model_name="corporationfilterset",
+            name="hits",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of payments approved by this filter set"
+            ),
+        ),
+    ]
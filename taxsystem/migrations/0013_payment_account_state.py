@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:17
+
+# Django
+from django.db import migrations, models
+
+# AA TaxSystem
+from taxsystem.models.base import PaymentAccountBaseModel
+
+
+def set_payment_account_state(apps, schema_editor):
+    """Fill the payment state of the existing accounts per tax period."""
+    for prefix in ("Corporation", "Alliance"):
+        Owner = apps.get_model("taxsystem", f"{prefix}Owner")
+        PaymentAccount = apps.get_model("taxsystem", f"{prefix}PaymentAccount")
+
+        tax_periods = Owner.objects.values_list("tax_period", flat=True).distinct()
+        for tax_period in tax_periods:
+            PaymentAccount.objects.filter(owner__tax_period=tax_period).update(
+                **PaymentAccountBaseModel.payment_state_expressions(tax_period)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0012_filterset_hits"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="alliancepaymentaccount",
+            name="next_due",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Next due date, empty if inactive/deactivated or never paid",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="alliancepaymentaccount",
+            name="next_notification_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Earliest time for the next notification",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="alliancepaymentaccount",
+            name="paid_until",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="End of the paid period, empty if the deposit is negative",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="corporationpaymentaccount",
+            name="next_due",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Next due date, empty if inactive/deactivated or never paid",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="corporationpaymentaccount",
+            name="next_notification_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Earliest time for the next notification",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="corporationpaymentaccount",
+            name="paid_until",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="End of the paid period, empty if the deposit is negative",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(set_payment_account_state, migrations.RunPython.noop),
+    ]
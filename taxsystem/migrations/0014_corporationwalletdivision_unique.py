@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:34
+
+# Django
+from django.db import migrations, models
+
+
+def merge_duplicate_divisions(apps, schema_editor):
+    """Merge duplicate divisions so the unique constraint can be created."""
+    CorporationWalletDivision = apps.get_model("taxsystem", "CorporationWalletDivision")
+    CorporationWalletJournalEntry = apps.get_model(
+        "taxsystem", "CorporationWalletJournalEntry"
+    )
+    payment_models = [
+        apps.get_model("taxsystem", "CorporationPayments"),
+        apps.get_model("taxsystem", "AlliancePayments"),
+    ]
+
+    duplicates = (
+        CorporationWalletDivision.objects.values("corporation_id", "division_id")
+        .annotate(count=models.Count("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        divisions = list(
+            CorporationWalletDivision.objects.filter(
+                corporation_id=duplicate["corporation_id"],
+                division_id=duplicate["division_id"],
+            ).order_by("pk")
+        )
+        keeper, others = divisions[0], divisions[1:]
+
+        for other in others:
+            kept_entries = dict(
+                CorporationWalletJournalEntry.objects.filter(
+                    division=keeper
+                ).values_list("entry_id", "pk")
+            )
+            for pk, entry_id in CorporationWalletJournalEntry.objects.filter(
+                division=other, entry_id__in=kept_entries
+            ).values_list("pk", "entry_id"):
+                for model in payment_models:
+                    if model.objects.filter(journal_id=kept_entries[entry_id]).exists():
+                        # Both entries have a payment, keep the payment of the
+                        # duplicated entry without its journal entry instead of
+                        # deleting it and its history with the entry
+                        model.objects.filter(journal_id=pk).update(journal_id=None)
+                    else:
+                        # Move a payment that is only linked to the duplicated entry
+                        model.objects.filter(journal_id=pk).update(
+                            journal_id=kept_entries[entry_id]
+                        )
+                CorporationWalletJournalEntry.objects.filter(pk=pk).delete()
+
+            CorporationWalletJournalEntry.objects.filter(division=other).update(
+                division=keeper
+            )
+
+            if other.journal_last_entry_id and (
+                keeper.journal_last_entry_id is None
+                or other.journal_last_entry_id > keeper.journal_last_entry_id
+            ):
+                keeper.journal_last_entry_id = other.journal_last_entry_id
+                keeper.journal_last_date = other.journal_last_date
+            other.delete()
+
+        keeper.save(update_fields=["journal_last_entry_id", "journal_last_date"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0013_payment_account_state"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_divisions, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="corporationwalletdivision",
+            unique_together={("corporation", "division_id")},
+        ),
+    ]
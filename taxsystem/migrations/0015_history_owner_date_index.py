@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:58
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_payment_history_owner(apps, schema_editor):
+    """Copy the owner of each payment to its history entries."""
+    for prefix in ("Corporation", "Alliance"):
+        Payments = apps.get_model("taxsystem", f"{prefix}Payments")
+        PaymentHistory = apps.get_model("taxsystem", f"{prefix}PaymentHistory")
+
+        PaymentHistory.objects.filter(owner__isnull=True).update(
+            owner_id=models.Subquery(
+                Payments.objects.filter(pk=models.OuterRef("payment_id")).values(
+                    "owner_id"
+                )[:1]
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0014_corporationwalletdivision_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="alliancepaymenthistory",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Owner of the payment",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ts_alliance_payment_history",
+                to="taxsystem.allianceowner",
+            ),
+        ),
+        migrations.AddField(
+            model_name="corporationpaymenthistory",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Owner of the payment",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ts_corporation_payment_history",
+                to="taxsystem.corporationowner",
+            ),
+        ),
+        migrations.RunPython(set_payment_history_owner, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="allianceadminhistory",
+            index=models.Index(
+                fields=["owner", "-date", "-id"], name="taxsystem_a_owner_i_2f7219_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="alliancepaymenthistory",
+            index=models.Index(
+                fields=["owner", "-date", "-id"], name="taxsystem_a_owner_i_326c1f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationadminhistory",
+            index=models.Index(
+                fields=["owner", "-date", "-id"], name="taxsystem_c_owner_i_c3050c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="corporationpaymenthistory",
+            index=models.Index(
+                fields=["owner", "-date", "-id"], name="taxsystem_c_owner_i_d890e4_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:03
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxsystem", "0015_history_owner_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "owner_id",
+                    models.BigIntegerField(default=0, help_text="Eve ID of the owner"),
+                ),
+                ("bucket", models.DateTimeField(help_text="Start of the hour")),
+                ("runs", models.PositiveIntegerField(default=0)),
+                ("errors", models.PositiveIntegerField(default=0)),
+                (
+                    "duration",
+                    models.FloatField(
+                        default=0.0, help_text="Total duration in seconds"
+                    ),
+                ),
+                ("max_duration", models.FloatField(default=0.0)),
+                ("queries", models.PositiveBigIntegerField(default=0)),
+                ("esi_calls", models.PositiveBigIntegerField(default=0)),
+                ("rows_written", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "default_permissions": (),
+                "indexes": [
+                    models.Index(
+                        fields=["bucket"], name="taxsystem_m_bucket_de1cf1_idx"
+                    )
+                ],
+                "unique_together": {("name", "owner_id", "bucket")},
+            },
+        ),
+    ]
@@ -216,17 +216,20 @@ class AllianceOwner(models.Model):
     @property
     def get_update_status(self) -> dict[str, str]:
         """Return a dictionary of update sections and their statuses."""
+        statuses = {
+            status.section: status
+            for status in AllianceUpdateStatus.objects.filter(owner=self)
+        }
         update_status = {}
         for section in AllianceUpdateSection.get_sections():
-            try:
-                status = AllianceUpdateStatus.objects.get(owner=self, section=section)
-                update_status[section] = {
-                    "is_success": status.is_success,
-                    "last_update_finished_at": status.last_update_finished_at,
-                    "last_run_finished_at": status.last_run_finished_at,
-                }
-            except AllianceUpdateStatus.DoesNotExist:
+            status = statuses.get(section)
+            if status is None:
                 continue
+            update_status[section] = {
+                "is_success": status.is_success,
+                "last_update_finished_at": status.last_update_finished_at,
+                "last_run_finished_at": status.last_run_finished_at,
+            }
         return update_status
 
 
@@ -287,6 +290,7 @@ class AlliancePayments(PaymentsBaseModel):
         return AlliancePaymentHistory(
             user=user,
             payment=self,
+            owner_id=self.owner_id,
             new_status=new_status,
             action=action,
             comment=comment,
@@ -344,6 +348,16 @@ class AlliancePaymentHistory(HistoryBaseModel):
 
     class Meta:
         default_permissions = ()
+        indexes = (models.Index(fields=["owner", "-date", "-id"]),)
+
+    owner = models.ForeignKey(
+        AllianceOwner,
+        on_delete=models.CASCADE,
+        related_name="ts_alliance_payment_history",
+        help_text=_("Owner of the payment"),
+        null=True,
+        blank=True,
+    )
 
     # pylint: disable=duplicate-code
     payment = models.ForeignKey(
@@ -369,6 +383,7 @@ class AllianceAdminHistory(HistoryBaseModel):
 
     class Meta:
         default_permissions = ()
+        indexes = (models.Index(fields=["owner", "-date", "-id"]),)
 
     owner = models.ForeignKey(
         AllianceOwner,
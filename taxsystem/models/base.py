@@ -16,6 +16,11 @@ from allianceauth.services.hooks import get_extension_logger
 
 # AA TaxSystem
 from taxsystem import __title__, app_settings
+from taxsystem.helpers.cache import (
+    invalidate_dashboard_statistics,
+    invalidate_menu_badges,
+)
+from taxsystem.models.helpers.filters import invalidate_filter_engine
 from taxsystem.models.helpers.textchoices import (
     AccountStatus,
     FilterMatchType,
@@ -71,6 +76,17 @@ class PaymentsBaseModel(models.Model):
         help_text=_("Reviser that approved or rejected the payment"),
     )
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_dashboard_statistics(self.owner)
+        invalidate_menu_badges()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_dashboard_statistics(self.owner)
+        invalidate_menu_badges()
+        return result
+
     @property
     def is_automatic(self) -> bool:
         return self.reviser == "System"
@@ -164,6 +180,145 @@ class PaymentAccountBaseModel(models.Model):
 
     notice = models.TextField(null=True, blank=True)
 
+    # Payment state, kept in sync with the fields above to allow indexed queries
+    next_due = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text=_("Next due date, empty if inactive/deactivated or never paid"),
+    )
+
+    paid_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text=_("End of the paid period, empty if the deposit is negative"),
+    )
+
+    next_notification_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text=_("Earliest time for the next notification"),
+    )
+
+    PAYMENT_STATE_FIELDS = ["next_due", "paid_until", "next_notification_at"]
+
+    def save(self, *args, **kwargs):
+        self.update_payment_state()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | set(
+                self.PAYMENT_STATE_FIELDS
+            )
+        super().save(*args, **kwargs)
+        invalidate_dashboard_statistics(self.owner)
+        invalidate_menu_badges(self.user_id)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_dashboard_statistics(self.owner)
+        invalidate_menu_badges(self.user_id)
+        return result
+
+    def update_payment_state(self, tax_period: int | None = None) -> None:
+        """
+        Calculate the persisted payment state from the current values (unsaved).
+
+        Args:
+            tax_period (int): Tax period of the owner in days, loaded from the owner if not given.
+        """
+        if tax_period is None:
+            tax_period = self.owner.tax_period
+        period = timezone.timedelta(days=tax_period)
+
+        if self.last_paid is None or self.status in [
+            AccountStatus.INACTIVE,
+            AccountStatus.DEACTIVATED,
+        ]:
+            self.next_due = None
+        else:
+            self.next_due = self.last_paid + period
+
+        if self.last_paid is not None and self.deposit >= 0:
+            self.paid_until = self.last_paid + period
+        else:
+            self.paid_until = None
+
+        if self.last_notification is not None:
+            self.next_notification_at = self.last_notification + timezone.timedelta(
+                days=app_settings.TAXSYSTEM_NOTIFICATION_EXPIRATION_DAYS
+            )
+        else:
+            self.next_notification_at = None
+
+    @classmethod
+    def payment_state_expressions(cls, tax_period: int) -> dict:
+        """
+        Return the SQL expressions of update_payment_state for ``QuerySet.update()``.
+
+        Args:
+            tax_period (int): Tax period of the owner in days.
+        Returns:
+            dict: The expressions keyed by field name.
+        """
+        period = timezone.timedelta(days=tax_period)
+        end_of_period = models.ExpressionWrapper(
+            models.F("last_paid") + period, output_field=models.DateTimeField()
+        )
+        return {
+            "next_due": models.Case(
+                models.When(
+                    models.Q(last_paid__isnull=True)
+                    | models.Q(
+                        status__in=[AccountStatus.INACTIVE, AccountStatus.DEACTIVATED]
+                    ),
+                    then=models.Value(None),
+                ),
+                default=end_of_period,
+                output_field=models.DateTimeField(),
+            ),
+            "paid_until": models.Case(
+                models.When(
+                    last_paid__isnull=False, deposit__gte=0, then=end_of_period
+                ),
+                default=models.Value(None),
+                output_field=models.DateTimeField(),
+            ),
+            "next_notification_at": models.ExpressionWrapper(
+                models.F("last_notification")
+                + timezone.timedelta(
+                    days=app_settings.TAXSYSTEM_NOTIFICATION_EXPIRATION_DAYS
+                ),
+                output_field=models.DateTimeField(),
+            ),
+        }
+
+    @staticmethod
+    def get_paid_filter(now=None) -> models.Q:
+        """
+        Return a filter for paid accounts, the negation selects unpaid accounts.
+
+        Args:
+            now (datetime): Reference time, defaults to now.
+        """
+        now = now or timezone.now()
+        return models.Q(deposit__gte=models.F("owner__tax_amount")) | models.Q(
+            paid_until__gt=now
+        )
+
+    @staticmethod
+    def get_notification_due_filter(now=None) -> models.Q:
+        """
+        Return a filter for accounts that may be notified again.
+
+        Args:
+            now (datetime): Reference time, defaults to now.
+        """
+        now = now or timezone.now()
+        return models.Q(next_notification_at__isnull=True) | models.Q(
+            next_notification_at__lte=now
+        )
+
     def __str__(self):
         return f"{self.name} - {self.status} - {self.deposit} ISK - Last Paid: {self.last_paid}"
 
@@ -215,26 +370,6 @@ class PaymentAccountBaseModel(models.Model):
             )
         return False
 
-    @property
-    def next_due(self):
-        """
-        Return the next due date for alliance payment.
-
-        Returns:
-            datetime or None: Next due date or None if inactive/deactivated or never paid.
-        """
-        subclass = getattr(self, "owner", None)
-        if not subclass:
-            raise NotImplementedError(
-                "has_paid property must be implemented in subclass"
-            )
-
-        if self.status in [AccountStatus.INACTIVE, AccountStatus.DEACTIVATED]:
-            return None
-        if self.last_paid:
-            return self.last_paid + timezone.timedelta(days=self.owner.tax_period)
-        return None
-
     @property
     def has_notified(self) -> bool:
         """
@@ -264,22 +399,26 @@ class PaymentAccountBaseModel(models.Model):
             return False
         return True
 
-    def has_paid_icon(self, badge=False, text=False) -> str:
+    def has_paid_icon(self, badge=False, text=False, paid: bool | None = None) -> str:
         """
         Return the HTML icon for has_paid.
 
+        Args:
+            paid (bool): A precomputed has_paid value, computed from the account if not given.
         Returns:
             str: HTML icon string.
         """
-        color = "success" if self.has_paid else "danger"
+        if paid is None:
+            paid = self.has_paid
+        color = "success" if paid else "danger"
 
-        if self.has_paid:
+        if paid:
             html = f"<i class='fas fa-check' title='{PaymentStatus('paid').label}' data-bs-tooltip='aa-taxsystem'></i>"
         else:
             html = f"<i class='fas fa-times' title='{PaymentStatus('unpaid').label}' data-bs-tooltip='aa-taxsystem'></i>"
 
         if text:
-            html += f" {PaymentStatus('paid').label if self.has_paid else PaymentStatus('unpaid').label}"
+            html += f" {PaymentStatus('paid').label if paid else PaymentStatus('unpaid').label}"
 
         if badge:
             html = mark_safe(f"<span class='badge bg-{color}'>{html}</span>")
@@ -370,6 +509,15 @@ class FilterBaseModel(models.Model):
     )
     value = models.CharField(max_length=255, unique=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_filter_engine(self.filter_set.owner)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_filter_engine(self.filter_set.owner)
+        return result
+
     def get_match_type_filter(self) -> models.Q:
         """
         Generate a Q object based on the filter type and match type.
@@ -393,10 +541,23 @@ class FilterSetBaseModel(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.CharField(max_length=255, blank=True)
     enabled = models.BooleanField(default=True)
+    hits = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of payments approved by this filter set"),
+    )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_filter_engine(self.owner)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_filter_engine(self.owner)
+        return result
+
     @property
     def is_active(self) -> bool:
         return self.enabled
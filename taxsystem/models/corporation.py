@@ -16,6 +16,13 @@ from esi.models import Token
 
 # AA TaxSystem
 from taxsystem import __title__
+from taxsystem.helpers.cache import (
+    CachedToken,
+    get_cached_token,
+    invalidate_token_cache,
+    set_cached_token,
+    token_cache_counter,
+)
 from taxsystem.managers.corporation_manager import (
     CorporationAccountManager,
     MembersManager,
@@ -174,10 +181,27 @@ class CorporationOwner(models.Model):
         ]
 
     def get_token(self, scopes, req_roles) -> Token:
-        """Get the token for this corporation."""
+        """
+        Get a token of a character with one of the required roles for this corporation.
+
+        The last working token is cached per scope set until its roles expire
+        in ESI or the token fails.
+        """
+        scopes = list(scopes)
         if "esi-characters.read_corporation_roles.v1" not in scopes:
             scopes.append("esi-characters.read_corporation_roles.v1")
 
+        cached = get_cached_token(self, scopes, req_roles)
+        if cached is not None:
+            token = (
+                Token.objects.filter(pk=cached.token_pk).require_scopes(scopes).first()
+            )
+            if token is not None:
+                token_cache_counter.hit()
+                return token
+            invalidate_token_cache(self)
+        token_cache_counter.miss()
+
         char_ids = EveCharacter.objects.filter(
             corporation_id=self.eve_corporation.corporation_id
         ).values("character_id")
@@ -196,6 +220,12 @@ class CorporationOwner(models.Model):
                         has_roles = True
 
                 if has_roles:
+                    set_cached_token(
+                        self,
+                        scopes,
+                        req_roles,
+                        CachedToken(token_pk=token.pk, roles=list(roles.roles)),
+                    )
                     return token
             except TokenError as e:
                 logger.error(
@@ -289,19 +319,20 @@ class CorporationOwner(models.Model):
     @property
     def get_update_status(self) -> dict[str, str]:
         """Return a dictionary of update sections and their statuses."""
+        statuses = {
+            status.section: status
+            for status in CorporationUpdateStatus.objects.filter(owner=self)
+        }
         update_status = {}
         for section in CorporationUpdateSection.get_sections():
-            try:
-                status = CorporationUpdateStatus.objects.get(
-                    owner=self, section=section
-                )
-                update_status[section] = {
-                    "is_success": status.is_success,
-                    "last_update_finished_at": status.last_update_finished_at,
-                    "last_run_finished_at": status.last_run_finished_at,
-                }
-            except CorporationUpdateStatus.DoesNotExist:
+            status = statuses.get(section)
+            if status is None:
                 continue
+            update_status[section] = {
+                "is_success": status.is_success,
+                "last_update_finished_at": status.last_update_finished_at,
+                "last_run_finished_at": status.last_run_finished_at,
+            }
         return update_status
 
 
@@ -421,6 +452,7 @@ class CorporationPayments(PaymentsBaseModel):
         return CorporationPaymentHistory(
             user=user,
             payment=self,
+            owner_id=self.owner_id,
             new_status=new_status,
             action=action,
             comment=comment,
@@ -481,6 +513,16 @@ class CorporationPaymentHistory(HistoryBaseModel):
 
     class Meta:
         default_permissions = ()
+        indexes = (models.Index(fields=["owner", "-date", "-id"]),)
+
+    owner = models.ForeignKey(
+        CorporationOwner,
+        on_delete=models.CASCADE,
+        related_name="ts_corporation_payment_history",
+        help_text=_("Owner of the payment"),
+        null=True,
+        blank=True,
+    )
 
     # pylint: disable=duplicate-code
     payment = models.ForeignKey(
@@ -507,6 +549,7 @@ class CorporationAdminHistory(HistoryBaseModel):
 
     class Meta:
         default_permissions = ()
+        indexes = (models.Index(fields=["owner", "-date", "-id"]),)
 
     # pylint: disable=duplicate-code
     owner = models.ForeignKey(
@@ -10,6 +10,7 @@ from django.utils.translation import gettext_lazy as _
 
 # AA TaxSystem
 from taxsystem.managers.eveonline_manager import EveEntityManager
+from taxsystem.managers.metrics_manager import MetricRollupManager
 
 
 class General(models.Model):
@@ -47,6 +48,25 @@ class UpdateSectionResult(NamedTuple):
     data: Any = None
 
 
+class TaxAccountReconciliation(NamedTuple):
+    """
+    A report of a tax account reconciliation run.
+
+    Attributes:
+        created (int): Number of new tax accounts.
+        missing (int): Number of accounts marked as missing.
+        returned (int): Number of missing accounts that were reset after the user returned.
+        moved (int): Number of accounts moved to another owner.
+        deleted (int): Number of orphaned accounts that were deleted.
+    """
+
+    created: int = 0
+    missing: int = 0
+    returned: int = 0
+    moved: int = 0
+    deleted: int = 0
+
+
 @dataclass(frozen=True)
 class _NeedsUpdate:
     """
@@ -79,3 +99,28 @@ class EveEntity(models.Model):
         default_permissions = ()
 
     objects: EveEntityManager = EveEntityManager()
+
+
+class MetricRollup(models.Model):
+    """Hourly sum of the measurements of an update section or API endpoint per owner."""
+
+    name = models.CharField(max_length=100)
+    owner_id = models.BigIntegerField(default=0, help_text=_("Eve ID of the owner"))
+    bucket = models.DateTimeField(help_text=_("Start of the hour"))
+    runs = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    duration = models.FloatField(default=0.0, help_text=_("Total duration in seconds"))
+    max_duration = models.FloatField(default=0.0)
+    queries = models.PositiveBigIntegerField(default=0)
+    esi_calls = models.PositiveBigIntegerField(default=0)
+    rows_written = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        default_permissions = ()
+        unique_together = [("name", "owner_id", "bucket")]
+        indexes = (models.Index(fields=["bucket"]),)
+
+    objects: MetricRollupManager = MetricRollupManager()
+
+    def __str__(self) -> str:
+        return f"{self.bucket}: {self.name} ({self.owner_id})"
@@ -0,0 +1,188 @@
+# Standard Library
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Any, NamedTuple, Union
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA TaxSystem
+from taxsystem import __title__
+from taxsystem.helpers.cache import (
+    FILTER_ENGINE_CACHE,
+    get_owner_cache_key,
+    invalidate_owner_cache,
+)
+from taxsystem.models.helpers.textchoices import FilterMatchType
+from taxsystem.providers import AppLogger
+
+if TYPE_CHECKING:
+    # AA TaxSystem
+    from taxsystem.models.alliance import AllianceOwner
+    from taxsystem.models.corporation import CorporationOwner
+
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+# Compiled filter sets are kept until a filter or filter set changes
+FILTER_ENGINE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class CompiledRule(NamedTuple):
+    """
+    A single filter compiled for in-memory evaluation.
+
+    Attributes:
+        field (str): The payment field the rule checks.
+        match_type (str): The FilterMatchType of the rule.
+        value (Any): The prepared value, a Decimal for amount rules and a casefolded string otherwise.
+    """
+
+    field: str
+    match_type: str
+    value: Any
+
+    @classmethod
+    def compile(cls, field: str, match_type: str, value: str) -> "CompiledRule":
+        """Prepare a filter value once, so matching does not convert it per payment."""
+        if field == "amount" and match_type == FilterMatchType.EXACT:
+            try:
+                return cls(field, match_type, Decimal(value))
+            except InvalidOperation:
+                # A non numeric amount can never match
+                return cls(field, match_type, None)
+        return cls(field, match_type, str(value).casefold())
+
+    def matches(self, payment) -> bool:
+        """Return True if the payment satisfies this rule."""
+        current = getattr(payment, self.field, None)
+        if current is None or self.value is None:
+            return False
+        if self.field == "amount" and self.match_type == FilterMatchType.EXACT:
+            return current == self.value
+        current = str(current).casefold()
+        if self.match_type == FilterMatchType.CONTAINS:
+            return self.value in current
+        return current == self.value
+
+
+class CompiledFilterSet(NamedTuple):
+    """
+    An enabled filter set with all of its rules, all rules have to match.
+
+    Attributes:
+        pk (int): The primary key of the filter set.
+        name (str): The name of the filter set.
+        rules (tuple[CompiledRule, ...]): The compiled rules of the filter set.
+    """
+
+    pk: int
+    name: str
+    rules: tuple[CompiledRule, ...]
+
+    def matches(self, payment) -> bool:
+        """Return True if the payment satisfies every rule of this set."""
+        return all(rule.matches(payment) for rule in self.rules)
+
+
+class FilterEngine:
+    """Match payments against the compiled filter sets of an owner in memory.
+
+    Args:
+        filter_sets (list[CompiledFilterSet]): The compiled, enabled filter sets with at least one rule
+    """
+
+    def __init__(self, filter_sets: list[CompiledFilterSet]):
+        self.filter_sets = filter_sets
+
+    def __bool__(self) -> bool:
+        return bool(self.filter_sets)
+
+    def match(self, payment) -> int | None:
+        """
+        Get the first filter set that matches the payment.
+
+        Returns:
+            int | None: The primary key of the matching filter set or None.
+        """
+        for filter_set in self.filter_sets:
+            if filter_set.matches(payment):
+                return filter_set.pk
+        return None
+
+    def evaluate(self, payments) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        Evaluate all payments in one pass.
+
+        Args:
+            payments: Iterable of payments with ``pk``, ``amount`` and ``reason``.
+        Returns:
+            tuple: Mapping of payment pk -> filter set pk for every match,
+                and the number of hits per filter set pk.
+        """
+        matches: dict[int, int] = {}
+        hits: dict[int, int] = {}
+        if not self.filter_sets:
+            return matches, hits
+
+        for payment in payments:
+            filter_set_pk = self.match(payment)
+            if filter_set_pk is not None:
+                matches[payment.pk] = filter_set_pk
+                hits[filter_set_pk] = hits.get(filter_set_pk, 0) + 1
+        return matches, hits
+
+
+def compile_filter_sets(
+    owner: Union["CorporationOwner", "AllianceOwner"],
+) -> list[CompiledFilterSet]:
+    """
+    Compile all enabled filter sets of an owner with a single query.
+
+    Filter sets without any filter are skipped, they never match.
+    """
+    rules: dict[int, list[CompiledRule]] = {}
+    names: dict[int, str] = {}
+    for filter_set_pk, name, filter_type, match_type, value in (
+        owner.filter_model.objects.filter(
+            filter_set__owner=owner, filter_set__enabled=True
+        )
+        .order_by("filter_set_id", "pk")
+        .values_list(
+            "filter_set_id", "filter_set__name", "filter_type", "match_type", "value"
+        )
+    ):
+        names[filter_set_pk] = name
+        rules.setdefault(filter_set_pk, []).append(
+            CompiledRule.compile(filter_type, match_type, value)
+        )
+    return [
+        CompiledFilterSet(pk=pk, name=names[pk], rules=tuple(filter_rules))
+        for pk, filter_rules in rules.items()
+    ]
+
+
+def get_filter_engine(
+    owner: Union["CorporationOwner", "AllianceOwner"],
+) -> FilterEngine:
+    """
+    Get the filter engine of an owner, compiled filter sets are cached until a filter changes.
+
+    Args:
+        owner (CorporationOwner | AllianceOwner): The owner of the filter sets
+    Returns:
+        FilterEngine: The engine for the owner.
+    """
+    key = get_owner_cache_key(owner, FILTER_ENGINE_CACHE)
+    filter_sets = cache.get(key)
+    if filter_sets is None:
+        filter_sets = compile_filter_sets(owner)
+        cache.set(key, filter_sets, FILTER_ENGINE_CACHE_TIMEOUT)
+        logger.debug("Compiled %s filter sets for %s", len(filter_sets), owner.name)
+    return FilterEngine(filter_sets)
+
+
+def invalidate_filter_engine(owner: Union["CorporationOwner", "AllianceOwner"]):
+    """Drop the compiled filter sets of an owner."""
+    invalidate_owner_cache(owner, FILTER_ENGINE_CACHE)
@@ -0,0 +1,497 @@
+# Standard Library
+from collections import Counter, defaultdict
+from decimal import Decimal
+from typing import TYPE_CHECKING, NamedTuple, Union
+
+# Django
+from django.db import models
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.services.hooks import get_extension_logger
+
+# AA TaxSystem
+from taxsystem import __title__
+from taxsystem.app_settings import TAXSYSTEM_BULK_BATCH_SIZE
+from taxsystem.helpers.cache import invalidate_menu_badges
+from taxsystem.models.helpers.filters import get_filter_engine
+from taxsystem.models.helpers.textchoices import (
+    AccountStatus,
+    PaymentActions,
+    PaymentRequestStatus,
+    PaymentSystemText,
+)
+from taxsystem.providers import AppLogger
+
+if TYPE_CHECKING:
+    # AA TaxSystem
+    from taxsystem.models.alliance import (
+        AllianceOwner,
+        AlliancePaymentAccount,
+        AlliancePaymentHistory,
+        AlliancePayments,
+    )
+    from taxsystem.models.corporation import (
+        CorporationOwner,
+        CorporationPaymentAccount,
+        CorporationPaymentHistory,
+        CorporationPayments,
+    )
+
+logger = AppLogger(get_extension_logger(__name__), __title__)
+
+
+class PaymentMatcher:
+    """Match player donations from the corporation wallet journal to tax accounts.
+
+    The matcher builds a single ``character_id -> account`` index from one
+    CharacterOwnership query and only checks journal entries that have no
+    payment yet.
+
+    Args:
+        owner (CorporationOwner | AllianceOwner): The owner the payments belong to
+        corporation (CorporationOwner): The corporation whose wallet journal is used
+        account_model (CorporationPaymentAccount | AlliancePaymentAccount): The tax account model
+        payment_model (CorporationPayments | AlliancePayments): The payment model
+        history_model (CorporationPaymentHistory | AlliancePaymentHistory): The payment history model
+    """
+
+    REF_TYPES = ["player_donation"]
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        owner: Union["CorporationOwner", "AllianceOwner"],
+        corporation: "CorporationOwner",
+        account_model: type[
+            Union["CorporationPaymentAccount", "AlliancePaymentAccount"]
+        ],
+        payment_model: type[Union["CorporationPayments", "AlliancePayments"]],
+        history_model: type[
+            Union["CorporationPaymentHistory", "AlliancePaymentHistory"]
+        ],
+    ):
+        self.owner = owner
+        self.corporation = corporation
+        self.account_model = account_model
+        self.payment_model = payment_model
+        self.history_model = history_model
+
+    def build_account_index(
+        self,
+    ) -> dict[int, Union["CorporationPaymentAccount", "AlliancePaymentAccount"]]:
+        """
+        Build the character_id -> tax account index for the owner.
+
+        Returns:
+            dict: Mapping of every owned character ID to its tax account.
+        """
+        accounts_by_user = {
+            account.user_id: account
+            for account in self.account_model.objects.filter(owner=self.owner)
+        }
+        if not accounts_by_user:
+            return {}
+
+        ownerships = CharacterOwnership.objects.filter(
+            user_id__in=accounts_by_user.keys()
+        ).values_list("character__character_id", "user_id")
+        return {
+            character_id: accounts_by_user[user_id]
+            for character_id, user_id in ownerships
+        }
+
+    def get_unprocessed_journal(self, character_ids) -> models.QuerySet:
+        """
+        Get the journal entries that are not yet processed for the owner.
+
+        Only entries from the owner's characters that have no payment yet are
+        returned. Older entries are still matched when a character is linked to a
+        tax account after newer donations were processed.
+
+        Args:
+            character_ids: Character IDs (list or subquery) to match the first party against.
+        Returns:
+            QuerySet: The unprocessed journal entries ordered by date.
+        """
+        # pylint: disable=import-outside-toplevel, cyclic-import
+        # AA TaxSystem
+        from taxsystem.models.wallet import CorporationWalletJournalEntry
+
+        # Anti-join on the unique journal column of the payments
+        journal_qs = CorporationWalletJournalEntry.objects.filter(
+            division__corporation=self.corporation,
+            ref_type__in=self.REF_TYPES,
+            first_party_id__in=character_ids,
+        ).filter(
+            ~models.Exists(
+                self.payment_model.objects.filter(journal=models.OuterRef("pk"))
+            )
+        )
+        return journal_qs.only(
+            "pk", "entry_id", "amount", "date", "reason", "first_party_id"
+        ).order_by("date")
+
+    def run(self) -> int:
+        """
+        Create pending payments and their history for all unprocessed journal entries.
+
+        Returns:
+            int: The number of created payments.
+        """
+        index = self.build_account_index()
+        if not index:
+            return 0
+
+        # Let the database match the first party instead of sending all IDs
+        character_ids = CharacterOwnership.objects.filter(
+            user__in=self.account_model.objects.filter(owner=self.owner).values(
+                "user_id"
+            )
+        ).values("character__character_id")
+
+        items = []
+        for journal in self.get_unprocessed_journal(character_ids).iterator(
+            chunk_size=TAXSYSTEM_BULK_BATCH_SIZE
+        ):
+            account = index.get(journal.first_party_id)
+            if account is None:
+                continue
+            items.append(
+                self.payment_model(
+                    owner=self.owner,
+                    journal=journal,
+                    name=account.name,
+                    account=account,
+                    amount=journal.amount,
+                    request_status=PaymentRequestStatus.PENDING,
+                    date=journal.date,
+                    reason=journal.reason,
+                )
+            )
+
+        if not items:
+            return 0
+
+        payments = self.payment_model.objects.bulk_create(
+            items, batch_size=TAXSYSTEM_BULK_BATCH_SIZE
+        )
+
+        # Backends that can not return the PKs from the insert need one lookup
+        if any(payment.pk is None for payment in payments):
+            pks = dict(
+                self.payment_model.objects.filter(
+                    owner=self.owner,
+                    journal_id__in=[payment.journal_id for payment in payments],
+                ).values_list("journal_id", "pk")
+            )
+            for payment in payments:
+                payment.pk = pks.get(payment.journal_id)
+
+        self.history_model.objects.bulk_create(
+            [
+                self.history_model(
+                    user_id=payment.account.user_id,
+                    payment_id=payment.pk,
+                    owner=self.owner,
+                    action=PaymentActions.STATUS_CHANGE,
+                    new_status=PaymentRequestStatus.PENDING,
+                    comment=PaymentSystemText.ADDED,
+                )
+                for payment in payments
+                if payment.pk is not None
+            ],
+            batch_size=TAXSYSTEM_BULK_BATCH_SIZE,
+        )
+        invalidate_menu_badges()
+        return len(payments)
+
+
+class ApprovalResult(NamedTuple):
+    """
+    A result of a batched approval run.
+
+    Attributes:
+        approved (int): Number of payments approved by a filter set.
+        needs_approval (int): Number of pending payments that need a manual review.
+        hits (dict[int, int] | None): Number of approved payments per filter set pk.
+    """
+
+    approved: int = 0
+    needs_approval: int = 0
+    hits: dict[int, int] | None = None
+
+
+class PaymentApprover:
+    """Approve the open payments of an owner in bulk through its filter sets.
+
+    The open payments are loaded with a single query and matched in memory against
+    the compiled filter sets of the owner. Statuses, deposits and history rows are
+    written with one statement each.
+
+    Args:
+        owner (CorporationOwner | AllianceOwner): The owner the payments belong to
+    """
+
+    OPEN_STATUSES = [
+        PaymentRequestStatus.PENDING,
+        PaymentRequestStatus.NEEDS_APPROVAL,
+    ]
+
+    def __init__(self, owner: Union["CorporationOwner", "AllianceOwner"]):
+        self.owner = owner
+        self.account_model = owner.account_model
+        self.payment_model = owner.payment_model
+        self.history_model = owner.payment_history_model
+
+    def _add_deposits(self, payments: list) -> None:
+        """Add the approved amounts to the deposits of their accounts."""
+        amounts: dict[int, Decimal] = defaultdict(Decimal)
+        for payment in payments:
+            amounts[payment.account_id] += payment.amount
+
+        field = self.account_model._meta.get_field("deposit")
+        account_ids = list(amounts)
+        for i in range(0, len(account_ids), TAXSYSTEM_BULK_BATCH_SIZE):
+            batch = account_ids[i : i + TAXSYSTEM_BULK_BATCH_SIZE]
+            self.account_model.objects.filter(pk__in=batch).update(
+                deposit=models.F("deposit")
+                + models.Case(
+                    *[
+                        models.When(
+                            pk=account_id, then=models.Value(amounts[account_id])
+                        )
+                        for account_id in batch
+                    ],
+                    default=models.Value(0),
+                    output_field=models.DecimalField(
+                        max_digits=field.max_digits,
+                        decimal_places=field.decimal_places,
+                    ),
+                )
+            )
+            # A higher deposit can change the paid state
+            self.account_model.objects.filter(pk__in=batch).update(
+                **self.account_model.payment_state_expressions(self.owner.tax_period)
+            )
+
+    def _add_hits(self, hits: dict[int, int]) -> None:
+        """Add the approved payments to the hit counters of their filter sets."""
+        self.owner.filterset_model.objects.filter(pk__in=hits).update(
+            hits=models.F("hits")
+            + models.Case(
+                *[
+                    models.When(pk=filter_set_pk, then=models.Value(count))
+                    for filter_set_pk, count in hits.items()
+                ],
+                default=models.Value(0),
+            )
+        )
+
+    def _create_history(self, payments: list, new_status: str, comment: str) -> None:
+        """Create the status change history for the given payments."""
+        self.history_model.objects.bulk_create(
+            [
+                self.history_model(
+                    user_id=payment.account.user_id,
+                    payment_id=payment.pk,
+                    owner=self.owner,
+                    action=PaymentActions.STATUS_CHANGE,
+                    new_status=new_status,
+                    comment=comment,
+                )
+                for payment in payments
+            ],
+            batch_size=TAXSYSTEM_BULK_BATCH_SIZE,
+        )
+
+    def run(self) -> ApprovalResult:
+        """
+        Approve all matching open payments and flag the remaining pending ones.
+
+        Returns:
+            ApprovalResult: The counts of the processed payments.
+        """
+        engine = get_filter_engine(self.owner)
+
+        payments = list(
+            self.payment_model.objects.filter(
+                account__owner=self.owner,
+                request_status__in=self.OPEN_STATUSES,
+            )
+            .select_related("account")
+            .only(
+                "pk", "amount", "reason", "request_status", "reviser", "account__user"
+            )
+        )
+
+        matches, hits = engine.evaluate(payments)
+        approved = [payment for payment in payments if payment.pk in matches]
+        needs_approval = [
+            payment
+            for payment in payments
+            if payment.pk not in matches
+            and payment.request_status == PaymentRequestStatus.PENDING
+        ]
+
+        if approved:
+            for payment in approved:
+                payment.request_status = PaymentRequestStatus.APPROVED
+                payment.reviser = "System"
+            self.payment_model.objects.bulk_update(
+                approved,
+                ["request_status", "reviser"],
+                batch_size=TAXSYSTEM_BULK_BATCH_SIZE,
+            )
+            self._add_deposits(approved)
+            self._create_history(
+                approved, PaymentRequestStatus.APPROVED, PaymentSystemText.AUTOMATIC
+            )
+            self._add_hits(hits)
+
+        if needs_approval:
+            self.payment_model.objects.filter(
+                pk__in=[payment.pk for payment in needs_approval]
+            ).update(request_status=PaymentRequestStatus.NEEDS_APPROVAL)
+            self._create_history(
+                needs_approval,
+                PaymentRequestStatus.NEEDS_APPROVAL,
+                PaymentSystemText.REVISER,
+            )
+
+        if approved or needs_approval:
+            invalidate_menu_badges()
+        return ApprovalResult(
+            approved=len(approved), needs_approval=len(needs_approval), hits=hits
+        )
+
+
+class DeadlineResult(NamedTuple):
+    """
+    A result of a payment deadline run.
+
+    Attributes:
+        initialised (int): Number of accounts that got their first (free) period started.
+        charged (int): Number of accounts the tax amount was deducted from.
+        periods (int): Number of charged periods, higher than charged if runs were missed.
+    """
+
+    initialised: int = 0
+    charged: int = 0
+    periods: int = 0
+
+
+class PaymentDeadlineProcessor:
+    """Deduct the tax amount from all accounts of an owner whose period elapsed.
+
+    All due accounts are charged with one conditional UPDATE. Accounts that missed
+    several periods are charged once per period and ``last_paid`` is advanced by
+    whole periods, so the schedule does not drift with the task runs.
+
+    Args:
+        owner (CorporationOwner | AllianceOwner): The owner of the tax accounts
+        now (datetime): Reference time of the run, defaults to now.
+    """
+
+    def __init__(self, owner: Union["CorporationOwner", "AllianceOwner"], now=None):
+        self.owner = owner
+        self.account_model = owner.account_model
+        self.now = now or timezone.now()
+        self.period = timezone.timedelta(days=owner.tax_period)
+
+    def _missed_periods(self, last_paid) -> int:
+        """Return the number of elapsed periods since last_paid."""
+        if not self.period:
+            return 1
+        return (self.now - last_paid) // self.period
+
+    def _period_filter(self, missed: int) -> models.Q:
+        """Return a filter for accounts that missed exactly ``missed`` periods."""
+        if not self.period:
+            return models.Q(last_paid__lte=self.now)
+        return models.Q(
+            last_paid__lte=self.now - missed * self.period,
+            last_paid__gt=self.now - (missed + 1) * self.period,
+        )
+
+    def _next_last_paid(self, missed: int):
+        """Return the expression of the new last_paid value after ``missed`` periods."""
+        if not self.period:
+            return models.Value(self.now)
+        return models.F("last_paid") + missed * self.period
+
+    def run(self) -> DeadlineResult:
+        """
+        Charge all due accounts and start the first period of new accounts.
+
+        Returns:
+            DeadlineResult: The counts of the affected accounts.
+        """
+        due_accounts = self.account_model.objects.filter(
+            models.Q(last_paid__isnull=True)
+            | models.Q(last_paid__lte=self.now - self.period),
+            owner=self.owner,
+            status=AccountStatus.ACTIVE,
+        )
+
+        last_paids = list(due_accounts.values_list("last_paid", flat=True))
+        if not last_paids:
+            return DeadlineResult()
+
+        missed = Counter(
+            self._missed_periods(last_paid)
+            for last_paid in last_paids
+            if last_paid is not None
+        )
+
+        field = self.account_model._meta.get_field("deposit")
+        # The deposit has to be set first, MySQL evaluates SET clauses in order
+        updated = due_accounts.update(
+            deposit=models.F("deposit")
+            - models.Case(
+                *[
+                    models.When(
+                        self._period_filter(count),
+                        then=models.Value(count * self.owner.tax_amount),
+                    )
+                    for count in missed
+                ],
+                default=models.Value(0),
+                output_field=models.DecimalField(
+                    max_digits=field.max_digits,
+                    decimal_places=field.decimal_places,
+                ),
+            ),
+            last_paid=models.Case(
+                # First Period is free
+                models.When(last_paid__isnull=True, then=models.Value(self.now)),
+                *[
+                    models.When(
+                        self._period_filter(count),
+                        then=self._next_last_paid(count),
+                    )
+                    for count in missed
+                ],
+                default=models.F("last_paid"),
+                output_field=models.DateTimeField(),
+            ),
+        )
+
+        # The updated accounts are the ones with an elapsed or unknown due date
+        self.account_model.objects.filter(
+            models.Q(next_due__isnull=True) | models.Q(next_due__lte=self.now),
+            owner=self.owner,
+            status=AccountStatus.ACTIVE,
+        ).update(**self.account_model.payment_state_expressions(self.owner.tax_period))
+
+        invalidate_menu_badges()
+
+        initialised = len(last_paids) - sum(missed.values())
+        result = DeadlineResult(
+            initialised=initialised,
+            charged=updated - initialised,
+            periods=sum(count * accounts for count, accounts in missed.items()),
+        )
+        logger.debug("Payment deadlines for %s: %s", self.owner.name, result)
+        return result
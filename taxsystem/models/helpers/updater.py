@@ -1,4 +1,5 @@
 # Standard Library
+from datetime import datetime
 from typing import TYPE_CHECKING, Union
 
 # Django
@@ -7,10 +8,17 @@ from django.utils import timezone
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
+from esi.errors import TokenError
 from esi.exceptions import HTTPClientError, HTTPNotModified, HTTPServerError
 
 # AA TaxSystem
 from taxsystem import __title__
+from taxsystem.helpers.cache import (
+    invalidate_dashboard_statistics,
+    invalidate_token_cache,
+)
+from taxsystem.helpers.db import bulk_upsert
+from taxsystem.helpers.instrumentation import measure
 from taxsystem.models.general import (
     UpdateSectionResult,
     _NeedsUpdate,
@@ -85,6 +93,7 @@ class UpdateManager:
             section=section,
         )[0]
         update_status_obj.reset()
+        invalidate_dashboard_statistics(self.owner)
         return update_status_obj
 
     def reset_has_token_error(self) -> None:
@@ -136,6 +145,9 @@ class UpdateManager:
                 error_message,
                 exc.status_code,
             )
+            if exc.status_code == 403:
+                # The cached token lost its roles or scopes
+                invalidate_token_cache(self.owner)
             return UpdateSectionResult(
                 is_changed=False,
                 is_updated=False,
@@ -176,14 +188,88 @@ class UpdateManager:
             obj.last_update_at = obj.last_run_at
             obj.last_update_finished_at = timezone.now()
             obj.save()
+        invalidate_dashboard_statistics(self.owner)
         status = "successfully" if is_success else "with errors"
         logger.info("%s: %s Update run completed %s", self.owner, section.label, status)
 
+    def bulk_update_section_logs(
+        self,
+        section_logs: list[tuple[models.TextChoices, datetime, UpdateSectionResult]],
+    ) -> None:
+        """
+        Update the status of several sections with one upsert.
+
+        Args:
+            section_logs (list): Tuples of the section, the start time of its run and its result.
+        Returns:
+            None
+        """
+        if not section_logs:
+            return
+
+        now = timezone.now()
+        last_updates = {
+            section: (last_update_at, last_update_finished_at)
+            for section, last_update_at, last_update_finished_at in self.update_status.objects.filter(
+                owner=self.owner
+            ).values_list(
+                "section", "last_update_at", "last_update_finished_at"
+            )
+        }
+        objs = []
+        for section, started_at, result in section_logs:
+            if result.is_updated:
+                last_update_at, last_update_finished_at = started_at, now
+            else:
+                last_update_at, last_update_finished_at = last_updates.get(
+                    section, (None, None)
+                )
+            objs.append(
+                self.update_status(
+                    owner=self.owner,
+                    section=section,
+                    is_success=not result.has_token_error,
+                    error_message=result.error_message or "",
+                    has_token_error=result.has_token_error,
+                    last_run_at=started_at,
+                    last_run_finished_at=now,
+                    last_update_at=last_update_at,
+                    last_update_finished_at=last_update_finished_at,
+                )
+            )
+
+        bulk_upsert(
+            self.update_status.objects,
+            objs,
+            unique_fields=["owner", "section"],
+            update_fields=[
+                "is_success",
+                "error_message",
+                "has_token_error",
+                "last_run_at",
+                "last_run_finished_at",
+                "last_update_at",
+                "last_update_finished_at",
+            ],
+        )
+        invalidate_dashboard_statistics(self.owner)
+        for section, _, result in section_logs:
+            status = "with errors" if result.has_token_error else "successfully"
+            logger.info(
+                "%s: %s Update run completed %s",
+                self.owner,
+                section.label,
+                status,
+            )
+
     def perform_update_status(
         self, section: models.TextChoices, method, *args, **kwargs
     ):
         """
         Perform update status.
+
+        Every run is measured as ``section.<section>`` of the owner.
+
         Args:
             section (models.TextChoices): The section to update.
             method (Callable): The method to perform the update.
@@ -196,10 +282,14 @@ class UpdateManager:
             Exception: Reraises any exception encountered during the method call.
         """
         try:
-            result = method(*args, **kwargs)
+            with measure(f"section.{section}", owner_id=self.owner.eve_id) as metric:
+                result = method(*args, **kwargs)
+                metric.is_success = not getattr(result, "has_token_error", False)
         except HTTPServerError as exc:
             raise exc
         except Exception as exc:
+            if isinstance(exc, TokenError):
+                invalidate_token_cache(self.owner)
             error_message = f"{type(exc).__name__}: {str(exc)}"
             logger.error(
                 "%s: %s: Error during update status: %s",
@@ -91,10 +91,15 @@ class CorporationWalletDivision(models.Model):
     balance = models.DecimalField(max_digits=20, decimal_places=2)
     division_id = models.IntegerField()
 
+    # High-water mark of the stored wallet journal
+    journal_last_entry_id = models.BigIntegerField(null=True, default=None)
+    journal_last_date = models.DateTimeField(null=True, default=None)
+
     objects: CorporationDivisionManager = CorporationDivisionManager()
 
     class Meta:
         default_permissions = ()
+        unique_together = [("corporation", "division_id")]
 
 
 class CorporationWalletJournalEntry(WalletJournalEntry):
@@ -106,5 +111,8 @@ class CorporationWalletJournalEntry(WalletJournalEntry):
 
     objects: CorporationWalletManager = CorporationWalletManager()
 
+    class Meta(WalletJournalEntry.Meta):
+        unique_together = [("division", "entry_id")]
+
     def __str__(self):
         return f"Corporation Wallet Journal: {self.first_party.name} '{self.ref_type}' {self.second_party.name}: {self.amount} isk"
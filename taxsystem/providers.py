@@ -12,6 +12,7 @@ from aiopenapi3 import RequestError
 from celery import Task
 
 # Django
+from django.core.cache import cache
 from django.utils import timezone
 
 # Alliance Auth
@@ -46,6 +47,12 @@ esi = ESIClientProvider(
 
 DOWNTIME_TIMER = 60 * 10  # 10 minutes
 
+# Errors ESI allows per window before requests are blocked
+ESI_ERROR_LIMIT = 100
+ESI_BUDGET_CACHE_KEY = "taxsystem-esi-budget"
+# Time in seconds a seen ESI budget is considered current
+ESI_BUDGET_CACHE_TIMEOUT = 60
+
 
 class AppLogger(logging.LoggerAdapter):
     """
@@ -87,7 +94,7 @@ logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
 
 
 @contextmanager
-def retry_task_on_esi_error(task: Task):
+def retry_task_on_esi_error(task: Task, kwargs: dict | None = None):
     """Retry Task when a ESI error occurs.
 
     Taken from the `allianceauth-app-utils` package.
@@ -101,6 +108,7 @@ def retry_task_on_esi_error(task: Task):
     - DownTimeError (ESI's daily downtime from 11:00 to 11:15 UTC)
 
     :param task: Celery Task instance
+    :param kwargs: Keyword arguments for the retried task, defaults to the current ones
     :return: Context manager that retries the task on ESI errors.
 
     """
@@ -115,7 +123,7 @@ def retry_task_on_esi_error(task: Task):
                 countdown,
                 issue,
             )
-        raise task.retry(countdown=countdown, exc=exc)
+        raise task.retry(countdown=countdown, exc=exc, kwargs=kwargs)
 
     def daily_downtime():
         """Checks if the current time is within ESI's daily downtime window (11:00 - 11:15 UTC)."""
@@ -148,3 +156,55 @@ def retry_task_on_esi_error(task: Task):
         retry(exc, DOWNTIME_TIMER, "Request Error")
     except DownTimeError as exc:
         retry(exc, DOWNTIME_TIMER, "Downtime Error")
+
+
+def record_esi_budget(headers: dict | None) -> None:
+    """
+    Remember the remaining ESI error and rate limit budget of a response.
+
+    Args:
+        headers (dict): The response headers of an ESI request.
+    """
+    if not headers:
+        return
+    headers = {str(key).lower(): value for key, value in dict(headers).items()}
+
+    budgets = {}
+    try:
+        if "x-esi-error-limit-remain" in headers:
+            budgets["error"] = (
+                int(headers["x-esi-error-limit-remain"]) / ESI_ERROR_LIMIT
+            )
+        if "x-ratelimit-remaining" in headers and "x-ratelimit-limit" in headers:
+            # The limit header is formatted as "<tokens>/<window>"
+            limit = int(str(headers["x-ratelimit-limit"]).split("/", maxsplit=1)[0])
+            budgets["bucket"] = int(headers["x-ratelimit-remaining"]) / limit
+    except (TypeError, ValueError, ZeroDivisionError):
+        return
+
+    for name, budget in budgets.items():
+        cache.set(
+            f"{ESI_BUDGET_CACHE_KEY}-{name}",
+            min(max(budget, 0.0), 1.0),
+            ESI_BUDGET_CACHE_TIMEOUT,
+        )
+
+
+def get_esi_budget() -> float:
+    """
+    Return the lowest recently seen ESI budget between 0 (exhausted) and 1 (full).
+
+    Returns:
+        float: The remaining budget, 1 if no ESI response was seen recently.
+    """
+    if cache.get("esi_error_limit_reset") is not None:
+        return 0.0
+    budgets = cache.get_many(
+        [f"{ESI_BUDGET_CACHE_KEY}-error", f"{ESI_BUDGET_CACHE_KEY}-bucket"]
+    ).values()
+    return min(budgets, default=1.0)
+
+
+def get_esi_error_limit_reset() -> int:
+    """Return the seconds until the ESI error limit resets, 0 if not limited."""
+    return int(cache.get("esi_error_limit_reset") or 0)
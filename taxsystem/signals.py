@@ -0,0 +1,26 @@
+"""Signal receivers for Tax System."""
+
+# Django
+from django.dispatch import receiver
+
+# Alliance Auth
+from esi.signals import esi_request_statistics
+
+# AA TaxSystem
+from taxsystem.helpers.instrumentation import count_esi_call
+from taxsystem.providers import record_esi_budget
+
+
+@receiver(esi_request_statistics)
+# pylint: disable=unused-argument
+def track_esi_budget(sender, headers=None, **kwargs):
+    """Track the remaining ESI budget for the update scheduler."""
+    record_esi_budget(headers)
+
+
+@receiver(esi_request_statistics)
+# pylint: disable=unused-argument
+def track_esi_call(sender, status_code=0, **kwargs):
+    """Count ESI requests that were not answered from the cache for the running measurement."""
+    if status_code:
+        count_esi_call()
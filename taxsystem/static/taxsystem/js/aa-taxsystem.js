@@ -36,3 +36,158 @@ const _bootstrapTooltip = ({selector = 'body', namespace = 'aa-taxsystem', trigg
             return new bootstrap.Tooltip(tooltipTriggerEl, { trigger });
         });
 };
+
+/**
+ * Capabilities of a compact API response, sent once per response as a bitmap
+ * Must match taxsystem.api.helpers.compact.Capability
+ */
+const aaTaxSystemCapabilities = {
+    MANAGE_PAYMENTS: 1,
+    MANAGE_ACCOUNTS: 2,
+    MANAGE_MEMBERS: 4,
+    BULK_ACTIONS: 8,
+};
+
+/**
+ * Check if a capability bitmap contains a capability
+ *
+ * @param {number} capabilities Capability bitmap of the API response
+ * @param {number} capability Capability from aaTaxSystemCapabilities
+ * @returns {boolean}
+ */
+const _hasCapability = (capabilities, capability) => (capabilities & capability) === capability; // jshint ignore:line
+
+/**
+ * Build an API URL from a URL template rendered with the ID 0
+ *
+ * @param {string} template URL template, e.g. '/owner/123/payment/0/view/details/'
+ * @param {number} id ID that replaces the placeholder
+ * @returns {string}
+ */
+const _actionUrl = (template, id) => template.replace('/0/', `/${id}/`);
+
+/**
+ * Escape a string for the use in HTML
+ *
+ * @param {string} value The value to escape
+ * @returns {string}
+ */
+const _escapeHtml = (value) => $('<div>').text(value ?? '').html();
+
+/**
+ * Character portrait template
+ *
+ * @param {number} characterId The Eve character ID
+ * @param {number} [size=32] Size of the portrait
+ * @returns {string} HTML string of the portrait
+ */
+const _characterPortrait = (characterId, size = 32) => {
+    return `<img class="character-portrait rounded-circle" src="https://images.evetech.net/characters/${characterId}/portrait?size=${size}" alt="">`;
+};
+
+/**
+ * Action button template
+ *
+ * @param {string} url API URL of the action
+ * @param {string} color Bootstrap color of the button
+ * @param {string} icon Font Awesome icon class
+ * @param {string} title Tooltip of the button
+ * @param {string|null} [target=null] Selector of the modal opened by the button
+ * @param {string|null} [previousModal=null] API URL to reload the previous modal
+ * @param {string|null} [id=null] Element ID of the button
+ * @returns {string} HTML string of the button
+ */
+const _actionButton = ({url, color, icon, title, target = null, previousModal = null, id = null}) => {
+    const attributes = [
+        id ? `id="${id}"` : '',
+        `data-action="${url}"`,
+        previousModal ? `data-previous-modal="${previousModal}"` : '',
+        `class="btn btn-${color} btn-sm btn-square me-2"`,
+        target ? `data-bs-toggle="modal" data-bs-target="${target}"` : '',
+        'data-bs-tooltip="aa-taxsystem"',
+        `title="${_escapeHtml(title)}"`,
+    ].filter(Boolean).join(' ');
+    return `<button ${attributes}><i class="fa-solid ${icon}"></i></button>`;
+};
+
+/**
+ * Manage buttons of a payment row from a compact API response
+ * Approve/reject for open payments, undo for reviewed payments and delete for custom payments
+ *
+ * @param {Object} row Payment row of a compact API response
+ * @param {Object} urls URL templates of the payment actions
+ * @param {string|null} [previousModal=null] API URL to reload the previous modal
+ * @returns {string} HTML string of the buttons
+ */
+const _paymentManageButtons = (row, urls, previousModal = null) => {
+    const translations = aaTaxSystemSettings.translations.actions;
+    let html = '';
+
+    if (['pending', 'needs_approval'].includes(row.request_status)) {
+        html += _actionButton({
+            url: _actionUrl(urls.ApprovePayment, row.payment_id),
+            color: 'success',
+            icon: 'fa-check',
+            title: translations.approvePayment,
+            target: '#taxsystem-accept-approve-payment',
+            previousModal: previousModal,
+        });
+        html += _actionButton({
+            url: _actionUrl(urls.RejectPayment, row.payment_id),
+            color: 'danger',
+            icon: 'fa-xmark',
+            title: translations.rejectPayment,
+            target: '#taxsystem-accept-reject-payment',
+            previousModal: previousModal,
+        });
+    }
+    if (['approved', 'rejected'].includes(row.request_status)) {
+        html += _actionButton({
+            url: _actionUrl(urls.UndoPayment, row.payment_id),
+            color: 'warning',
+            icon: 'fa-undo',
+            title: translations.undoPayment,
+            target: '#taxsystem-accept-undo-payment',
+            previousModal: previousModal,
+        });
+    }
+    if (!row.has_journal) {
+        html += _actionButton({
+            url: _actionUrl(urls.DeletePayment, row.payment_id),
+            color: 'danger',
+            icon: 'fa-trash',
+            title: translations.deletePayment,
+            target: '#taxsystem-accept-delete-payment',
+            previousModal: previousModal,
+        });
+    }
+    return html;
+};
+
+/**
+ * Info button of a payment row from a compact API response
+ *
+ * @param {Object} row Payment row of a compact API response
+ * @param {Object} urls URL templates of the payment actions
+ * @param {string|null} [previousModal=null] API URL to reload the previous modal
+ * @returns {string} HTML string of the button
+ */
+const _paymentInfoButton = (row, urls, previousModal = null) => {
+    return _actionButton({
+        url: _actionUrl(urls.PaymentDetails, row.payment_id),
+        color: 'primary',
+        icon: 'fa-info',
+        title: aaTaxSystemSettings.translations.actions.showDetails,
+        target: '#taxsystem-view-payment-details',
+        previousModal: previousModal,
+    });
+};
+
+/**
+ * Bulk action checkbox template
+ *
+ * @param {string} name Name of the data attribute, e.g. 'payment-pk'
+ * @param {number} pk Primary key of the row
+ * @returns {string} HTML string of the checkbox
+ */
+const _bulkCheckbox = (name, pk) => `<input type="checkbox" class="tax-row-select form-check-input me-2" data-${name}="${pk}" />`;
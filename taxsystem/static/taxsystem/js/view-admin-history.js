@@ -5,70 +5,95 @@ $(document).ready(() => {
      * Table :: IDs
      */
     const AdminHistoryTable = $('#admin-history-table');
+    const AdminHistoryLoadMore = $('#admin-history-load-more');
 
     /**
      * Table :: Admin History
-     * Initialize DataTable with Ajax Data
+     * Initialize DataTable, the rows are loaded page by page
      * @type {*|jQuery}
      */
-    fetchGet({url: aaTaxSystemSettings.url.AdminHistory})
-        .then((data) => {
-            if (data) {
-                const filterSetDataTable = new DataTable(AdminHistoryTable, {
-                    data: data,
-                    language: aaTaxSystemSettings.dataTables.language,
-                    layout: aaTaxSystemSettings.dataTables.layout,
-                    ordering: aaTaxSystemSettings.dataTables.ordering,
-                    columnControl: aaTaxSystemSettings.dataTables.columnControl,
-                    order: [[0, 'desc']],
-                    pageLength: 25,
-                    columns: [
-                        { data: 'log_id' },
-                        { data: 'user_name'},
-                        { data: 'date'},
-                        { data: 'target'},
-                        {
-                            data: {
-                                display: (data) => data.action.display,
-                                sort: (data) => data.action.sort,
-                                filter: (data) => data.action.sort
-                            }
-                        },
-                        { data: 'comment' },
-                    ],
-                    columnDefs: [
-                        {
-                            targets: [0],
-                            orderable: false,
-                            columnControl: [
-                                {target: 0, content: []},
-                                {target: 1, content: []}
-                            ]
-                        },
-                    ],
-                    initComplete: function () {
-                        _bootstrapTooltip({selector: '#admin-history-table'});
+    const adminHistoryDataTable = new DataTable(AdminHistoryTable, {
+        data: [],
+        language: aaTaxSystemSettings.dataTables.language,
+        layout: aaTaxSystemSettings.dataTables.layout,
+        ordering: aaTaxSystemSettings.dataTables.ordering,
+        columnControl: aaTaxSystemSettings.dataTables.columnControl,
+        order: [[0, 'desc']],
+        pageLength: 25,
+        columns: [
+            { data: 'log_id' },
+            { data: 'user_name'},
+            { data: 'date'},
+            { data: 'target'},
+            {
+                data: {
+                    display: (data) => data.action.display,
+                    sort: (data) => data.action.sort,
+                    filter: (data) => data.action.sort
+                }
+            },
+            { data: 'comment' },
+        ],
+        columnDefs: [
+            {
+                targets: [0],
+                orderable: false,
+                columnControl: [
+                    {target: 0, content: []},
+                    {target: 1, content: []}
+                ]
+            },
+        ],
+        initComplete: function () {
+            _bootstrapTooltip({selector: '#admin-history-table'});
+        },
+        drawCallback: function () {
+            _bootstrapTooltip({selector: '#admin-history-table'});
+        },
+        rowCallback: function(row, data) {
+            if (data.action.raw === 'Deleted') {
+                $(row).addClass('tax-red tax-hover');
+            }
+            if (data.action.raw === 'Changed') {
+                $(row).addClass('tax-blue tax-hover');
+            }
+            if (data.action.raw === 'Added') {
+                $(row).addClass('tax-green tax-hover');
+            }
+        },
+    });
+
+    /**
+     * Load a page of the admin history and append it to the table
+     * @param {string|null} cursor - Cursor of the last loaded row, null for the first page
+     */
+    const loadAdminHistory = (cursor) => {
+        const url = new URL(aaTaxSystemSettings.url.AdminHistory, window.location.origin);
+        if (cursor) {
+            url.searchParams.set('before', cursor);
+        }
 
+        AdminHistoryLoadMore.prop('disabled', true);
+        fetchGet({url: url.toString()})
+            .then((data) => {
+                if (data) {
+                    adminHistoryDataTable.rows.add(data.data).draw(false);
+                    AdminHistoryLoadMore
+                        .data('cursor', data.next_cursor)
+                        .toggleClass('d-none', !data.next_cursor);
+                }
+            })
+            .catch((error) => {
+                console.error(`Error fetching Admin History DataTable: ${error.message}`);
+            })
+            .finally(() => {
+                AdminHistoryLoadMore.prop('disabled', false);
+            });
+    };
 
-                    },
-                    drawCallback: function () {
-                        _bootstrapTooltip({selector: '#admin-history-table'});
-                    },
-                    rowCallback: function(row, data) {
-                        if (data.action.raw === 'Deleted') {
-                            $(row).addClass('tax-red tax-hover');
-                        }
-                        if (data.action.raw === 'Changed') {
-                            $(row).addClass('tax-blue tax-hover');
-                        }
-                        if (data.action.raw === 'Added') {
-                            $(row).addClass('tax-green tax-hover');
-                        }
-                    },
-                });
-            }
-        })
-        .catch((error) => {
-            console.error(`Error fetching Filter-Set DataTable: ${error.message}`);
-        });
+    AdminHistoryLoadMore.on('click', () => {
+        loadAdminHistory(AdminHistoryLoadMore.data('cursor'));
+    });
+
+    loadAdminHistory(null);
 });
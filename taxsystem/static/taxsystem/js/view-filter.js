@@ -80,6 +80,7 @@ $(document).ready(() => {
                     columns: [
                         { data: 'name' },
                         { data: 'description'},
+                        { data: 'hits'},
                         {
                             data: {
                                 display: (data) => data.status.display,
@@ -91,7 +92,7 @@ $(document).ready(() => {
                     ],
                     columnDefs: [
                         {
-                            targets: [2, 3],
+                            targets: [3, 4],
                             orderable: false,
                             columnControl: [
                                 {target: 0, content: []},
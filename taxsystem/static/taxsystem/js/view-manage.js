@@ -1,4 +1,4 @@
-/* global aaTaxSystemSettings, aaTaxSystemSettingsOverride, _bootstrapTooltip, fetchGet, fetchPost, DataTable, numberFormatter, moment, tablePaymentSystem */
+/* global aaTaxSystemSettings, aaTaxSystemSettingsOverride, aaTaxSystemCapabilities, _bootstrapTooltip, _hasCapability, _actionUrl, _actionButton, _characterPortrait, _paymentInfoButton, _paymentManageButtons, _bulkCheckbox, fetchGet, fetchPost, DataTable, numberFormatter, moment, tablePaymentSystem */
 $(document).ready(function() {
     /**
      * Modals :: IDs
@@ -303,19 +303,24 @@ $(document).ready(function() {
      * Table :: Members
      */
     fetchGet({
-        url: aaTaxSystemSettings.url.Members
+        url: aaTaxSystemSettings.url.Members,
+        payload: {compact: 1}
     })
         .then((data) => {
             if (data) {
+                const canDeleteMembers = _hasCapability(data.capabilities, aaTaxSystemCapabilities.MANAGE_MEMBERS);
                 const MembersDataTable = new DataTable(membersTable, {
-                    data: data,
+                    data: data.data,
                     language: aaTaxSystemSettings.dataTables.language,
                     layout: aaTaxSystemSettings.dataTables.layout,
                     ordering: aaTaxSystemSettings.dataTables.ordering,
                     columnControl: aaTaxSystemSettings.dataTables.columnControl,
                     order: [[3, 'desc']],
                     columns: [
-                        { data: 'character.character_portrait' },
+                        {
+                            data: 'character.character_id',
+                            render: (data, type) => type === 'display' ? _characterPortrait(data) : data
+                        },
                         { data: 'character.character_name' },
                         { data: 'status' },
                         {
@@ -332,8 +337,21 @@ $(document).ready(function() {
                             }
                         },
                         {
-                            data: 'actions',
-                            className: 'text-end'
+                            data: null,
+                            className: 'text-end',
+                            render: (data, type, row) => {
+                                // Only missing members can be deleted
+                                if (type !== 'display' || !canDeleteMembers || !row.is_missing) {
+                                    return '';
+                                }
+                                return _actionButton({
+                                    url: _actionUrl(aaTaxSystemSettings.url.DeleteMember, row.member_id),
+                                    color: 'danger',
+                                    icon: 'fa-trash',
+                                    title: aaTaxSystemSettings.translations.actions.deleteMember,
+                                    target: '#taxsystem-accept-delete-member',
+                                });
+                            }
                         },
                     ],
                     columnDefs: [
@@ -450,140 +468,226 @@ $(document).ready(function() {
             modalRequestAcceptBulkActions.find('#modal-button-confirm-accept-request').unbind('click');
         });
 
+    // Capabilities of the last compact Tax Accounts API response
+    let taxAccountsCapabilities = 0;
+
+    /**
+     * Table :: Tax Accounts :: Helper Function :: Render Has Paid Badge
+     * @param {boolean} paid Whether the tax account has paid
+     * @returns {string} HTML string of the badge
+     * @private
+     */
+    const _renderHasPaid = (paid) => {
+        const translations = aaTaxSystemSettings.translations;
+        const color = paid ? 'success' : 'danger';
+        const icon = paid ? 'fa-check' : 'fa-times';
+        const title = paid ? translations.paid : translations.unpaid;
+        return `<span class="badge bg-${color}"><i class="fas ${icon}" title="${title}" data-bs-tooltip="aa-taxsystem"></i></span>`;
+    };
+
+    /**
+     * Table :: Tax Accounts :: Helper Function :: Render Action Buttons
+     * Render the action buttons of a row from its state and the response capabilities
+     * @param {Object} row Tax account row of the compact API response
+     * @returns {string} HTML string of the action buttons
+     * @private
+     */
+    const _renderTaxAccountActions = (row) => {
+        const translations = aaTaxSystemSettings.translations.actions;
+        let html = '<div class="d-flex justify-content-end">';
+        if (_hasCapability(taxAccountsCapabilities, aaTaxSystemCapabilities.MANAGE_ACCOUNTS)) {
+            html += _actionButton({
+                url: _actionUrl(aaTaxSystemSettings.url.AddPayment, row.account_id),
+                color: 'success',
+                icon: 'fa-dollar-sign',
+                title: translations.addPayment,
+                target: '#taxsystem-accept-add-payment',
+            });
+            html += _actionButton({
+                url: _actionUrl(aaTaxSystemSettings.url.SwitchTaxAccount, row.account_id),
+                color: 'warning',
+                icon: row.is_active ? 'fa-eye-low-vision' : 'fa-eye',
+                title: row.is_active ? translations.deactivateAccount : translations.activateAccount,
+                target: '#taxsystem-accept-switch-tax-account',
+            });
+        }
+        html += _actionButton({
+            url: _actionUrl(aaTaxSystemSettings.url.MemberPayments, row.account.character_id),
+            color: 'primary',
+            icon: 'fa-info',
+            title: translations.viewTaxAccount,
+            target: '#taxsystem-view-tax-account',
+        });
+        if (_hasCapability(taxAccountsCapabilities, aaTaxSystemCapabilities.BULK_ACTIONS)) {
+            html += _bulkCheckbox('account-pk', row.account_id);
+        }
+        html += '</div>';
+        return html;
+    };
+
     /**
      * Table :: Tax Accounts
+     * Server-side processing, search, ordering and paging are handled by the API
+     * The API sends compact rows, the action buttons are rendered on the client
      */
-    fetchGet({
-        url: aaTaxSystemSettings.url.TaxAccounts
-    })
-        .then((data) => {
-            if (data) {
-                const PaymentSystemDataTable = new DataTable(taxAccountsTable, {
-                    data: data,
-                    language: aaTaxSystemSettings.dataTables.language,
-                    layout: aaTaxSystemSettings.dataTables.layout,
-                    ordering: aaTaxSystemSettings.dataTables.ordering,
-                    columnControl: aaTaxSystemSettings.dataTables.columnControl,
-                    order: [[1, 'asc']],
-                    columns: [
-                        { data: 'account.character_portrait' },
-                        { data: 'account.character_name' },
-                        { data: 'status' },
-                        {
-                            data: {
-                                display: (data) => numberFormatter({
-                                    value: data.deposit,
-                                    options: {
-                                        style: 'currency',
-                                        currency: 'ISK'
-                                    }
-                                }),
-                                sort: (data) => data.deposit,
-                                filter: (data) => data.deposit
-                            }
-                        },
-                        {
-                            data: {
-                                display: (data) => data.has_paid.display,
-                                sort: (data) => data.has_paid.sort,
-                                filter: (data) => data.has_paid.sort
-                            }
-                        },
-                        {
-                            data: {
-                                display: (data) => {
-                                    const date = moment(data.last_paid);
-                                    if (!data.last_paid || !date.isValid()) {
-                                        return 'N/A';
-                                    }
-                                    return date.fromNow();
-                                },
-                                sort: (data) => data.last_paid,
-                                filter: (data) => data.last_paid
-                            }
-                        },
-                        {
-                            data: {
-                                display: (data) => {
-                                    const date = moment(data.next_due);
-                                    if (!data.next_due || !date.isValid()) {
-                                        return 'N/A';
-                                    }
-                                    return date.fromNow();
-                                },
-                                sort: (data) => data.next_due,
-                                filter: (data) => data.next_due
-                            }
-                        },
-                        { data: 'actions' },
-                    ],
-                    columnDefs: [
-                        {
-                            targets: [0, 4, 7],
-                            orderable: false,
-                            columnControl: [
-                                {target: 0, content: []},
-                                {target: 1, content: []}
-                            ]
-                        },
-                        {
-                            targets: [3],
-                            type: 'num'
-                        },
-                        {
-                            targets: [0, 4],
-                            width: 32
-                        },
-                        {
-                            targets: [7],
-                            width: 70
-                        },
-                    ],
-                    initComplete: function () {
-                        const dt = taxAccountsTable.DataTable();
+    const PaymentSystemDataTable = new DataTable(taxAccountsTable, {
+        serverSide: true,
+        processing: true,
+        ajax: {
+            url: aaTaxSystemSettings.url.TaxAccounts,
+            type: 'GET',
+            data: {compact: 1},
+            dataSrc: (json) => {
+                taxAccountsCapabilities = json.capabilities;
+                return json.data;
+            },
+            error: (xhr, error, thrown) => {
+                console.error('Error fetching Tax Account DataTable:', thrown);
+            }
+        },
+        language: aaTaxSystemSettings.dataTables.language,
+        layout: aaTaxSystemSettings.dataTables.layout,
+        ordering: aaTaxSystemSettings.dataTables.ordering,
+        columnControl: aaTaxSystemSettings.dataTables.columnControl,
+        order: [[1, 'asc']],
+        columns: [
+            {
+                data: 'account.character_id',
+                render: (data, type) => type === 'display' ? _characterPortrait(data) : data
+            },
+            { data: 'account.character_name' },
+            { data: 'status' },
+            {
+                data: 'deposit',
+                render: (data, type) => {
+                    if (type !== 'display') {
+                        return data;
+                    }
+                    return numberFormatter({
+                        value: data,
+                        options: {
+                            style: 'currency',
+                            currency: 'ISK'
+                        }
+                    });
+                }
+            },
+            {
+                data: 'has_paid',
+                render: (data, type) => type === 'display' ? _renderHasPaid(data) : Number(data)
+            },
+            {
+                data: 'last_paid',
+                render: (data, type) => {
+                    if (type !== 'display') {
+                        return data;
+                    }
+                    const date = moment(data);
+                    if (!data || !date.isValid()) {
+                        return 'N/A';
+                    }
+                    return date.fromNow();
+                }
+            },
+            {
+                data: 'next_due',
+                render: (data, type) => {
+                    if (type !== 'display') {
+                        return data;
+                    }
+                    const date = moment(data);
+                    if (!data || !date.isValid()) {
+                        return 'N/A';
+                    }
+                    return date.fromNow();
+                }
+            },
+            {
+                data: null,
+                render: (data, type, row) => type === 'display' ? _renderTaxAccountActions(row) : ''
+            },
+        ],
+        columnDefs: [
+            {
+                targets: [0, 7],
+                orderable: false,
+                columnControl: [
+                    {target: 0, content: []},
+                    {target: 1, content: []}
+                ]
+            },
+            {
+                // Only the character name is searchable per column
+                targets: [2, 3, 4, 5, 6],
+                columnControl: [
+                    {target: 0, content: ['order']},
+                    {target: 1, content: []}
+                ]
+            },
+            {
+                targets: [3],
+                type: 'num'
+            },
+            {
+                targets: [0, 4],
+                width: 32
+            },
+            {
+                targets: [7],
+                width: 70
+            },
+        ],
+        initComplete: function () {
+            const dt = taxAccountsTable.DataTable();
 
-                        // per-row checkbox change handler
-                        $(taxAccountsTable).on('change', '.tax-row-select', function () {
-                            _updateBulkState();
-                        });
+            /**
+             * Helper function: Filter DataTable by payment state on the server
+             * @param {string} state 'paid', 'unpaid' or '' for all accounts
+             */
+            const applyAccountFilter = (state) => {
+                _resetBulkState();
+                dt.column(4).search(state).draw();
+            };
+
+            // per-row checkbox change handler
+            $(taxAccountsTable).on('change', '.tax-row-select', function () {
+                _updateBulkState();
+            });
 
-                        $('#request-filter-accounts-all').on('change click', () => {
-                            applyPaymentFilter(() => true, dt);
-                        });
+            // clear on next page
+            taxAccountsTable.on('page.dt', () => {
+                _resetBulkState();
+            });
 
-                        $('#request-filter-accounts-paid').on('change click', () => {
-                            applyPaymentFilter(rowData => !!(rowData.has_paid && rowData.has_paid.raw && rowData.is_active), dt);
-                        });
+            $('#request-filter-accounts-all').on('change click', () => {
+                applyAccountFilter('');
+            });
 
-                        $('#request-filter-accounts-not-paid').on('change click', () => {
-                            applyPaymentFilter(rowData => rowData.is_active && !(rowData.has_paid && rowData.has_paid.raw), dt);
-                        });
+            $('#request-filter-accounts-paid').on('change click', () => {
+                applyAccountFilter('paid');
+            });
 
-                        _bootstrapTooltip({selector: '#tax-accounts'});
-                    },
-                    drawCallback: function () {
-                        _bootstrapTooltip({selector: '#tax-accounts'});
-                    },
-                    rowCallback: function(row, data) {
-                        if (!data.is_active) {
-                            $(row).addClass('tax-warning tax-hover');
-                        } else if (data.is_active && data.has_paid && data.has_paid.raw) {
-                            $(row).addClass('tax-green tax-hover');
-                        } else if (data.is_active && data.has_paid && !data.has_paid.raw) {
-                            $(row).addClass('tax-red tax-hover');
-                        }
-                    },
-                });
+            $('#request-filter-accounts-not-paid').on('change click', () => {
+                applyAccountFilter('unpaid');
+            });
+        },
+        drawCallback: function () {
+            _bootstrapTooltip({selector: '#tax-accounts'});
+        },
+        rowCallback: function(row, data) {
+            if (!data.is_active) {
+                $(row).addClass('tax-warning tax-hover');
+            } else if (data.has_paid) {
+                $(row).addClass('tax-green tax-hover');
+            } else {
+                $(row).addClass('tax-red tax-hover');
             }
-        })
-        .catch((error) => {
-            console.error('Error fetching Tax Account DataTable:', error);
-        });
+        },
+    });
 
     /**
      * Function :: Reload Changed Data
      * Handle reloading of changed data in Dashboard and Tax Accounts DataTable
-     * @param {Array} newData
      */
     function _reloadChangedData() {
         fetchGet({
@@ -597,28 +701,16 @@ $(document).ready(function() {
             .catch((error) => {
                 console.error('Error fetching Dashboard Data:', error);
             });
-        fetchGet({
-            url: aaTaxSystemSettings.url.TaxAccounts
-        })
-            .then((newData) => {
-                if (newData) {
-                    _reloadTaxAccountsDataTable(newData);
-                }
-            })
-            .catch((error) => {
-                console.error('Error fetching Tax Accounts DataTable:', error);
-            });
+        _reloadTaxAccountsDataTable();
     }
 
     /**
      * Table :: Tax Accounts :: Helper Function :: Reload DataTable
-     * Handle reloading of Tax Accounts DataTable with new data
-     * @param {Array} newData
+     * Reload the current page of the Tax Accounts DataTable from the API
      * @private
      */
-    function _reloadTaxAccountsDataTable(newData) {
-        const dtTaxAccounts = taxAccountsTable.DataTable();
-        dtTaxAccounts.clear().rows.add(newData).draw();
+    function _reloadTaxAccountsDataTable() {
+        PaymentSystemDataTable.ajax.reload(null, false);
     }
 
     /**
@@ -723,15 +815,41 @@ $(document).ready(function() {
             modalRequestAddPayment.find('#modal-button-confirm-accept-request').unbind('click');
         });
 
+    // API URL, capabilities and request status labels of the loaded Payments Accounts Modal
+    let paymentsModalUrl = null;
+    let paymentsModalCapabilities = 0;
+    let paymentsModalStatuses = {};
+
     /**
      * Modal:: Payments Accounts :: Helper Function :: Load Modal DataTable
      * Load data into Payments Accounts Modal DataTable and redraw
-     * @param {Object} tableData Ajax API Response Data
+     * @param {Object} data Compact Ajax API Response Data
+     * @param {string} url API URL the data was loaded from, used to reopen the modal
      * @private
      */
-    const _loadPaymentsModalDataTable = (tableData) => {
+    const _loadPaymentsModalDataTable = (data, url) => {
+        paymentsModalUrl = url;
+        paymentsModalCapabilities = data.capabilities;
+        paymentsModalStatuses = data.statuses;
         const dtPayments = paymentsTable.DataTable();
-        dtPayments.clear().rows.add(tableData).draw();
+        dtPayments.clear().rows.add(data.data).draw();
+    };
+
+    /**
+     * Modal:: Payments Accounts :: Helper Function :: Render Action Buttons
+     * Render the action buttons of a row from its state and the response capabilities
+     * @param {Object} row Payment row of the compact API response
+     * @returns {string} HTML string of the action buttons
+     * @private
+     */
+    const _renderPaymentsModalActions = (row) => {
+        let html = '<div class="d-flex justify-content-end">';
+        if (_hasCapability(paymentsModalCapabilities, aaTaxSystemCapabilities.MANAGE_PAYMENTS)) {
+            html += _paymentManageButtons(row, aaTaxSystemSettings.url, paymentsModalUrl);
+        }
+        html += _paymentInfoButton(row, aaTaxSystemSettings.url, paymentsModalUrl);
+        html += '</div>';
+        return html;
     };
 
     /**
@@ -772,11 +890,17 @@ $(document).ready(function() {
                 }
             },
             { data: 'date' },
-            { data: 'request_status.status' },
+            {
+                data: 'request_status',
+                render: (data, type) => type === 'display' ? paymentsModalStatuses[data].status : data
+            },
             { data: 'reviser' },
             { data: 'reason' },
             { data: 'division_name' },
-            { data: 'actions' },
+            {
+                data: null,
+                render: (data, type, row) => type === 'display' ? _renderPaymentsModalActions(row) : ''
+            },
         ],
         columnDefs: [
             {
@@ -804,10 +928,11 @@ $(document).ready(function() {
      */
     const _loadPreviousModal = (apiUrl) => {
         fetchGet({
-            url: apiUrl
+            url: apiUrl,
+            payload: {compact: 1}
         })
             .then((newData) => {
-                _loadPaymentsModalDataTable(newData);
+                _loadPaymentsModalDataTable(newData, apiUrl);
                 modalRequestViewPayments.modal('show');
             })
             .catch((error) => {
@@ -1089,10 +1214,11 @@ $(document).ready(function() {
 
         fetchGet({
             url: url,
+            payload: {compact: 1}
         })
             .then((data) => {
                 if (data) {
-                    _loadPaymentsModalDataTable(data);
+                    _loadPaymentsModalDataTable(data, url);
                 }
             })
             .catch((error) => {
@@ -1,4 +1,4 @@
-/* global aaTaxSystemSettings, aaTaxSystemSettingsOverride, _bootstrapTooltip, fetchGet, fetchPost, DataTable, numberFormatter */
+/* global aaTaxSystemSettings, aaTaxSystemSettingsOverride, aaTaxSystemCapabilities, _bootstrapTooltip, _hasCapability, _characterPortrait, _paymentInfoButton, _paymentManageButtons, _bulkCheckbox, fetchGet, fetchPost, DataTable, numberFormatter */
 
 $(document).ready(() => {
     // Table :: ID
@@ -15,115 +15,151 @@ $(document).ready(() => {
     const modalRequestDeletePayment = $('#taxsystem-accept-delete-payment');
     const modalRequestAcceptBulkActions = $('#taxsystem-accept-bulk-actions');
 
-    fetchGet({
-        url: aaTaxSystemSettings.url.Payments
-    })
-        .then((data) => {
-            if (data) {
+    // Capabilities and request status labels of the last compact API response
+    let paymentsCapabilities = 0;
+    let paymentsStatuses = {};
+
+    /**
+     * Table :: Payments :: Helper Function :: Render Action Buttons
+     * Render the action buttons of a row from its state and the response capabilities
+     * @param {Object} row Payment row of the compact API response
+     * @returns {string} HTML string of the action buttons
+     * @private
+     */
+    const _renderPaymentActions = (row) => {
+        let html = '<div class="d-flex justify-content-end">';
+        html += _paymentInfoButton(row, aaTaxSystemSettings.url);
+        if (_hasCapability(paymentsCapabilities, aaTaxSystemCapabilities.MANAGE_PAYMENTS)) {
+            html += _paymentManageButtons(row, aaTaxSystemSettings.url);
+        }
+        if (_hasCapability(paymentsCapabilities, aaTaxSystemCapabilities.BULK_ACTIONS)) {
+            html += _bulkCheckbox('payment-pk', row.payment_id);
+        }
+        html += '</div>';
+        return html;
+    };
+
+    /**
+     * Table :: Payments
+     * Server-side processing, search, ordering and paging are handled by the API
+     * The API sends compact rows, the action buttons are rendered on the client
+     */
+    const paymentsDataTable = new DataTable(paymentsTable, {
+        serverSide: true,
+        processing: true,
+        ajax: {
+            url: aaTaxSystemSettings.url.Payments,
+            type: 'GET',
+            data: {compact: 1},
+            dataSrc: (json) => {
+                paymentsCapabilities = json.capabilities;
+                paymentsStatuses = json.statuses;
+                return json.data;
+            },
+            error: (xhr, error, thrown) => {
+                console.error('Error fetching Payments DataTable:', thrown);
+            }
+        },
+        language: aaTaxSystemSettings.dataTables.language,
+        layout: aaTaxSystemSettings.dataTables.layout,
+        ordering: aaTaxSystemSettings.dataTables.ordering,
+        columnControl: aaTaxSystemSettings.dataTables.columnControl,
+        order: [[3, 'desc']],
+        columnDefs: [
+            {
+                targets: [0, 5],
+                orderable: false,
+                columnControl: [
+                    {target: 0, content: []},
+                    {target: 1, content: []}
+                ]
+            },
+            {
+                // Only the character name is searchable per column
+                targets: [2, 3, 4],
+                columnControl: [
+                    {target: 0, content: ['order']},
+                    {target: 1, content: []}
+                ]
+            },
+            {
+                targets: [0,5],
+                width: 32
+            },
+            { targets: [2], type: 'num' },
+            { targets: [3], type: 'date' }
+        ],
+        columns: [
+            {
+                data: 'character.character_id',
+                render: (data, type) => type === 'display' ? _characterPortrait(data) : data
+            },
+            { data: 'character.character_name' },
+            {
+                data: 'amount',
+                render: (data, type) => {
+                    if (type !== 'display') {
+                        return data;
+                    }
+                    return numberFormatter({
+                        value: data,
+                        language: aaTaxSystemSettings.locale,
+                        options: {
+                            style: 'currency',
+                            currency: 'ISK'
+                        }
+                    });
+                }
+            },
+            { data: 'date' },
+            {
+                data: 'request_status',
+                render: (data, type) => type === 'display' ? paymentsStatuses[data].status : data
+            },
+            {
+                data: null,
+                render: (data, type, row) => type === 'display' ? _renderPaymentActions(row) : ''
+            },
+        ],
+        initComplete: function () {
+            const dt = paymentsTable.DataTable();
+
             /**
-             * Table :: Payments
+             * Helper function: Filter DataTable by request status on the server
+             * @param {string} statuses Comma separated request status values
              */
-                const paymentsDataTable = new DataTable(paymentsTable, {
-                    data: data,
-                    language: aaTaxSystemSettings.dataTables.language,
-                    layout: aaTaxSystemSettings.dataTables.layout,
-                    ordering: aaTaxSystemSettings.dataTables.ordering,
-                    columnControl: aaTaxSystemSettings.dataTables.columnControl,
-                    order: [[3, 'desc']],
-                    columnDefs: [
-                        {
-                            targets: [0, 5],
-                            orderable: false,
-                            columnControl: [
-                                {target: 0, content: []},
-                                {target: 1, content: []}
-                            ]
-                        },
-                        {
-                            targets: [0,5],
-                            width: 32
-                        },
-                        { targets: [2], type: 'num' },
-                        { targets: [3], type: 'date' }
-                    ],
-                    columns: [
-                        { data: 'character.character_portrait' },
-                        { data: 'character.character_name' },
-                        {
-                            data: {
-                                display: (data) => numberFormatter({
-                                    value: data.amount,
-                                    language: aaTaxSystemSettings.locale,
-                                    options: {
-                                        style: 'currency',
-                                        currency: 'ISK'
-                                    }
-                                }),
-                                sort: (data) => data.amount,
-                                filter: (data) => data.amount
-                            }
-                        },
-                        { data: 'date' },
-                        { data: 'request_status.status' },
-                        { data: 'actions' },
-                    ],
-                    initComplete: function () {
-                        const dt = paymentsTable.DataTable();
-
-                        /**
-                         * Helper function: Filter DataTable using DataTables custom search API
-                         */
-                        const applyPaymentFilter = (predicate) => {
-                            // reset custom filters and add a table-scoped predicate
-                            $.fn.dataTable.ext.search = [];
-                            $.fn.dataTable.ext.search.push(function(settings, searchData, index, rowData) {
-                                // only apply to this DataTable instance
-                                try {
-                                    if (settings.nTable !== dt.table().node()) {
-                                        return true;
-                                    }
-                                } catch (e) {
-                                    return true;
-                                }
-
-                                if (!rowData) return true;
-                                return predicate(rowData);
-                            });
-                            dt.draw();
-                        };
-
-                        $('#request-filter-all').on('change click', () => {
-                            applyPaymentFilter(() => true);
-                        });
-
-                        $('#request-filter-pending').on('change click', () => {
-                            applyPaymentFilter(rowData => !!(rowData.request_status && (rowData.request_status.color === 'info' || rowData.request_status.color === 'warning')));
-                        });
-
-                        // per-row checkbox change handler
-                        $(paymentsTable).on('change', '.tax-row-select', function () {
-                            _updateBulkState();
-                        });
-
-                        // clear on next page
-                        paymentsTable.on('page.dt', () => {
-                            _resetBulkState();
-                        });
-                    },
-                    drawCallback: function () {
-                        _bootstrapTooltip({selector: '#payments'});
-                    },
-                    rowCallback: function(row, data) {
-                        if (data.request_status && (data.request_status.color === 'info' || data.request_status.color === 'warning')) {
-                            $(row).addClass('tax-warning tax-hover');
-                        }
-                    },
-                });
+            const applyPaymentFilter = (statuses) => {
+                dt.column(4).search(statuses).draw();
+            };
+
+            $('#request-filter-all').on('change click', () => {
+                applyPaymentFilter('');
+            });
+
+            $('#request-filter-pending').on('change click', () => {
+                applyPaymentFilter('pending,needs_approval');
+            });
+
+            // per-row checkbox change handler
+            $(paymentsTable).on('change', '.tax-row-select', function () {
+                _updateBulkState();
+            });
+
+            // clear on next page
+            paymentsTable.on('page.dt', () => {
+                _resetBulkState();
+            });
+        },
+        drawCallback: function () {
+            _bootstrapTooltip({selector: '#payments'});
+        },
+        rowCallback: function(row, data) {
+            const status = paymentsStatuses[data.request_status];
+            if (status && (status.color === 'info' || status.color === 'warning')) {
+                $(row).addClass('tax-warning tax-hover');
             }
-        })
-        .catch((error) => {
-            console.error('Error fetching Payments DataTable:', error);
-        });
+        },
+    });
 
     /**
      * Sub Modal:: Payments Details :: Info Button :: Helper Function :: Load Modal DataTable
@@ -254,23 +290,11 @@ $(document).ready(() => {
 
     /**
      * Table :: Payments :: Helper Function :: Reload DataTable
-     * Handle reloading of Payments DataTable with new data
-     * @param {Array} newData
+     * Reload the current page of the Payments DataTable from the API
      * @private
      */
     function _reloadPaymentsDataTable() {
-        fetchGet({
-            url: aaTaxSystemSettings.url.Payments
-        })
-            .then((data) => {
-                if (data) {
-                    const dtPayments = paymentsTable.DataTable();
-                    dtPayments.clear().rows.add(data).draw();
-                }
-            })
-            .catch((error) => {
-                console.error('Error fetching Payments DataTable:', error);
-            });
+        paymentsDataTable.ajax.reload(null, false);
     }
 
     /**
@@ -23,17 +23,26 @@ from taxsystem import __title__, app_settings
 from taxsystem.helpers.discord import send_user_notification
 from taxsystem.models.alliance import AllianceOwner, AlliancePaymentAccount
 from taxsystem.models.corporation import CorporationOwner, CorporationPaymentAccount
+from taxsystem.models.general import EveEntity, MetricRollup
 from taxsystem.models.helpers.textchoices import (
     AccountStatus,
     AllianceUpdateSection,
     CorporationUpdateSection,
 )
-from taxsystem.providers import AppLogger, retry_task_on_esi_error
+from taxsystem.providers import (
+    AppLogger,
+    get_esi_budget,
+    get_esi_error_limit_reset,
+    retry_task_on_esi_error,
+)
 
 logger = AppLogger(get_extension_logger(__name__), __title__)
 
 MAX_RETRIES_DEFAULT = 3
 
+# Lowest ESI budget the update spacing is scaled for, caps the slowdown at 4x
+UPDATE_MIN_ESI_BUDGET = 0.25
+
 # Default params for all tasks.
 TASK_DEFAULTS = {
     "time_limit": app_settings.TAXSYSTEM_TASKS_TIME_LIMIT,
@@ -51,10 +60,41 @@ TASK_DEFAULTS_BIND_ONCE_OWNER = {
     **{"once": {"keys": ["owner_eve_id"], "graceful": True}},
 }
 
+# Tax account models that notifications are sent for, keyed by the name used in the digests
+NOTIFICATION_ACCOUNT_MODELS = {
+    "alliance": (AlliancePaymentAccount, "owner__eve_alliance__alliance_id"),
+    "corporation": (
+        CorporationPaymentAccount,
+        "owner__eve_corporation__corporation_id",
+    ),
+}
+
+
+def _get_update_countdowns(total: int) -> list[int]:
+    """
+    Spread owner updates over the shortest stale window.
+
+    The updates are spaced further apart when the remaining ESI budget is low
+    and start after the ESI error limit reset if it is reached. Updates that do
+    not fit into the window are left out and deferred to the next run, so they
+    do not overlap the owner tasks queued by it.
+    """
+    if not total:
+        return []
+    window = min(app_settings.TAXSYSTEM_STALE_TYPES.values()) * 60
+    budget = max(get_esi_budget(), UPDATE_MIN_ESI_BUDGET)
+    interval = window / total / budget
+    start = get_esi_error_limit_reset()
+    return [
+        int(start + position * interval)
+        for position in range(total)
+        if position * interval < window
+    ]
+
 
 @shared_task(**TASK_DEFAULTS_ONCE)
 def update_all_taxsytem(runs: int = 0, force_refresh: bool = False):
-    """Update all taxsystem data"""
+    """Update all taxsystem data, staggered over the stale window"""
     corporations: list[CorporationOwner] = CorporationOwner.objects.select_related(
         "eve_corporation"
     ).filter(active=1)
@@ -62,19 +102,33 @@ def update_all_taxsytem(runs: int = 0, force_refresh: bool = False):
     alliances: list[AllianceOwner] = AllianceOwner.objects.select_related(
         "eve_alliance"
     ).filter(active=1)
-    # Queue tasks for all corporations
-    for corporation in corporations:
-        update_corporation.apply_async(
-            args=[corporation.eve_id], kwargs={"force_refresh": force_refresh}
+
+    # Skip owners that are up to date before anything is queued
+    owners = [
+        (task, owner)
+        for task, queryset in (
+            (update_corporation, corporations),
+            (update_alliance, alliances),
         )
-        runs = runs + 1
-    # Queue tasks for all alliances
-    for alliance in alliances:
-        update_alliance.apply_async(
-            args=[alliance.eve_id], kwargs={"force_refresh": force_refresh}
+        for owner in queryset
+        if force_refresh or owner.update_manager.calc_update_needed()
+    ]
+
+    countdowns = _get_update_countdowns(len(owners))
+    for (task, owner), countdown in zip(owners, countdowns):
+        task.apply_async(
+            args=[owner.eve_id],
+            kwargs={"force_refresh": force_refresh},
+            countdown=countdown,
         )
         runs = runs + 1
-    logger.info("Queued %s Owner Tasks", runs)
+    logger.info(
+        "Queued %s Owner Tasks over %s seconds, deferred %s to the next run",
+        runs,
+        countdowns[-1] if countdowns else 0,
+        len(owners) - len(countdowns),
+    )
+    MetricRollup.objects.prune()
 
 
 @shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
@@ -118,13 +172,27 @@ def update_corporation(
             )
             continue
 
+        if app_settings.TAXSYSTEM_UPDATE_PIPELINE:
+            que.append(str(section))
+            continue
+
         task_name = f"update_corp_{section}"
         task = globals().get(task_name)
         que.append(
             task.si(owner.eve_id, force_refresh=force_refresh).set(priority=priority)
         )
 
-    chain(que).apply_async()
+    if app_settings.TAXSYSTEM_UPDATE_PIPELINE:
+        update_corp_pipeline.apply_async(
+            kwargs={
+                "owner_eve_id": owner.eve_id,
+                "sections": que,
+                "force_refresh": force_refresh,
+            },
+            priority=priority,
+        )
+    else:
+        chain(que).apply_async()
     logger.debug(
         "Queued %s Audit Updates for %s",
         len(que),
@@ -133,6 +201,22 @@ def update_corporation(
     return True
 
 
+@shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
+def update_corp_pipeline(
+    self: Task, owner_eve_id: int, sections: list[str], force_refresh: bool
+):
+    """Update the given sections of a corporation in one run."""
+    owner = CorporationOwner.objects.select_related("eve_corporation").get(
+        eve_corporation__corporation_id=owner_eve_id
+    )
+    return _run_update_pipeline(
+        task=self,
+        owner=owner,
+        sections=[CorporationUpdateSection(section) for section in sections],
+        force_refresh=force_refresh,
+    )
+
+
 @shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
 def update_corp_division_names(self: Task, owner_eve_id: int, force_refresh: bool):
     return _update_corp_section(
@@ -227,6 +311,40 @@ def _update_corp_section(
     owner.update_manager.update_section_log(section, result)
 
 
+def _run_update_pipeline(
+    task: Task,
+    owner: CorporationOwner | AllianceOwner,
+    sections: list[CorporationUpdateSection | AllianceUpdateSection],
+    force_refresh: bool,
+):
+    """
+    Run the sections of an owner one after another with the same owner object.
+
+    The status of all finished sections is written with one upsert. On an ESI error
+    the task is retried with the failed and the remaining sections only.
+    """
+    logger.debug("Updating %s sections for %s", len(sections), owner.name)
+    section_logs = []
+    remaining = [str(section) for section in sections]
+    retry_kwargs = {
+        "owner_eve_id": owner.eve_id,
+        "sections": remaining,
+        "force_refresh": force_refresh,
+    }
+    try:
+        for section in sections:
+            started_at = timezone.now()
+            method: Callable = getattr(owner, section.method_name)
+            with retry_task_on_esi_error(task, kwargs=retry_kwargs):
+                result = owner.update_manager.perform_update_status(
+                    section, method, force_refresh=force_refresh
+                )
+            section_logs.append((section, started_at, result))
+            remaining.remove(str(section))
+    finally:
+        owner.update_manager.bulk_update_section_logs(section_logs)
+
+
 # Alliance Tasks
 
 
@@ -271,13 +389,27 @@ def update_alliance(
             )
             continue
 
+        if app_settings.TAXSYSTEM_UPDATE_PIPELINE:
+            que.append(str(section))
+            continue
+
         task_name = f"update_ally_{section}"
         task = globals().get(task_name)
         que.append(
             task.si(owner.eve_id, force_refresh=force_refresh).set(priority=priority)
         )
 
-    chain(que).apply_async()
+    if app_settings.TAXSYSTEM_UPDATE_PIPELINE:
+        update_ally_pipeline.apply_async(
+            kwargs={
+                "owner_eve_id": owner.eve_id,
+                "sections": que,
+                "force_refresh": force_refresh,
+            },
+            priority=priority,
+        )
+    else:
+        chain(que).apply_async()
     logger.debug(
         "Queued %s Audit Updates for %s",
         len(que),
@@ -286,6 +418,22 @@ def update_alliance(
     return True
 
 
+@shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
+def update_ally_pipeline(
+    self: Task, owner_eve_id: int, sections: list[str], force_refresh: bool
+):
+    """Update the given sections of an alliance in one run."""
+    owner = AllianceOwner.objects.select_related("eve_alliance", "corporation").get(
+        eve_alliance__alliance_id=owner_eve_id
+    )
+    return _run_update_pipeline(
+        task=self,
+        owner=owner,
+        sections=[AllianceUpdateSection(section) for section in sections],
+        force_refresh=force_refresh,
+    )
+
+
 @shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
 def update_ally_payments(self: Task, owner_eve_id: int, force_refresh: bool):
     return _update_ally_section(
@@ -341,115 +489,120 @@ def _update_ally_section(
     alliance.update_manager.update_section_log(section, result)
 
 
+def _collect_notification_digests(now) -> list[dict]:
+    """
+    Collect the overdue accounts of all active owners that may be notified.
+
+    Returns:
+        list: The digests with all entries and account pks of a user.
+    """
+    digests: dict[int, dict] = {}
+    for account_type, (model, owner_id_field) in NOTIFICATION_ACCOUNT_MODELS.items():
+        accounts = (
+            model.objects.filter(
+                model.get_notification_due_filter(now),
+                owner__active=True,
+                status=AccountStatus.ACTIVE,
+            )
+            .exclude(model.get_paid_filter(now))
+            .order_by("user_id", "owner__name")
+            .values_list(
+                "pk",
+                "user_id",
+                "deposit",
+                "owner__name",
+                "owner__tax_message",
+                owner_id_field,
+            )
+        )
+        urls = {}
+        for pk, user_id, deposit, owner_name, tax_message, owner_id in accounts:
+            if owner_id not in urls:
+                urls[owner_id] = urljoin(
+                    settings.SITE_URL, reverse("taxsystem:account", args=[owner_id])
+                )
+            digest = digests.setdefault(
+                user_id, {"user_id": user_id, "entries": [], "accounts": {}}
+            )
+            digest["entries"].append(
+                {
+                    "owner": owner_name,
+                    "tax_message": tax_message,
+                    "deposit": str(deposit),
+                    "url": urls[owner_id],
+                }
+            )
+            digest["accounts"].setdefault(account_type, []).append(pk)
+    return list(digests.values())
+
+
 @shared_task(**TASK_DEFAULTS_ONCE)
 def check_account_deposit(runs: int = 0):
     """Check if any accounts have not paid and send notifications if needed."""
-    alliances = AllianceOwner.objects.filter(active=1)
-    corporations = CorporationOwner.objects.filter(active=1)
+    digests = _collect_notification_digests(timezone.now())
 
-    # Check alliance users
-    for alliance in alliances:
-        _send_alliance_notification.apply_async(
-            kwargs={"owner_eve_id": alliance.eve_alliance.alliance_id}
+    # Each delivery task sends its digests one after another
+    workers = max(app_settings.TAXSYSTEM_NOTIFICATION_MAX_WORKERS, 1)
+    for position in range(min(workers, len(digests))):
+        _send_notification_digests.apply_async(
+            kwargs={"digests": digests[position::workers]}
         )
         runs = runs + 1
 
-    # Check corporation users
-    for corporation in corporations:
-        _send_corporation_notification.apply_async(
-            kwargs={"owner_eve_id": corporation.eve_corporation.corporation_id}
-        )
-        runs = runs + 1
-    logger.info("Queued %s notification tasks for overdue payments", runs)
+    logger.info(
+        "Queued %s notification tasks for %s users with %s overdue accounts",
+        runs,
+        len(digests),
+        sum(len(pks) for digest in digests for pks in digest["accounts"].values()),
+    )
 
 
-@shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
-def _send_alliance_notification(
-    self: Task, owner_eve_id: int, runs: int = 0
-):  # pylint: disable=unused-argument
-    """Send a notification to an alliance."""
-    accounts = AlliancePaymentAccount.objects.filter(
-        owner__eve_alliance__alliance_id=owner_eve_id, status=AccountStatus.ACTIVE
-    ).select_related("owner")
-
-    owner_name = None
-    for account in accounts:
-        # Get the owner name from the first account, if not already set
-        if owner_name is None:
-            owner_name = account.owner.name
-        # Only send a notification if the user has not been notified and has not paid
-        if account.has_notified is False:
-            if account.has_paid is False:
-                url = urljoin(
-                    settings.SITE_URL,
-                    reverse(
-                        "taxsystem:account",
-                        args=[account.owner.eve_alliance.alliance_id],
-                    ),
-                )
-                msg = account.owner.tax_message
-                msg += f"\n__**`{account.owner.name}`**__: __**`{account.deposit}`**__ ISK.\n\n"
-                msg += f"Account Overview: {url}"
-                send_user_notification(
-                    user_id=account.user_id,
-                    title="Outstanding Payment Notification",
-                    message=format_html(msg),
-                    embed_message=True,
-                    level="warning",
-                )
-            account.last_notification = timezone.now()
-            account.save()
-            runs = runs + 1
+@shared_task(**TASK_DEFAULTS)
+def _send_notification_digests(digests: list[dict]):
+    """
+    Send one outstanding payment notification per user.
+
+    The accounts of a digest are marked as notified after it was sent,
+    so an undelivered digest is collected again by the next check.
+    """
+    now = timezone.now()
+    sent_pks: dict[str, list[int]] = {}
+    try:
+        for digest in digests:
+            msg = ""
+            for entry in digest["entries"]:
+                msg += entry["tax_message"]
+                msg += f"\n__**`{entry['owner']}`**__: __**`{entry['deposit']}`**__ ISK.\n\n"
+                msg += f"Account Overview: {entry['url']}\n\n"
+            send_user_notification(
+                user_id=digest["user_id"],
+                title="Outstanding Payment Notification",
+                message=format_html(msg.strip()),
+                embed_message=True,
+                level="warning",
+            )
+            for account_type, pks in digest["accounts"].items():
+                sent_pks.setdefault(account_type, []).extend(pks)
             logger.debug(
-                "Sent notification to user %s for alliance %s",
-                account.name,
-                account.owner.name,
+                "Sent notification to user %s for %s accounts",
+                digest["user_id"],
+                len(digest["entries"]),
+            )
+    finally:
+        next_notification_at = now + timezone.timedelta(
+            days=app_settings.TAXSYSTEM_NOTIFICATION_EXPIRATION_DAYS
+        )
+        for account_type, pks in sent_pks.items():
+            model = NOTIFICATION_ACCOUNT_MODELS[account_type][0]
+            model.objects.filter(pk__in=pks).update(
+                last_notification=now, next_notification_at=next_notification_at
             )
-    logger.info("Sent %s notifications for alliance %s", runs, owner_name)
+    logger.info("Sent %s notifications", len(digests))
 
 
-# TODO Make this more efficient by only checking accounts that are overdue instead of all active accounts.
-# This would require adding a next_notification field to the account model and indexing it for efficient querying.
-@shared_task(**TASK_DEFAULTS_BIND_ONCE_OWNER)
-def _send_corporation_notification(
-    self: Task, owner_eve_id: int, runs: int = 0
-):  # pylint: disable=unused-argument
-    """Send a notification to a corporation."""
-    accounts = CorporationPaymentAccount.objects.filter(
-        owner__eve_corporation__corporation_id=owner_eve_id, status=AccountStatus.ACTIVE
-    ).select_related("owner")
-
-    owner_name = None
-    for account in accounts:
-        # Get the owner name from the first account, if not already set
-        if owner_name is None:
-            owner_name = account.owner.name
-        # Only send a notification if the user has not been notified and has not paid
-        if account.has_notified is False:
-            if account.has_paid is False:
-                url = urljoin(
-                    settings.SITE_URL,
-                    reverse(
-                        "taxsystem:account",
-                        args=[account.owner.eve_corporation.corporation_id],
-                    ),
-                )
-                msg = account.owner.tax_message
-                msg += f"\n__**`{account.owner.name}`**__: __**`{account.deposit}`**__ ISK.\n\n"
-                msg += f"Account Overview: {url}"
-                send_user_notification(
-                    user_id=account.user_id,
-                    title="Outstanding Payment Notification",
-                    message=format_html(msg),
-                    embed_message=True,
-                    level="warning",
-                )
-                account.last_notification = timezone.now()
-                account.save()
-                runs = runs + 1
-                logger.debug(
-                    "Sent notification to user %s for corporation %s",
-                    account.name,
-                    account.owner.name,
-                )
-    logger.info("Sent %s notifications for corporation %s", runs, owner_name)
+@shared_task(**TASK_DEFAULTS_BIND_ONCE)
+def refresh_eve_entities(self: Task, ids: list[int]):
+    """Refresh the names of stale Eve entities."""
+    with retry_task_on_esi_error(self):
+        runs = EveEntity.objects.refresh_names(ids)
+    logger.debug("Refreshed %s Eve entity names", runs)
@@ -5,11 +5,13 @@ from unittest.mock import Mock
 # Django
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
 # AA TaxSystem
+from taxsystem.managers.eveonline_manager import clear_name_cache
 from taxsystem.tests.testdata.factory import EveCorporationInfoFactory, UserMainFactory
 from taxsystem.views import add_alliance, add_corp
 
@@ -90,6 +92,12 @@ class TaxSystemTestCase(NoSocketsTestCase):
         cls.superuser.save()
         cls.superuser_character = cls.superuser.profile.main_character
 
+    def setUp(self):
+        super().setUp()
+        # Cached data must not leak between tests
+        cache.clear()
+        clear_name_cache()
+
     def _add_corporation(self, user, token):
         request = self.factory.get(reverse("taxsystem:add_corp"))
         request.user = user
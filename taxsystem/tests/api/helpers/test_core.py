@@ -0,0 +1,101 @@
+# Django
+from django.urls import reverse
+
+# AA TaxSystem
+from taxsystem.api.helpers.core import get_manage_owner, get_owner
+from taxsystem.helpers.cache import OwnerRef, set_cached_owner_ref
+from taxsystem.tests import TaxSystemTestCase
+from taxsystem.tests.testdata.factory import (
+    AllianceOwnerFactory,
+    CorporationOwnerFactory,
+)
+
+MODULE_PATH = "taxsystem.api.helpers.core"
+
+
+class TestOwnerResolution(TaxSystemTestCase):
+    """Test the owner resolution of the API helpers."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.alliance_audit = AllianceOwnerFactory(user=cls.user)
+        cls.audit = cls.alliance_audit.corporation
+
+    def _request(self, user):
+        request = self.factory.get(reverse("taxsystem:index"))
+        request.user = user
+        return request
+
+    def test_get_owner(self):
+        """
+        Test should resolve corporation and alliance owners.
+
+        # Test Scenarios:
+            1. Resolve a corporation owner the user can see.
+            2. Resolve an alliance owner the user can see.
+            3. Return None for an unknown ID.
+        """
+        # Test Data
+        request = self._request(self.user)
+
+        # Test Action & Expected Results
+        owner, perms = get_owner(request, self.audit.eve_corporation.corporation_id)
+        self.assertEqual(owner, self.audit)
+        self.assertTrue(perms)
+
+        owner, perms = get_owner(request, self.alliance_audit.eve_alliance.alliance_id)
+        self.assertEqual(owner, self.alliance_audit)
+        self.assertTrue(perms)
+
+        self.assertEqual(get_owner(request, 1), (None, False))
+        self.assertEqual(get_manage_owner(request, 1), (None, None))
+
+    def test_get_manage_owner_without_permission(self):
+        """
+        Test should deny managing an owner without manage permissions.
+
+        # Test Scenarios:
+            1. Return the owner without permission.
+        """
+        # Test Data
+        other_audit = CorporationOwnerFactory(user=self.superuser)
+        request = self._request(self.user)
+
+        # Test Action
+        owner, perms = get_manage_owner(
+            request, other_audit.eve_corporation.corporation_id
+        )
+
+        # Expected Results
+        self.assertEqual(owner, other_audit)
+        self.assertFalse(perms)
+
+    def test_get_owner_is_cached(self):
+        """
+        Test should cache the owner type of an ID.
+
+        # Test Scenarios:
+            1. Resolve a known alliance owner with one query and the permission check.
+            2. Resolve the owner again when the cached owner no longer exists.
+            3. Do not serve another owner that got the cached primary key.
+        """
+        # Test Data
+        request = self._request(self.superuser)
+        alliance_id = self.alliance_audit.eve_alliance.alliance_id
+        get_owner(request, alliance_id)
+
+        # Test Action & Expected Results
+        with self.assertNumQueries(2):
+            owner, _ = get_owner(request, alliance_id)
+        self.assertEqual(owner.eve_alliance.alliance_id, alliance_id)
+
+        set_cached_owner_ref(alliance_id, OwnerRef("alliance", 0))
+        owner, perms = get_owner(request, alliance_id)
+        self.assertEqual(owner, self.alliance_audit)
+        self.assertTrue(perms)
+
+        other_audit = AllianceOwnerFactory(user=self.superuser)
+        set_cached_owner_ref(alliance_id, OwnerRef("alliance", other_audit.pk))
+        owner, _ = get_owner(request, alliance_id)
+        self.assertEqual(owner, self.alliance_audit)
@@ -3,8 +3,19 @@ import json
 from http import HTTPStatus
 
 # Django
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+# Alliance Auth
+from allianceauth.authentication.models import (
+    CharacterOwnership,
+    UserProfile,
+    get_guest_state,
+)
+from allianceauth.eveonline.models import EveCharacter
+
 # AA TaxSystem
 from taxsystem.models.corporation import CorporationOwner, CorporationPaymentAccount
 from taxsystem.models.helpers.textchoices import AccountStatus
@@ -80,6 +91,55 @@ class TestAdminApiEndpoints(TaxSystemTestCase):
         self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
         self.assertEqual(response.json().get("error"), result)
 
+    def test_get_dashboard_cached(self):
+        """
+        Test 'api:get_dashboard' Endpoint serves the statistics from the cache.
+
+        # Test Scenarios:
+            1. A second request returns the cached statistics.
+            2. Changing a tax account drops the cached statistics.
+            3. The statistics are cached per language.
+        """
+        # Test Data
+        url = reverse(
+            f"{API_URL}:get_dashboard", kwargs={"owner_id": self.audit.eve_id}
+        )
+        self.client.force_login(self.superuser)
+        self.client.get(url)
+        self.audit.account_model.objects.filter(pk=self.tax_account.pk).update(
+            status=AccountStatus.DEACTIVATED
+        )
+
+        # Test Action
+        response = self.client.get(url)
+
+        # Expected Result
+        statistics = response.json()["statistics"]["tax_account"]
+        self.assertEqual(statistics["accounts_active"], 1)
+
+        # Test Scenario 2: Invalidate on change
+        CorporationPaymentAccount.objects.get(pk=self.tax_account.pk).save()
+
+        # Test Action
+        response = self.client.get(url)
+
+        # Expected Result
+        statistics = response.json()["statistics"]["tax_account"]
+        self.assertEqual(statistics["accounts_active"], 0)
+        self.assertEqual(statistics["accounts_deactivated"], 1)
+
+        # Test Scenario 3: Cache per language
+        self.audit.account_model.objects.filter(pk=self.tax_account.pk).update(
+            status=AccountStatus.ACTIVE
+        )
+
+        # Test Action
+        response = self.client.get(url, HTTP_ACCEPT_LANGUAGE="de")
+
+        # Expected Result
+        statistics = response.json()["statistics"]["tax_account"]
+        self.assertEqual(statistics["accounts_active"], 1)
+
     def test_get_tax_accounts(self):
         """
         Test 'api:get_tax_accounts' Endpoint.
@@ -118,6 +178,144 @@ class TestAdminApiEndpoints(TaxSystemTestCase):
         self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
         self.assertEqual(response.json().get("error"), result)
 
+    def test_get_tax_accounts_compact(self):
+        """
+        Test 'api:get_tax_accounts' Endpoint in compact mode.
+
+        # Test Scenarios:
+            1. Rows contain the account state without rendered HTML.
+            2. The capabilities allow managing accounts and bulk actions.
+        """
+        # Test Data
+        url = reverse(
+            f"{API_URL}:get_tax_accounts", kwargs={"owner_id": self.audit.eve_id}
+        )
+        self.client.force_login(self.superuser)
+
+        # Test Action
+        response = self.client.get(url, {"compact": "true"})
+
+        # Expected Result
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(data["capabilities"], 10)
+        self.assertEqual(len(data["data"]), 1)
+        row = data["data"][0]
+        self.assertEqual(row["account_id"], self.tax_account.pk)
+        self.assertEqual(
+            row["account"]["character_id"], self.user_character.character_id
+        )
+        self.assertEqual(row["has_paid"], self.tax_account.has_paid)
+        self.assertTrue(row["is_active"])
+        self.assertNotIn("actions", row)
+        self.assertNotIn("<", json.dumps(data))
+
+    def _bulk_create_tax_accounts(self, owner, count: int):
+        """Create tax accounts with users, main characters and ownerships in bulk."""
+        state = get_guest_state()
+        users = User.objects.bulk_create(
+            [User(username=f"bulk-user-{i}") for i in range(count)]
+        )
+        characters = EveCharacter.objects.bulk_create(
+            [
+                EveCharacter(
+                    character_id=90_500_000 + i,
+                    character_name=f"Bulk Character {i}",
+                    corporation_id=owner.eve_corporation.corporation_id,
+                    corporation_name=owner.eve_corporation.corporation_name,
+                    corporation_ticker=owner.eve_corporation.corporation_ticker,
+                )
+                for i in range(count)
+            ]
+        )
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(user=user, main_character=character, state=state)
+                for user, character in zip(users, characters)
+            ]
+        )
+        CharacterOwnership.objects.bulk_create(
+            [
+                CharacterOwnership(
+                    user=user, character=character, owner_hash=f"bulk-hash-{i}"
+                )
+                for i, (user, character) in enumerate(zip(users, characters))
+            ]
+        )
+        CorporationPaymentAccount.objects.bulk_create(
+            [
+                CorporationPaymentAccount(
+                    name=character.character_name,
+                    owner=owner,
+                    user=user,
+                    status=AccountStatus.ACTIVE,
+                    deposit=owner.tax_amount if i % 2 else -1,
+                )
+                for i, (user, character) in enumerate(zip(users, characters))
+            ]
+        )
+
+    def test_get_tax_accounts_constant_queries(self):
+        """
+        Test 'api:get_tax_accounts' Endpoint runs a constant number of queries.
+
+        # Test Scenarios:
+            1. The full list and a server-side page need the same number of queries for 1 and 2000 accounts.
+            2. A server-side page is filtered by the payment state and sorted in the database.
+        """
+        # Test Data
+        url = reverse(
+            f"{API_URL}:get_tax_accounts", kwargs={"owner_id": self.audit.eve_id}
+        )
+        server_side = {
+            "draw": 1,
+            "start": 0,
+            "length": 50,
+            "columns[0][data]": "account.character_name",
+            "columns[1][data]": "has_paid",
+            "columns[1][search][value]": "paid",
+            "order[0][column]": 0,
+            "order[0][dir]": "desc",
+        }
+        self.client.force_login(self.superuser)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as queries_page:
+            self.client.get(url, server_side)
+
+        self._bulk_create_tax_accounts(self.audit, 2000)
+
+        # Test Action
+        with CaptureQueriesContext(connection) as queries_more:
+            response = self.client.get(url)
+        with CaptureQueriesContext(connection) as queries_page_more:
+            response_page = self.client.get(url, server_side)
+
+        # Expected Result
+        self.assertEqual(len(queries_more), len(queries))
+        self.assertEqual(len(queries_page_more), len(queries_page))
+        self.assertEqual(len(response.json()), 2001)
+        data = response_page.json()
+        self.assertEqual(data["recordsTotal"], 2001)
+        self.assertEqual(
+            data["recordsFiltered"],
+            1000
+            + int(
+                CorporationPaymentAccount.objects.get(pk=self.tax_account.pk).has_paid
+            ),
+        )
+        self.assertEqual(len(data["data"]), 50)
+        self.assertTrue(all(row["has_paid"]["raw"] for row in data["data"]))
+        names = [row["account"]["character_name"] for row in data["data"]]
+        self.assertEqual(names, sorted(names, reverse=True))
+        row = next(
+            row
+            for row in data["data"]
+            if row["account"]["character_name"] == "Bulk Character 999"
+        )
+        self.assertEqual(row["account"]["alt_ids"], [90_500_999])
+
     def test_switch_tax_account(self):
         """
         Test 'api:switch_tax_account' Endpoint.
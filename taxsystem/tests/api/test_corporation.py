@@ -83,6 +83,35 @@ class TestCorporationApiEndpoints(TaxSystemTestCase):
         self.assertIn("Test Character", str(response.json()))
         self.assertIn("Missing Character", str(response.json()))
 
+    def test_get_members_compact(self):
+        """
+        Test should return the member state without rendered HTML in compact mode.
+
+        Results:
+        - Capabilities allow deleting members of a Corporation Owner
+        - Missing member is flagged
+        """
+        # Test Data
+        corporation_id = self.user_character.corporation_id
+        member = MembersFactory(
+            owner=self.audit,
+            character_name="Missing Character",
+            status="missing",
+        )
+        url = reverse(f"{API_URL}:get_members", kwargs={"owner_id": corporation_id})
+        self.client.force_login(self.superuser)
+
+        # Test Action
+        response = self.client.get(url, {"compact": 1})
+
+        # Expected Result
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(data["capabilities"], 4)
+        self.assertEqual(data["data"][0]["member_id"], member.pk)
+        self.assertTrue(data["data"][0]["is_missing"])
+        self.assertNotIn("<", json.dumps(data))
+
     def test_delete_member_should_403(self):
         """
         Test should return 403 Forbidden when user lacks permissions.
@@ -0,0 +1,156 @@
+# Standard Library
+import csv
+from http import HTTPStatus
+from unittest.mock import patch
+
+# Django
+from django.urls import reverse
+from django.utils import timezone
+
+# AA TaxSystem
+from taxsystem.models.helpers.textchoices import PaymentRequestStatus
+from taxsystem.tests import TaxSystemTestCase
+from taxsystem.tests.testdata.factory import (
+    CorporationJournalFactory,
+    CorporationOwnerFactory,
+    CorporationPaymentsFactory,
+    CorporationTaxAccountFactory,
+    DivisionFactory,
+)
+
+API_URL = "taxsystem:api"
+
+
+class TestExportApiEndpoints(TaxSystemTestCase):
+    """Test Export API Endpoints."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.audit = CorporationOwnerFactory(user=cls.user)
+        cls.division = DivisionFactory(corporation=cls.audit)
+        cls.tax_account = CorporationTaxAccountFactory(
+            name=cls.user_character.character_name,
+            owner=cls.audit,
+            user=cls.user,
+        )
+        cls.now = timezone.now()
+        for days, amount in [(40, 1000), (5, 2000)]:
+            journal_entry = CorporationJournalFactory(
+                division=cls.division,
+                amount=amount,
+                date=cls.now - timezone.timedelta(days=days),
+            )
+            CorporationPaymentsFactory(
+                name=cls.user_character.character_name,
+                owner=cls.audit,
+                account=cls.tax_account,
+                entry_id=journal_entry.entry_id,
+                journal=journal_entry,
+                amount=amount,
+                date=journal_entry.date,
+                request_status=PaymentRequestStatus.APPROVED,
+            )
+
+    def _export(self, export_type: str, **params) -> list[dict]:
+        url = reverse(
+            f"{API_URL}:export_owner_data",
+            kwargs={"owner_id": self.audit.eve_id, "export_type": export_type},
+        )
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        self.assertIn(f"-{export_type}-", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.DictReader(content.splitlines()))
+
+    def test_export_owner_data(self):
+        """
+        Test 'api:export_owner_data' Endpoint.
+
+        # Test Scenarios:
+            1. Payments, tax accounts and journal entries are streamed as CSV.
+            2. The date range limits the payments and journal entries.
+        """
+        # Test Data
+        self.client.force_login(self.superuser)
+        start = (self.now - timezone.timedelta(days=10)).date()
+
+        # Test Action & Expected Results
+        payments = self._export("payments")
+        self.assertEqual(sorted(row["amount"] for row in payments), ["1000", "2000"])
+        self.assertEqual(
+            payments[0]["character_id"], str(self.user_character.character_id)
+        )
+
+        payments = self._export("payments", start=start, end=self.now.date())
+        self.assertEqual([row["amount"] for row in payments], ["2000"])
+
+        accounts = self._export("accounts", start=start)
+        self.assertEqual(
+            [row["account_id"] for row in accounts], [str(self.tax_account.pk)]
+        )
+
+        journal = self._export("journal", start=start)
+        self.assertEqual(len(journal), 1)
+        self.assertEqual(journal[0]["division_id"], str(self.division.division_id))
+
+    @patch("taxsystem.helpers.export.TAXSYSTEM_EXPORT_CHUNK_SIZE", 1)
+    def test_export_owner_data_chunks(self):
+        """
+        Test 'api:export_owner_data' Endpoint with more rows than one chunk.
+
+        # Test Scenarios:
+            1. All rows are streamed once, in primary key order.
+            2. Text that a spreadsheet would run as formula is escaped.
+        """
+        # Test Data
+        self.client.force_login(self.superuser)
+        CorporationJournalFactory(
+            division=self.division,
+            amount=3000,
+            reason='=HYPERLINK("https://example.com")',
+            description="-Donation",
+        )
+
+        # Test Action
+        journal = self._export("journal")
+
+        # Expected Results
+        self.assertEqual(
+            [row["amount"] for row in journal], ["1000.00", "2000.00", "3000.00"]
+        )
+        self.assertEqual(journal[2]["reason"], '\'=HYPERLINK("https://example.com")')
+        self.assertEqual(journal[2]["description"], "'-Donation")
+
+    def test_export_owner_data_errors(self):
+        """
+        Test 'api:export_owner_data' Endpoint errors.
+
+        # Test Scenarios:
+            1. Unknown export type returns 400.
+            2. Users without manage permissions are denied.
+            3. Unknown owner returns 404.
+        """
+        # Test Data
+        self.client.force_login(self.user)
+
+        # Test Action & Expected Results
+        url = reverse(
+            f"{API_URL}:export_owner_data",
+            kwargs={"owner_id": self.audit.eve_id, "export_type": "unknown"},
+        )
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.BAD_REQUEST)
+
+        url = reverse(
+            f"{API_URL}:export_owner_data",
+            kwargs={"owner_id": self.audit.eve_id, "export_type": "payments"},
+        )
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.FORBIDDEN)
+
+        url = reverse(
+            f"{API_URL}:export_owner_data",
+            kwargs={"owner_id": 1, "export_type": "payments"},
+        )
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.NOT_FOUND)
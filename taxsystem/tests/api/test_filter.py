@@ -148,6 +148,7 @@ class TestFilterApiEndpoints(TaxSystemTestCase):
         data = json.loads(response.content)
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(data[0]["name"], self.filterset.name)
+        self.assertEqual(data[0]["hits"], 0)
 
         # Test Scenario 2: Permission Denied
         url = reverse(
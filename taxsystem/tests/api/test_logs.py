@@ -0,0 +1,184 @@
+# Standard Library
+from http import HTTPStatus
+
+# Django
+from django.urls import reverse
+from django.utils import timezone
+
+# AA TaxSystem
+from taxsystem.models.corporation import CorporationAdminHistory
+from taxsystem.models.helpers.textchoices import (
+    ActionType,
+    AdminActions,
+    PaymentActions,
+)
+from taxsystem.tests import TaxSystemTestCase
+from taxsystem.tests.testdata.factory import (
+    CorporationOwnerFactory,
+    CorporationPaymentHistoryFactory,
+    CorporationPaymentsFactory,
+    CorporationTaxAccountFactory,
+)
+
+API_URL = "taxsystem:api"
+
+
+class TestLogsApiEndpoints(TaxSystemTestCase):
+    """Test Logs API Endpoints."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.audit = CorporationOwnerFactory(user=cls.user)
+        cls.now = timezone.now()
+
+        cls.admin_logs = [
+            CorporationAdminHistory.objects.create(
+                owner=cls.audit,
+                user=cls.superuser if hours % 2 else cls.user,
+                date=cls.now - timezone.timedelta(hours=hours),
+                target=ActionType.PAYMENT if hours < 3 else ActionType.SETTINGS,
+                action=AdminActions.CHANGE,
+                comment=f"Log {hours}",
+            )
+            for hours in range(5)
+        ]
+
+        cls.tax_account = CorporationTaxAccountFactory(
+            name=cls.user_character.character_name,
+            owner=cls.audit,
+            user=cls.user,
+        )
+        cls.payment = CorporationPaymentsFactory(
+            owner=cls.audit,
+            account=cls.tax_account,
+            date=cls.now,
+        )
+        cls.payment_logs = [
+            CorporationPaymentHistoryFactory(
+                payment=cls.payment,
+                user=cls.superuser,
+                action=action,
+                date=cls.now - timezone.timedelta(hours=hours),
+            )
+            for hours, action in enumerate(
+                [PaymentActions.STATUS_CHANGE, PaymentActions.REVISER_COMMENT]
+            )
+        ]
+
+    def _get(self, name: str, **params) -> dict:
+        url = reverse(f"{API_URL}:{name}", kwargs={"owner_id": self.audit.eve_id})
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.json()
+
+    def test_get_admin_history(self):
+        """
+        Test 'api:get_admin_history' Endpoint.
+
+        # Test Scenarios:
+            1. The logs are returned newest first, page by page.
+            2. The since cursor only returns logs added after the first page.
+            3. The logs can be filtered by target and user.
+        """
+        # Test Data
+        self.client.force_login(self.superuser)
+
+        # Test Action
+        first = self._get("get_admin_history", limit=2)
+        second = self._get("get_admin_history", limit=2, before=first["next_cursor"])
+        last = self._get("get_admin_history", limit=2, before=second["next_cursor"])
+
+        # Expected Result
+        log_ids = [
+            log["log_id"] for page in (first, second, last) for log in page["data"]
+        ]
+        self.assertEqual(log_ids, [log.pk for log in self.admin_logs])
+        self.assertIsNone(last["next_cursor"])
+        self.assertIsNone(second["since_cursor"])
+
+        # Test Action
+        new_log = CorporationAdminHistory.objects.create(
+            owner=self.audit,
+            user=self.superuser,
+            target=ActionType.FILTER,
+            action=AdminActions.ADD,
+        )
+        polled = self._get("get_admin_history", since=first["since_cursor"])
+
+        # Expected Result
+        self.assertEqual([log["log_id"] for log in polled["data"]], [new_log.pk])
+        self.assertEqual(polled["data"][0]["action"]["raw"], AdminActions.ADD)
+        self.assertIsNone(
+            self._get("get_admin_history", since=polled["since_cursor"])["next_cursor"]
+        )
+
+        # Test Action
+        filtered = self._get(
+            "get_admin_history",
+            target=ActionType.PAYMENT,
+            user=self.superuser.username,
+        )
+
+        # Expected Result
+        self.assertEqual(
+            [log["log_id"] for log in filtered["data"]], [self.admin_logs[1].pk]
+        )
+
+    def test_get_admin_history_invalid_cursor(self):
+        """
+        Test 'api:get_admin_history' Endpoint with a malformed cursor.
+
+        # Test Scenarios:
+            1. A malformed cursor is rejected.
+            2. An unknown owner is not found.
+        """
+        # Test Data
+        self.client.force_login(self.superuser)
+        url = reverse(
+            f"{API_URL}:get_admin_history", kwargs={"owner_id": self.audit.eve_id}
+        )
+
+        # Test Action & Expected Results
+        response = self.client.get(url, {"before": "invalid"})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+        response = self.client.get(
+            reverse(f"{API_URL}:get_admin_history", kwargs={"owner_id": 1})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_get_payments_history(self):
+        """
+        Test 'api:get_payments_history' Endpoint.
+
+        # Test Scenarios:
+            1. The payment logs of the owner are returned, not the admin logs.
+            2. Payment logs of other owners are not returned.
+            3. The logs can be filtered by action.
+        """
+        # Test Data
+        self.client.force_login(self.superuser)
+        CorporationPaymentHistoryFactory(
+            payment=CorporationPaymentsFactory(date=self.now),
+            user=self.superuser,
+        )
+
+        # Test Action
+        response = self._get("get_payments_history")
+        filtered = self._get(
+            "get_payments_history", action=PaymentActions.REVISER_COMMENT
+        )
+
+        # Expected Result
+        self.assertEqual(
+            [log["log_id"] for log in response["data"]],
+            [log.pk for log in self.payment_logs],
+        )
+        self.assertEqual(response["data"][0]["payment_id"], self.payment.pk)
+        self.assertEqual(response["data"][0]["reviser"], self.superuser.username)
+        self.assertIsNone(response["next_cursor"])
+        self.assertEqual(
+            [log["log_id"] for log in filtered["data"]], [self.payment_logs[1].pk]
+        )
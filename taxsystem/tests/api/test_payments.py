@@ -73,6 +73,170 @@ class TestPaymentsApiEndpoints(TaxSystemTestCase):
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertIn(str(payment.amount), str(response.json()))
 
+    def test_get_payments_server_side(self):
+        """
+        Test 'api:get_payments' endpoint in DataTables server-side mode.
+
+        Results:
+        - Response is wrapped in a DataTables envelope
+        - Only the requested page is returned, ordered by amount
+        - Per-column request status filter is applied in the database
+        - Global search is applied in the database
+        """
+        # Test Data
+        corporation_id = self.user_character.corporation_id
+        for entry_id, (amount, status, reason) in enumerate(
+            [
+                (1000, PaymentRequestStatus.APPROVED, "Tax"),
+                (2000, PaymentRequestStatus.PENDING, "Tax"),
+                (3000, PaymentRequestStatus.NEEDS_APPROVAL, "Donation"),
+            ],
+            start=1,
+        ):
+            journal_entry = CorporationJournalFactory(amount=amount)
+            CorporationPaymentsFactory(
+                name=self.user_character.character_name,
+                owner=self.audit,
+                account=self.account,
+                entry_id=entry_id,
+                journal=journal_entry,
+                amount=amount,
+                date=timezone.now() - timezone.timedelta(days=entry_id),
+                reason=reason,
+                request_status=status,
+            )
+
+        url = reverse(f"{API_URL}:get_payments", kwargs={"owner_id": corporation_id})
+        columns = {
+            "columns[0][data]": "character.character_portrait",
+            "columns[1][data]": "character.character_name",
+            "columns[2][data]": "amount",
+            "columns[3][data]": "date",
+            "columns[4][data]": "request_status.status",
+            "columns[5][data]": "actions",
+        }
+        self.client.force_login(self.user)
+
+        # Test Action
+        response = self.client.get(
+            url,
+            {
+                **columns,
+                "draw": 3,
+                "start": 0,
+                "length": 2,
+                "order[0][column]": 2,
+                "order[0][dir]": "asc",
+            },
+        )
+
+        # Expected Result
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(data["draw"], 3)
+        self.assertEqual(data["recordsTotal"], 3)
+        self.assertEqual(data["recordsFiltered"], 3)
+        self.assertEqual([row["amount"] for row in data["data"]], [1000, 2000])
+
+        # Test Action
+        response = self.client.get(
+            url,
+            {
+                **columns,
+                "draw": 4,
+                "columns[4][search][value]": "pending,needs_approval",
+            },
+        )
+
+        # Expected Result
+        data = response.json()
+        self.assertEqual(data["recordsTotal"], 3)
+        self.assertEqual(data["recordsFiltered"], 2)
+        self.assertEqual([row["amount"] for row in data["data"]], [2000, 3000])
+
+        # Test Action
+        response = self.client.get(
+            url, {**columns, "draw": 5, "search[value]": "donation"}
+        )
+
+        # Expected Result
+        data = response.json()
+        self.assertEqual(data["recordsFiltered"], 1)
+        self.assertEqual(data["data"][0]["amount"], 3000)
+
+    def test_get_payments_compact(self):
+        """
+        Test 'api:get_payments' endpoint in compact mode.
+
+        Results:
+        - Rows contain the row state without rendered HTML
+        - Capabilities depend on the manage permissions of the user
+        - Request status labels are sent once per response
+        - Per-column request status filter works with the status code column
+        """
+        # Test Data
+        corporation_id = self.user_character.corporation_id
+        journal_entry = CorporationJournalFactory(amount=1000)
+        payment = CorporationPaymentsFactory(
+            name=self.user_character.character_name,
+            owner=self.audit,
+            account=self.account,
+            journal=journal_entry,
+            amount=journal_entry.amount,
+            date=journal_entry.date,
+            request_status=PaymentRequestStatus.PENDING,
+        )
+        CorporationPaymentsFactory(
+            name=self.user_character.character_name,
+            owner=self.audit,
+            account=self.account,
+            journal=None,
+            date=timezone.now(),
+            request_status=PaymentRequestStatus.APPROVED,
+        )
+        url = reverse(f"{API_URL}:get_payments", kwargs={"owner_id": corporation_id})
+        self.client.force_login(self.user)
+
+        # Test Action
+        response = self.client.get(url, {"compact": 1})
+
+        # Expected Result
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(data["capabilities"], 0)
+        self.assertEqual(data["statuses"]["pending"]["color"], "warning")
+        row = next(row for row in data["data"] if row["payment_id"] == payment.pk)
+        self.assertEqual(row["request_status"], PaymentRequestStatus.PENDING)
+        self.assertTrue(row["has_journal"])
+        self.assertEqual(
+            row["character"],
+            {
+                "character_id": self.user_character.character_id,
+                "character_name": self.account.name,
+            },
+        )
+        self.assertNotIn("actions", row)
+        self.assertNotIn("<", json.dumps(data["data"]))
+
+        # Test Action
+        self.client.force_login(self.superuser)
+        response = self.client.get(
+            url,
+            {
+                "compact": 1,
+                "draw": 1,
+                "columns[0][data]": "request_status",
+                "columns[0][search][value]": "pending",
+            },
+        )
+
+        # Expected Result
+        data = response.json()
+        self.assertEqual(data["capabilities"], 9)
+        self.assertEqual(data["recordsTotal"], 2)
+        self.assertEqual(data["recordsFiltered"], 1)
+        self.assertEqual(data["data"][0]["payment_id"], payment.pk)
+
     def test_get_my_payments_should_200_basic_access(self):
         """
         Test that a user with 'basic_access' can access API Endpoint 'get_my_payments'.
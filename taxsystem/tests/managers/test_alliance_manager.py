@@ -248,7 +248,7 @@ class TestAllianceManager(TaxSystemTestCase):
             user=self.user,
             status=AccountStatus.ACTIVE,
             deposit=1000,
-            last_paid=(timezone.now() - timezone.timedelta(days=60)),
+            last_paid=(timezone.now() - timezone.timedelta(days=45)),
         )
         self.new_user = UserMainFactory()
 
@@ -1,17 +1,20 @@
 # Standard Library
 from http import HTTPStatus
+from types import SimpleNamespace
 from unittest.mock import patch
 
 # Third Party
 import pook
 
 # Django
+from django.contrib.auth.models import User
 from django.utils import timezone
 
 # AA TaxSystem
 from taxsystem.models.corporation import (
     CorporationFilter,
     CorporationPaymentAccount,
+    CorporationPaymentHistory,
     CorporationPayments,
     Members,
 )
@@ -25,9 +28,12 @@ from taxsystem.tests.testdata.factory import (
     CorporationPaymentsFactory,
     CorporationTaxAccountFactory,
     DivisionFactory,
+    EveCharacterFactory,
+    EveEntityFactory,
     MembersFactory,
     UserMainFactory,
 )
+from taxsystem.tests.testdata.utils import add_character_to_user
 
 MODULE_PATH = "taxsystem.managers.corporation_manager"
 
@@ -136,6 +142,51 @@ class TestCorporationManager(TaxSystemTestCase):
         self.assertEqual(obj.amount, 6000)
         self.assertEqual(obj.request_status, PaymentRequestStatus.NEEDS_APPROVAL)
 
+    def test_update_tax_account_approves_payments_in_batch(self):
+        """
+        Test should approve all matching payments of one account in a single run.
+
+        Results:
+            1. Add every approved amount to the deposit.
+            2. Create a history entry for each approved payment.
+        """
+        # Test Data
+        tax_account = CorporationTaxAccountFactory(
+            name=self.user_character.character_name,
+            owner=self.audit,
+            user=self.user,
+            status=AccountStatus.ACTIVE,
+            deposit=500,
+        )
+        payments = [
+            CorporationPaymentsFactory(
+                name=self.user_character.character_name,
+                account=tax_account,
+                owner=self.audit,
+                journal=CorporationJournalFactory(division=self.division, amount=1000),
+                amount=1000,
+                request_status=PaymentRequestStatus.PENDING,
+            )
+            for _ in range(2)
+        ]
+
+        # Test Action
+        self.audit.update_tax_accounts(force_refresh=False)
+
+        # Expected Results
+        tax_account.refresh_from_db()
+        self.assertEqual(tax_account.deposit, 2500)
+        for payment in payments:
+            payment.refresh_from_db()
+            self.assertEqual(payment.request_status, PaymentRequestStatus.APPROVED)
+            self.assertEqual(payment.reviser, "System")
+        self.assertEqual(
+            CorporationPaymentHistory.objects.filter(
+                payment__in=payments, new_status=PaymentRequestStatus.APPROVED
+            ).count(),
+            2,
+        )
+
     @patch(f"{MODULE_PATH}.logger")
     def test_update_tax_accounts_mark_as_missing(self, mock_logger):
         """Test should mark tax account as missing.
@@ -233,6 +284,64 @@ class TestCorporationManager(TaxSystemTestCase):
             tax_account.name,
         )
 
+    def test_check_tax_accounts_reconciliation_report(self):
+        """
+        Test should reconcile all tax accounts in bulk and report the counts.
+
+        Results:
+            1. Reset the returning user, mark the missing user, move the user to the new corporation.
+            2. Delete the orphaned account and create accounts for new users.
+        """
+        # Test Data
+        returned_account = CorporationTaxAccountFactory(
+            owner=self.audit, user=self.user, status=AccountStatus.MISSING
+        )
+        missing_user = UserMainFactory()
+        missing_account = CorporationTaxAccountFactory(
+            owner=self.audit, user=missing_user, status=AccountStatus.ACTIVE
+        )
+        moved_user = UserMainFactory()
+        audit_2 = CorporationOwnerFactory(user=moved_user)
+        moved_account = CorporationTaxAccountFactory(
+            owner=self.audit, user=moved_user, status=AccountStatus.ACTIVE
+        )
+        orphaned_user = UserMainFactory()
+        orphaned_account = CorporationTaxAccountFactory(
+            owner=self.audit, user=orphaned_user
+        )
+        orphaned_user.profile.main_character = None
+        orphaned_user.profile.save()
+        new_user = UserMainFactory()
+        expected_new = (
+            User.objects.filter(profile__main_character__isnull=False)
+            .exclude(pk__in=CorporationPaymentAccount.objects.values("user_id"))
+            .count()
+        )
+
+        # Test Action
+        report = CorporationPaymentAccount.objects._check_tax_accounts(self.audit)
+
+        # Expected Results
+        self.assertEqual(report.created, expected_new)
+        self.assertEqual(report.returned, 1)
+        self.assertEqual(report.missing, 1)
+        self.assertEqual(report.moved, 1)
+        self.assertEqual(report.deleted, 1)
+        returned_account.refresh_from_db()
+        self.assertEqual(returned_account.status, AccountStatus.ACTIVE)
+        missing_account.refresh_from_db()
+        self.assertEqual(missing_account.status, AccountStatus.MISSING)
+        moved_account.refresh_from_db()
+        self.assertEqual(moved_account.owner, audit_2)
+        self.assertFalse(
+            CorporationPaymentAccount.objects.filter(pk=orphaned_account.pk).exists()
+        )
+        self.assertTrue(
+            CorporationPaymentAccount.objects.filter(
+                user=new_user, owner=self.audit
+            ).exists()
+        )
+
     def test_payment_deadlines(self):
         """
         Test payment deadlines processing for corporation tax accounts.
@@ -250,7 +359,7 @@ class TestCorporationManager(TaxSystemTestCase):
             user=self.user,
             status=AccountStatus.ACTIVE,
             deposit=1000,
-            last_paid=(timezone.now() - timezone.timedelta(days=60)),
+            last_paid=(timezone.now() - timezone.timedelta(days=45)),
         )
         new_user = UserMainFactory()
 
@@ -273,6 +382,50 @@ class TestCorporationManager(TaxSystemTestCase):
         tax_account_2 = CorporationPaymentAccount.objects.get(user=new_user)
         self.assertEqual(tax_account_2.deposit, 0)
 
+    def test_payment_deadlines_catch_up(self):
+        """
+        Test payment deadlines should charge every missed period in one run.
+
+        Results:
+            1. Missed periods are charged once per period.
+            2. last_paid is advanced by whole periods and the due date is updated.
+            3. Accounts within the period are not touched.
+        """
+        # Test Data
+        audit = CorporationOwnerFactory(
+            user=self.superuser, tax_amount=1000, tax_period=30
+        )
+        last_paid = timezone.now() - timezone.timedelta(days=75)
+        overdue = CorporationTaxAccountFactory(
+            owner=audit,
+            user=self.user,
+            status=AccountStatus.ACTIVE,
+            deposit=1000,
+            last_paid=last_paid,
+        )
+        within_period = CorporationTaxAccountFactory(
+            owner=audit,
+            user=UserMainFactory(),
+            status=AccountStatus.ACTIVE,
+            deposit=0,
+            last_paid=timezone.now() - timezone.timedelta(days=10),
+        )
+
+        # Test Action
+        result = audit.update_deadlines(force_refresh=False)
+
+        # Expected Results
+        self.assertEqual(result.data.charged, 1)
+        self.assertEqual(result.data.periods, 2)
+        self.assertEqual(result.data.initialised, 0)
+        overdue.refresh_from_db()
+        self.assertEqual(overdue.deposit, -1000)
+        self.assertEqual(overdue.last_paid, last_paid + timezone.timedelta(days=60))
+        self.assertEqual(overdue.next_due, last_paid + timezone.timedelta(days=90))
+        self.assertIsNone(overdue.paid_until)
+        within_period.refresh_from_db()
+        self.assertEqual(within_period.deposit, 0)
+
     @patch(MODULE_PATH + ".EveEntity.objects.bulk_resolve_names")
     @patch(MODULE_PATH + ".logger")
     @pook.on
@@ -374,6 +527,76 @@ class TestCorporationManager(TaxSystemTestCase):
             1,
         )
 
+    @patch(MODULE_PATH + ".EveEntity.objects.bulk_resolve_names")
+    def test_update_members_classifies_statuses(self, mock_bulk_resolve):
+        """
+        Test update corporation members should classify all members in bulk.
+
+        Results:
+            1. The main character of an Auth account is active.
+            2. Other characters of the account are alts.
+            3. Members without an account are unregistered and old members are missing.
+            4. Only members with a changed status are written.
+        """
+        # Test Data
+        alt_character = EveCharacterFactory()
+        add_character_to_user(user=self.user, character=alt_character)
+        main_id = self.user_character.character_id
+        MembersFactory(
+            owner=self.audit, character_id=main_id, status=Members.States.NOACCOUNT
+        )
+        MembersFactory(
+            owner=self.audit,
+            character_id=alt_character.character_id,
+            status=Members.States.IS_ALT,
+        )
+        MembersFactory(
+            owner=self.audit, character_id=9002, status=Members.States.ACTIVE
+        )
+        now = timezone.now()
+        objs = [
+            SimpleNamespace(
+                character_id=character_id,
+                start_date=now,
+                logon_date=now,
+                logoff_date=now,
+            )
+            for character_id in (main_id, alt_character.character_id, 9001)
+        ]
+        mock_bulk_resolve.return_value.to_name.return_value = "Member"
+
+        # Test Action
+        with patch(MODULE_PATH + ".logger") as mock_logger:
+            Members.objects._update_or_create_objs(owner=self.audit, objs=objs)
+
+        # Expected Results
+        statuses = dict(
+            Members.objects.filter(owner=self.audit).values_list(
+                "character_id", "status"
+            )
+        )
+        self.assertEqual(
+            statuses,
+            {
+                main_id: Members.States.ACTIVE,
+                alt_character.character_id: Members.States.IS_ALT,
+                9001: Members.States.NOACCOUNT,
+                9002: Members.States.MISSING,
+            },
+        )
+        mock_logger.debug.assert_any_call(
+            "Marked %s members as %s for: %s",
+            1,
+            Members.States.ACTIVE,
+            self.audit.name,
+        )
+        marked = [
+            call.args[2]
+            for call in mock_logger.debug.call_args_list
+            if call.args[0] == "Marked %s members as %s for: %s"
+        ]
+        self.assertCountEqual(marked, [Members.States.ACTIVE, Members.States.MISSING])
+
     def test_update_payments(self):
         """
         Test update corporation payments.
@@ -418,3 +641,140 @@ class TestCorporationManager(TaxSystemTestCase):
             self.audit.ts_corporation_payments.get(
                 journal__entry_id=journal_entry2.entry_id
             )
+
+    def test_update_payments_matches_alts_incrementally(self):
+        """
+        Test update corporation payments for alt characters.
+        This test should match donations of all characters of a tax account
+        and only process journal entries without a payment.
+
+        Results:
+            1. Donation from an alt character creates a payment for the main account.
+            2. A payment history entry is created for the new payment.
+            3. A second run does not create duplicates.
+            4. New journal entries are matched, older or newer than the last payment.
+        """
+        # Test Data
+        user = UserMainFactory()
+        alt_character = EveCharacterFactory()
+        add_character_to_user(user=user, character=alt_character)
+        account = CorporationTaxAccountFactory(
+            owner=self.audit,
+            user=user,
+            status=AccountStatus.ACTIVE,
+        )
+        alt_entity = EveEntityFactory(
+            id=alt_character.character_id, name=alt_character.character_name
+        )
+        now = timezone.now()
+        journal_entry = CorporationJournalFactory(
+            division=self.division,
+            amount=5000,
+            ref_type="player_donation",
+            first_party=alt_entity,
+            date=now - timezone.timedelta(days=2),
+        )
+
+        # Test Action
+        self.audit.update_payments(force_refresh=True)
+
+        # Expected Results
+        payment = self.audit.ts_corporation_payments.get(
+            journal__entry_id=journal_entry.entry_id
+        )
+        self.assertEqual(payment.account, account)
+        self.assertEqual(payment.amount, 5000)
+        self.assertTrue(
+            CorporationPaymentHistory.objects.filter(
+                payment=payment, user=user
+            ).exists()
+        )
+
+        # Test Data
+        older_entry = CorporationJournalFactory(
+            division=self.division,
+            amount=1000,
+            ref_type="player_donation",
+            first_party=alt_entity,
+            date=now - timezone.timedelta(days=5),
+        )
+        newer_entry = CorporationJournalFactory(
+            division=self.division,
+            amount=2000,
+            ref_type="player_donation",
+            first_party=alt_entity,
+            date=now - timezone.timedelta(days=1),
+        )
+
+        # Test Action
+        self.audit.update_payments(force_refresh=True)
+
+        # Expected Results
+        self.assertEqual(
+            self.audit.ts_corporation_payments.filter(
+                journal__entry_id=journal_entry.entry_id
+            ).count(),
+            1,
+        )
+        self.assertTrue(
+            self.audit.ts_corporation_payments.filter(
+                journal__entry_id=newer_entry.entry_id
+            ).exists()
+        )
+        self.assertTrue(
+            self.audit.ts_corporation_payments.filter(
+                journal__entry_id=older_entry.entry_id
+            ).exists()
+        )
+
+    def test_update_payments_matches_alt_linked_later(self):
+        """
+        Test update corporation payments for an alt that is linked after newer payments.
+
+        Results:
+            1. The older donation of the alt creates a payment once the alt is linked.
+        """
+        # Test Data
+        user = UserMainFactory()
+        account = CorporationTaxAccountFactory(
+            owner=self.audit,
+            user=user,
+            status=AccountStatus.ACTIVE,
+        )
+        main_entity = EveEntityFactory(
+            id=user.profile.main_character.character_id,
+            name=user.profile.main_character.character_name,
+        )
+        alt_character = EveCharacterFactory()
+        alt_entity = EveEntityFactory(
+            id=alt_character.character_id, name=alt_character.character_name
+        )
+        now = timezone.now()
+        alt_entry = CorporationJournalFactory(
+            division=self.division,
+            amount=1000,
+            ref_type="player_donation",
+            first_party=alt_entity,
+            date=now - timezone.timedelta(days=5),
+        )
+        CorporationJournalFactory(
+            division=self.division,
+            amount=2000,
+            ref_type="player_donation",
+            first_party=main_entity,
+            date=now - timezone.timedelta(days=1),
+        )
+        self.audit.update_payments(force_refresh=True)
+        add_character_to_user(user=user, character=alt_character)
+
+        # Test Action
+        self.audit.update_payments(force_refresh=True)
+
+        # Expected Results
+        payment = self.audit.ts_corporation_payments.get(
+            journal__entry_id=alt_entry.entry_id
+        )
+        self.assertEqual(payment.account, account)
+        self.assertEqual(
+            self.audit.ts_corporation_payments.filter(account=account).count(), 2
+        )
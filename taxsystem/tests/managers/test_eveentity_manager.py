@@ -1,10 +1,17 @@
 # Standard Library
 from http import HTTPStatus
+from unittest.mock import patch
 
 # Third Party
 import pook
 
+# Django
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
 # AA TaxSystem
+from taxsystem.managers.eveonline_manager import clear_name_cache
 from taxsystem.models.general import EveEntity as EveEntityV2
 from taxsystem.tests import TaxSystemTestCase
 from taxsystem.tests.testdata.factory import AllianceOwnerFactory, EveEntityFactory
@@ -83,3 +90,131 @@ class TestEveEntityManager(TaxSystemTestCase):
 
         self.assertEqual(resolver.to_name(1001), entity_1001.name)
         self.assertEqual(resolver.to_name(9997), "Bulk Character")
+
+    def test_bulk_resolve_names_uses_cache_tiers(self):
+        """
+        Test should serve resolved names from the caches.
+
+        Results:
+            1. A second lookup does not query the database.
+            2. Names are served from the shared cache when the process cache is empty.
+        """
+        # Test Data
+        EveEntityFactory(id=1001, name="Cached Character")
+        with self.captureOnCommitCallbacks(execute=True):
+            EveEntityV2.objects.bulk_resolve_names([1001])
+        EveEntityV2.objects.filter(id=1001).delete()
+
+        # Test Action & Expected Results
+        with self.assertNumQueries(0):
+            resolver = EveEntityV2.objects.bulk_resolve_names([1001])
+        self.assertEqual(resolver.to_name(1001), "Cached Character")
+
+        clear_name_cache()
+        with self.assertNumQueries(0):
+            resolver = EveEntityV2.objects.bulk_resolve_names([1001])
+        self.assertEqual(resolver.to_name(1001), "Cached Character")
+
+    @pook.on
+    def test_bulk_resolve_names_rollback(self):
+        """
+        Test should not cache names of a rolled back transaction.
+        """
+        # Test Data
+        pook.post(
+            url="https://esi.evetech.net/universe/names",
+            json=[9997],
+            reply=HTTPStatus.OK,
+            response_json=[
+                {"id": 9997, "name": "Bulk Character", "category": "character"}
+            ],
+        )
+
+        # Test Action
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    EveEntityV2.objects.bulk_resolve_names([9997])
+                    raise DatabaseError("Page failed")
+            except DatabaseError:
+                pass
+
+        # Expected Results
+        self.assertEqual(callbacks, [])
+        self.assertIsNone(cache.get(f"taxsystem-eveentity-{9997}"))
+        self.assertFalse(EveEntityV2.objects.filter(id=9997).exists())
+
+    @pook.on
+    def test_bulk_resolve_names_bisects_invalid_ids(self):
+        """
+        Test should split a rejected ESI request until the invalid ID is isolated.
+
+        Results:
+            1. Valid IDs are resolved and stored.
+            2. The invalid ID is skipped and not requested again.
+        """
+        # Test Data
+        url = "https://esi.evetech.net/universe/names"
+        invalid = {"error": "Ensure all IDs are valid before resolving."}
+        pook.post(
+            url=url,
+            json=[9001, 9002, 9999],
+            reply=HTTPStatus.NOT_FOUND,
+            response_json=invalid,
+        )
+        pook.post(
+            url=url,
+            json=[9001],
+            reply=HTTPStatus.OK,
+            response_json=[{"id": 9001, "name": "Valid 1", "category": "character"}],
+        )
+        pook.post(
+            url=url,
+            json=[9002, 9999],
+            reply=HTTPStatus.NOT_FOUND,
+            response_json=invalid,
+        )
+        pook.post(
+            url=url,
+            json=[9002],
+            reply=HTTPStatus.OK,
+            response_json=[{"id": 9002, "name": "Valid 2", "category": "character"}],
+        )
+        pook.post(
+            url=url, json=[9999], reply=HTTPStatus.NOT_FOUND, response_json=invalid
+        )
+
+        # Test Action
+        with self.captureOnCommitCallbacks(execute=True):
+            resolver = EveEntityV2.objects.bulk_resolve_names([9001, 9002, 9999])
+
+        # Expected Results
+        self.assertEqual(resolver.to_name(9001), "Valid 1")
+        self.assertEqual(resolver.to_name(9002), "Valid 2")
+        self.assertEqual(resolver.to_name(9999), "")
+        self.assertEqual(EveEntityV2.objects.filter(id__in=[9001, 9002]).count(), 2)
+        with self.assertNumQueries(0):
+            EveEntityV2.objects.bulk_resolve_names([9999])
+
+    @patch("taxsystem.tasks.refresh_eve_entities.delay")
+    def test_bulk_resolve_names_refreshes_stale_names(self, mock_refresh):
+        """
+        Test should serve stale names and refresh them in the background.
+
+        Results:
+            1. The stale name is returned.
+            2. A refresh task is queued for the stale ID only.
+        """
+        # Test Data
+        EveEntityFactory(id=1001, name="Old Name")
+        EveEntityFactory(id=1002, name="Fresh Name")
+        EveEntityV2.objects.filter(id=1001).update(
+            last_updated=timezone.now() - timezone.timedelta(days=60)
+        )
+
+        # Test Action
+        resolver = EveEntityV2.objects.bulk_resolve_names([1001, 1002])
+
+        # Expected Results
+        self.assertEqual(resolver.to_name(1001), "Old Name")
+        mock_refresh.assert_called_once_with(ids=[1001])
@@ -1,5 +1,7 @@
 # Standard Library
+from decimal import Decimal
 from http import HTTPStatus
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 # Third Party
@@ -9,7 +11,9 @@ import pook
 from allianceauth.eveonline.models import EveCorporationInfo
 
 # AA TaxSystem
+from taxsystem.managers.eveonline_manager import EveEntityNameResolver
 from taxsystem.models.general import EveEntity
+from taxsystem.models.wallet import CorporationWalletDivision
 from taxsystem.tests import TaxSystemTestCase
 from taxsystem.tests.testdata.factory import (
     CorporationOwnerFactory,
@@ -20,6 +24,8 @@ from taxsystem.tests.testdata.factory import (
 MODULE_PATH = "taxsystem.managers.wallet_manager"
 
 
+# Journal pages are fetched in worker threads, which can not see the test transaction
+@patch("esi.openapi_clients.EsiOperation._validate_token_scopes", MagicMock())
 @patch(MODULE_PATH + ".EveEntity.objects.bulk_resolve_names")
 @patch(MODULE_PATH + ".EveEntity.objects.filter")
 class TestWalletManager(TaxSystemTestCase):
@@ -107,15 +113,10 @@ class TestWalletManager(TaxSystemTestCase):
             ],
         )
         filter_mock = mock_filter.return_value
-        filter_mock.count.return_value = 0
+        filter_mock.values_list.return_value = [entity_2001.id, entity_1001.id]
 
-        mock_entity_bulk.side_effect = [
-            EveEntity.objects.create(
-                id=9998,
-                name="Test Character",
-                category="character",
-            ),
-        ]
+        EveEntity.objects.create(id=9998, name="Test Character", category="character")
+        mock_entity_bulk.return_value = EveEntityNameResolver({9998: "Test Character"})
 
         # Test Action
 
@@ -126,6 +127,10 @@ class TestWalletManager(TaxSystemTestCase):
             set(self.division.ts_corporation_wallet.values_list("entry_id", flat=True)),
             {10, 13, 16},
         )
+        # Only the unknown party of this batch is resolved
+        mock_entity_bulk.assert_called_once_with([9998])
+        self.division.refresh_from_db()
+        self.assertEqual(self.division.journal_last_entry_id, 16)
         obj = self.division.ts_corporation_wallet.get(entry_id=10)
         self.assertEqual(obj.amount, 1000)
         self.assertEqual(obj.context_id, 1)
@@ -138,6 +143,229 @@ class TestWalletManager(TaxSystemTestCase):
         obj = self.division.ts_corporation_wallet.get(entry_id=16)
         self.assertEqual(obj.amount, 10000)
 
+    @pook.on
+    def test_update_wallet_journal_high_water_mark(self, mock_filter, mock_entity_bulk):
+        """
+        Test updating wallet journal entries with an existing high-water mark.
+        This test should verify that only entries newer than the stored mark are written.
+
+        Results:
+            1. Entries at or below the high-water mark are skipped.
+            2. New entries are created and the high-water mark moves forward.
+        """
+        # Test Data
+        division = DivisionFactory(
+            corporation=self.audit,
+            name="Second Division",
+            balance=0,
+            division_id=2,
+            journal_last_entry_id=20,
+        )
+        entity = EveEntityFactory(id=2002)
+        journal = {
+            "amount": 1000,
+            "balance": 2000,
+            "context_id": 1,
+            "context_id_type": "character_id",
+            "date": "2016-10-29T14:00:00Z",
+            "description": "Test Journal",
+            "first_party_id": entity.id,
+            "reason": "Test Reason",
+            "ref_type": "player_donation",
+            "second_party_id": entity.id,
+            "tax": 0,
+            "tax_receiver_id": 0,
+        }
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{self.audit.eve_corporation.corporation_id}/wallets/1/journal",
+            reply=HTTPStatus.NOT_MODIFIED,
+        )
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{self.audit.eve_corporation.corporation_id}/wallets/2/journal",
+            reply=HTTPStatus.OK,
+            response_headers={"X-Pages": "1"},
+            response_json=[
+                {**journal, "id": 19},
+                {**journal, "id": 20},
+                {**journal, "id": 21, "date": "2016-10-30T14:00:00Z"},
+            ],
+        )
+        filter_mock = mock_filter.return_value
+        filter_mock.values_list.return_value = [entity.id]
+
+        # Test Action
+        self.audit.update_wallet(force_refresh=False)
+
+        # Expected Results
+        self.assertSetEqual(
+            set(division.ts_corporation_wallet.values_list("entry_id", flat=True)),
+            {21},
+        )
+        mock_entity_bulk.assert_not_called()
+        division.refresh_from_db()
+        self.assertEqual(division.journal_last_entry_id, 21)
+        self.assertEqual(division.journal_last_date.day, 30)
+
+    @pook.on
+    def test_update_wallet_journal_invalid_party(self, mock_filter, mock_entity_bulk):
+        """
+        Test updating wallet journal entries with a party that ESI can not resolve.
+
+        Results:
+            1. The entry is stored without the unknown party.
+        """
+        # Test Data
+        entity = EveEntityFactory(id=2003)
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{self.audit.eve_corporation.corporation_id}/wallets/1/journal",
+            reply=HTTPStatus.OK,
+            response_headers={"X-Pages": "1"},
+            response_json=[
+                {
+                    "amount": 1000,
+                    "balance": 2000,
+                    "date": "2016-10-29T14:00:00Z",
+                    "description": "Invalid Second Party",
+                    "first_party_id": entity.id,
+                    "id": 30,
+                    "ref_type": "player_donation",
+                    "second_party_id": 9999,
+                }
+            ],
+        )
+        mock_filter.return_value.values_list.return_value = [entity.id]
+        mock_entity_bulk.return_value = EveEntityNameResolver({9999: ""})
+
+        # Test Action
+        self.audit.update_wallet(force_refresh=False)
+
+        # Expected Results
+        obj = self.division.ts_corporation_wallet.get(entry_id=30)
+        self.assertEqual(obj.first_party_id, entity.id)
+        self.assertIsNone(obj.second_party_id)
+
+    @pook.on
+    def test_update_wallet_journal_without_token(self, mock_filter, mock_entity_bulk):
+        """
+        Test updating wallet journal entries without a valid token.
+
+        Results:
+            1. The section reports a token error.
+        """
+        # Test Data
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{self.audit.eve_corporation.corporation_id}/wallets/1/journal",
+            reply=HTTPStatus.FORBIDDEN,
+            response_json={"error": "Token is not valid"},
+        )
+
+        # Test Action
+        with patch.object(self.audit, "get_token", return_value=False):
+            result = self.audit.update_wallet(force_refresh=False)
+
+        # Expected Results
+        self.assertTrue(result.has_token_error)
+        mock_entity_bulk.assert_not_called()
+
+    @pook.on
+    def test_update_wallet_journal_concurrent_pages(
+        self, mock_filter, mock_entity_bulk
+    ):
+        """
+        Test fetching multiple wallet journal pages of multiple divisions concurrently.
+        This test should verify that every page is written and partial ETag hits are refetched.
+
+        Results:
+            1. All pages of all divisions are written.
+            2. A page that hit the ETag while another page changed is fetched again.
+            3. The high-water mark is the newest entry of all pages.
+        """
+        # Test Data
+        division = DivisionFactory(
+            corporation=self.audit,
+            name="Third Division",
+            balance=0,
+            division_id=3,
+        )
+        entity = EveEntityFactory(id=2003)
+        corporation_id = self.audit.eve_corporation.corporation_id
+
+        def journal(entry_id):
+            return {
+                "amount": 1000,
+                "balance": 2000,
+                "context_id": 1,
+                "context_id_type": "character_id",
+                "date": "2016-10-29T14:00:00Z",
+                "description": "Test Journal",
+                "first_party_id": entity.id,
+                "id": entry_id,
+                "reason": "Test Reason",
+                "ref_type": "player_donation",
+                "second_party_id": entity.id,
+                "tax": 0,
+                "tax_receiver_id": 0,
+            }
+
+        # Division 1 :: first page hits the ETag, second page changed
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{corporation_id}/wallets/1/journal",
+            params={"page": "1"},
+            reply=HTTPStatus.NOT_MODIFIED,
+            response_headers={"X-Pages": "2"},
+        )
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{corporation_id}/wallets/1/journal",
+            params={"page": "2"},
+            reply=HTTPStatus.OK,
+            response_headers={"X-Pages": "2"},
+            response_json=[journal(101)],
+        )
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{corporation_id}/wallets/1/journal",
+            params={"page": "1"},
+            reply=HTTPStatus.OK,
+            response_headers={"X-Pages": "2"},
+            response_json=[journal(102)],
+        )
+        # Division 3 :: two changed pages
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{corporation_id}/wallets/3/journal",
+            params={"page": "1"},
+            reply=HTTPStatus.OK,
+            response_headers={"X-Pages": "2"},
+            response_json=[journal(301), journal(302)],
+        )
+        pook.get(
+            url=f"https://esi.evetech.net/corporations/{corporation_id}/wallets/3/journal",
+            params={"page": "2"},
+            reply=HTTPStatus.OK,
+            response_headers={"X-Pages": "2"},
+            response_json=[journal(300)],
+        )
+        filter_mock = mock_filter.return_value
+        filter_mock.values_list.return_value = [entity.id]
+
+        # Test Action
+        self.audit.update_wallet(force_refresh=False)
+
+        # Expected Results
+        self.assertTrue(pook.isdone())
+        self.assertSetEqual(
+            set(
+                self.division.ts_corporation_wallet.filter(
+                    entry_id__gt=100
+                ).values_list("entry_id", flat=True)
+            ),
+            {101, 102},
+        )
+        self.assertSetEqual(
+            set(division.ts_corporation_wallet.values_list("entry_id", flat=True)),
+            {300, 301, 302},
+        )
+        division.refresh_from_db()
+        self.assertEqual(division.journal_last_entry_id, 302)
+
     @pook.on
     def test_update_division_names(self, mock_filter, mock_entity_bulk):
         """
@@ -243,3 +471,48 @@ class TestWalletManager(TaxSystemTestCase):
             division_id=6,
         )
         self.assertEqual(obj.balance, 250000)
+
+    def test_update_divisions_skips_unchanged(self, mock_filter, mock_entity_bulk):
+        """
+        Test writing division balances with one upsert.
+
+        Results:
+            1. New and changed divisions are written with one upsert.
+            2. Unchanged divisions are not written.
+            3. Names are written without touching the balances.
+        """
+        # Test Data
+        wallets = [
+            SimpleNamespace(division=1, balance=1000000),
+            SimpleNamespace(division=2, balance=1500.5),
+        ]
+
+        # Test Action & Expected Results
+        with self.assertNumQueries(2):
+            CorporationWalletDivision.objects._update_or_create_objs(
+                owner=self.audit, objs=wallets
+            )
+        with self.assertNumQueries(1):
+            CorporationWalletDivision.objects._update_or_create_objs(
+                owner=self.audit, objs=wallets
+            )
+
+        CorporationWalletDivision.objects._update_or_create_objs_division(
+            owner=self.audit,
+            objs=[
+                SimpleNamespace(
+                    wallet=[
+                        SimpleNamespace(division=1, name=None),
+                        SimpleNamespace(division=2, name="Rechnungen"),
+                    ]
+                )
+            ],
+        )
+        self.assertEqual(
+            list(
+                self.audit.ts_corporation_division.order_by("division_id").values_list(
+                    "division_id", "name", "balance"
+                )
+            ),
+            [(1, "Master Wallet", 1000000), (2, "Rechnungen", Decimal("1500.50"))],
+        )
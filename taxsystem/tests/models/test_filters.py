@@ -0,0 +1,141 @@
+# AA TaxSystem
+from taxsystem.models.corporation import CorporationFilter, CorporationFilterSet
+from taxsystem.models.helpers.filters import get_filter_engine
+from taxsystem.models.helpers.payments import PaymentApprover
+from taxsystem.models.helpers.textchoices import FilterMatchType, PaymentRequestStatus
+from taxsystem.tests import TaxSystemTestCase
+from taxsystem.tests.testdata.factory import (
+    CorporationFilterFactory,
+    CorporationFilterSetFactory,
+    CorporationOwnerFactory,
+    CorporationPaymentsFactory,
+    CorporationTaxAccountFactory,
+)
+
+MODULE_PATH = "taxsystem.models.helpers.filters"
+
+
+class TestFilterEngine(TaxSystemTestCase):
+    """Test the compiled filter set engine."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = CorporationOwnerFactory(user=cls.user)
+        cls.tax_account = CorporationTaxAccountFactory(
+            name=cls.user_character.character_name,
+            owner=cls.audit,
+            user=cls.user,
+        )
+
+    def _create_filter_set(self, name: str, **filters) -> CorporationFilterSet:
+        filter_set = CorporationFilterSetFactory(
+            owner=self.audit, name=name, enabled=True
+        )
+        for filter_type, (match_type, value) in filters.items():
+            CorporationFilterFactory(
+                filter_set=filter_set,
+                filter_type=filter_type,
+                match_type=match_type,
+                value=value,
+            )
+        return filter_set
+
+    def test_engine_matches_in_memory(self):
+        """
+        Test should match payments with all rules of a filter set.
+
+        Results:
+            1. Match a payment when amount and reason rules match.
+            2. Do not match a payment when only one rule matches.
+        """
+        # Test Data
+        filter_set = self._create_filter_set(
+            "Tax",
+            amount=(FilterMatchType.EXACT, "1000"),
+            reason=(FilterMatchType.CONTAINS, "TAX"),
+        )
+        matching = CorporationPaymentsFactory(
+            account=self.tax_account,
+            owner=self.audit,
+            amount=1000,
+            reason="monthly tax payment",
+        )
+        not_matching = CorporationPaymentsFactory(
+            account=self.tax_account,
+            owner=self.audit,
+            amount=1000,
+            reason="donation",
+        )
+
+        # Test Action
+        matches, hits = get_filter_engine(self.audit).evaluate([matching, not_matching])
+
+        # Expected Results
+        self.assertEqual(matches, {matching.pk: filter_set.pk})
+        self.assertEqual(hits, {filter_set.pk: 1})
+
+    def test_engine_is_cached_until_filter_changes(self):
+        """
+        Test should reuse the compiled filter sets until a filter changes.
+
+        Results:
+            1. Do not query the database for a cached engine.
+            2. Recompile after a filter was added or the filter set was disabled.
+        """
+        # Test Data
+        filter_set = self._create_filter_set(
+            "Amount", amount=(FilterMatchType.EXACT, "1000")
+        )
+        get_filter_engine(self.audit)
+
+        # Test Action & Expected Results
+        with self.assertNumQueries(0):
+            engine = get_filter_engine(self.audit)
+        self.assertEqual(len(engine.filter_sets[0].rules), 1)
+
+        CorporationFilterFactory(
+            filter_set=filter_set,
+            filter_type=CorporationFilter.FilterType.REASON,
+            match_type=FilterMatchType.CONTAINS,
+            value="tax",
+        )
+        self.assertEqual(len(get_filter_engine(self.audit).filter_sets[0].rules), 2)
+
+        filter_set.enabled = False
+        filter_set.save()
+        self.assertFalse(get_filter_engine(self.audit))
+
+    def test_approver_counts_hits_per_filter_set(self):
+        """
+        Test should count the approved payments per filter set.
+
+        Results:
+            1. Approve the matching payments.
+            2. Add the hits to the matching filter set only.
+        """
+        # Test Data
+        filter_set = self._create_filter_set(
+            "Amount", amount=(FilterMatchType.EXACT, "1000")
+        )
+        other_set = self._create_filter_set(
+            "Reason", reason=(FilterMatchType.EXACT, "never")
+        )
+        for _ in range(2):
+            CorporationPaymentsFactory(
+                account=self.tax_account,
+                owner=self.audit,
+                amount=1000,
+                request_status=PaymentRequestStatus.PENDING,
+            )
+
+        # Test Action
+        result = PaymentApprover(self.audit).run()
+
+        # Expected Results
+        self.assertEqual(result.approved, 2)
+        self.assertEqual(result.hits, {filter_set.pk: 2})
+        filter_set.refresh_from_db()
+        other_set.refresh_from_db()
+        self.assertEqual(filter_set.hits, 2)
+        self.assertEqual(other_set.hits, 0)
@@ -1,11 +1,21 @@
+# Standard Library
+from http import HTTPStatus
+from unittest.mock import Mock
+
+# Third Party
+import pook
+
 # Django
 from django.test import TestCase
 
 # Alliance Auth
 from allianceauth.tests.auth_utils import AuthUtils
+from esi.errors import TokenError
 
 # AA TaxSystem
+from taxsystem.helpers.cache import token_cache_counter
 from taxsystem.models.corporation import CorporationOwner
+from taxsystem.models.helpers.textchoices import CorporationUpdateSection
 from taxsystem.tests import TaxSystemTestCase
 from taxsystem.tests.testdata.factory import CorporationOwnerFactory
 
@@ -88,3 +98,41 @@ class TestOwnerAuditModel(TaxSystemTestCase):
         corporation = CorporationOwner.objects.manage_to(self.user)
         self.assertIn(self.audit, corporation)
         self.assertIn(self.audit2, corporation)
+
+    @pook.on
+    def test_get_token_is_cached(self):
+        """
+        Test should reuse the last token with the required roles.
+
+        Results:
+            1. The roles are requested from ESI only once.
+            2. The hit and miss counters are updated.
+            3. A token error drops the cached token.
+        """
+        # Test Data
+        pook.get(
+            url=f"https://esi.evetech.net/characters/{self.user_character.character_id}/roles",
+            reply=HTTPStatus.OK,
+            response_json={"roles": ["Director"]},
+            times=2,
+        )
+        scopes = ["esi-wallet.read_corporation_wallets.v1"]
+        token_cache_counter.reset()
+
+        # Test Action
+        token = self.audit.get_token(scopes=scopes, req_roles=["Director"])
+        cached_token = self.audit.get_token(scopes=scopes, req_roles=["Director"])
+
+        # Expected Results
+        self.assertTrue(token)
+        self.assertEqual(token, cached_token)
+        self.assertEqual(token_cache_counter.stats(), {"hits": 1, "misses": 1})
+
+        with self.assertRaises(TokenError):
+            self.audit.update_manager.perform_update_status(
+                CorporationUpdateSection.WALLET, Mock(side_effect=TokenError)
+            )
+        self.assertEqual(
+            self.audit.get_token(scopes=scopes, req_roles=["Director"]), token
+        )
+        self.assertEqual(token_cache_counter.stats(), {"hits": 1, "misses": 2})
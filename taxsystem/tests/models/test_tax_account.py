@@ -133,3 +133,41 @@ class TestPaymentSystemModel(TaxSystemTestCase):
 
         tax_account.refresh_from_db()
         self.assertTrue(tax_account.has_notified)
+
+    def test_payment_state(self):
+        """
+        Test should persist the payment state on save.
+
+        Results:
+            1. next_due and paid_until are calculated from last_paid and the tax period.
+            2. next_notification_at is calculated from last_notification.
+            3. next_due is cleared for deactivated accounts and paid_until for negative deposits.
+        """
+        # Test Data
+        tax_account = CorporationPaymentAccount.objects.get(owner=self.audit)
+        last_paid = timezone.now() - timezone.timedelta(days=5)
+        tax_account.last_paid = last_paid
+        tax_account.last_notification = last_paid
+
+        # Test Action
+        tax_account.save()
+
+        # Expected Results
+        tax_account.refresh_from_db()
+        period_end = last_paid + timezone.timedelta(days=self.audit.tax_period)
+        self.assertEqual(tax_account.next_due, period_end)
+        self.assertEqual(tax_account.paid_until, period_end)
+        self.assertIsNotNone(tax_account.next_notification_at)
+        self.assertTrue(
+            CorporationPaymentAccount.objects.filter(
+                CorporationPaymentAccount.get_paid_filter(), pk=tax_account.pk
+            ).exists()
+        )
+
+        tax_account.status = AccountStatus.DEACTIVATED
+        tax_account.deposit = -1
+        tax_account.save(update_fields=["status", "deposit"])
+
+        tax_account.refresh_from_db()
+        self.assertIsNone(tax_account.next_due)
+        self.assertIsNone(tax_account.paid_until)
@@ -5,18 +5,25 @@ from http import HTTPStatus
 from unittest.mock import Mock, patch
 
 # Django
+from django.contrib.auth.models import AnonymousUser
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # AA TaxSystem
 from taxsystem import views
 
 # AA Taxsystem
-from taxsystem.models.helpers.textchoices import AccountStatus
+from taxsystem.helpers.instrumentation import Measurement
+from taxsystem.models.corporation import CorporationOwner
+from taxsystem.models.general import MetricRollup
+from taxsystem.models.helpers.textchoices import AccountStatus, PaymentRequestStatus
 from taxsystem.tests import TaxSystemTestCase
 from taxsystem.tests.testdata.factory import (
     CorporationOwnerFactory,
+    CorporationPaymentsFactory,
     CorporationTaxAccountFactory,
     UserMainFactory,
 )
@@ -57,6 +64,41 @@ class TestViewAccess(TaxSystemTestCase):
         # then
         self.assertEqual(response.status_code, HTTPStatus.OK)
 
+    def test_index_queries_do_not_grow_with_owners(self):
+        """
+        Test that the index page runs a constant number of queries.
+
+        Results:
+            1. Adding an owner with open invoices does not add queries.
+            2. Open invoices are annotated per owner.
+        """
+        # given
+        request = self.factory.get(reverse("taxsystem:index"))
+        request.user = self.superuser
+        views.index(request)
+        with CaptureQueriesContext(connection) as queries:
+            views.index(request)
+        owner = CorporationOwnerFactory(user=UserMainFactory())
+        CorporationPaymentsFactory(
+            account=CorporationTaxAccountFactory(owner=owner, user=UserMainFactory()),
+            owner=owner,
+            request_status=PaymentRequestStatus.PENDING,
+        )
+        # The payment dropped the cached menu badge
+        views.index(request)
+        # when
+        with CaptureQueriesContext(connection) as queries_more_owners:
+            response = views.index(request)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(queries_more_owners), len(queries))
+        self.assertEqual(
+            CorporationOwner.objects.annotate_open_invoices()
+            .get(pk=owner.pk)
+            .open_invoices,
+            1,
+        )
+
     def test_should_access_manage_owner(self):
         """Test that a user with 'manage_own_corp' can manage own corporation."""
         # given
@@ -430,3 +472,56 @@ class TestViewAccess(TaxSystemTestCase):
         # then
         self.assertEqual(response.status_code, HTTPStatus.FOUND)
         mock_messages.error.assert_called_with(request, "Permission Denied.")
+
+    def test_should_access_admin_with_metrics(self):
+        """Test that a superuser sees the worker time of the owners on the admin page."""
+        # given
+        MetricRollup.objects.record(
+            Measurement(name="section.wallet", owner_id=self.audit.eve_id, duration=1.5)
+        )
+        self.client.force_login(self.superuser)
+        # when
+        response = self.client.get(reverse("taxsystem:admin"))
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        metric = response.context["metrics"][0]
+        self.assertEqual(metric["name"], "section.wallet")
+        self.assertEqual(metric["owner_name"], self.audit.name)
+        self.assertContains(response, "section.wallet")
+
+    @patch(INDEX_PATH + ".TAXSYSTEM_METRICS_TOKEN", "secret")
+    def test_metrics_access(self):
+        """
+        Test the access to the Prometheus metrics.
+
+        Results:
+            1. A user without superuser rights is denied.
+            2. A non-ASCII authorization header is denied.
+            3. The bearer token grants access without a login.
+            4. A superuser can access the metrics.
+        """
+        # given
+        url = reverse("taxsystem:metrics")
+        MetricRollup.objects.record(
+            Measurement(name="api.get_payments", owner_id=self.audit.eve_id)
+        )
+        # when & then
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.FORBIDDEN)
+        self.assertEqual(
+            self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code,
+            HTTPStatus.FORBIDDEN,
+        )
+
+        request = self.factory.get(url, HTTP_AUTHORIZATION="Bearer sécret")
+        request.user = AnonymousUser()
+        self.assertEqual(views.metrics(request).status_code, HTTPStatus.FORBIDDEN)
+
+        request = self.factory.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        request.user = AnonymousUser()
+        response = views.metrics(request)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'taxsystem_runs{name="api.get_payments"')
+
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.OK)
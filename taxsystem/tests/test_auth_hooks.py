@@ -0,0 +1,141 @@
+"""Test the Alliance Auth hooks."""
+
+# AA TaxSystem
+from taxsystem.auth_hooks import TaxSystemMenuItem
+from taxsystem.models.corporation import (
+    CorporationPaymentAccount,
+    CorporationUpdateStatus,
+)
+from taxsystem.models.general import UpdateSectionResult
+from taxsystem.models.helpers.payments import PaymentDeadlineProcessor
+from taxsystem.models.helpers.textchoices import (
+    AccountStatus,
+    CorporationUpdateSection,
+    PaymentRequestStatus,
+)
+from taxsystem.models.helpers.updater import UpdateManager
+from taxsystem.tests import TaxSystemTestCase
+from taxsystem.tests.testdata.factory import (
+    CorporationOwnerFactory,
+    CorporationPaymentsFactory,
+    CorporationTaxAccountFactory,
+    UserMainFactory,
+)
+
+MODULE_PATH = "taxsystem.auth_hooks"
+
+
+class TestMenuItem(TaxSystemTestCase):
+    """Test the TaxSystem menu item badge."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = CorporationOwnerFactory(user=cls.user)
+        cls.tax_account = CorporationTaxAccountFactory(
+            name=cls.user_character.character_name,
+            owner=cls.audit,
+            user=cls.user,
+            status=AccountStatus.ACTIVE,
+            deposit=-1000,
+            last_paid=None,
+        )
+
+    def _render(self, user) -> TaxSystemMenuItem:
+        request = self.factory.get("/")
+        request.user = user
+        menu_item = TaxSystemMenuItem()
+        menu_item.render(request)
+        return menu_item
+
+    def test_render_caches_badge_count(self):
+        """
+        Test should cache the badge count per user.
+
+        Results:
+            1. Count an unpaid tax account.
+            2. Do not query the database for a cached count.
+            3. Recalculate the count after the tax account changed.
+        """
+        # Test Data
+        request = self.factory.get("/")
+        request.user = self.user
+        menu_item = TaxSystemMenuItem()
+        menu_item.render(request)
+
+        # Test Action & Expected Results
+        self.assertEqual(menu_item.count, 1)
+        with self.assertNumQueries(0):
+            menu_item.render(request)
+        self.assertEqual(menu_item.count, 1)
+
+        tax_account = CorporationPaymentAccount.objects.get(pk=self.tax_account.pk)
+        tax_account.deposit = tax_account.owner.tax_amount
+        tax_account.save()
+        self.assertEqual(self._render(self.user).count, 0)
+
+    def test_render_counts_open_invoices(self):
+        """
+        Test should count the visible open invoices of managers.
+
+        Results:
+            1. Count the open invoices of the managed corporation.
+            2. Recalculate the count after a payment changed.
+        """
+        # Test Data
+        manager = UserMainFactory(
+            permissions__=[
+                "taxsystem.basic_access",
+                "taxsystem.manage_own_corp",
+            ]
+        )
+        manager_audit = CorporationOwnerFactory(user=manager)
+        manager_account = CorporationTaxAccountFactory(
+            name=manager.profile.main_character.character_name,
+            owner=manager_audit,
+            user=manager,
+            deposit=manager_audit.tax_amount,
+        )
+        payment = CorporationPaymentsFactory(
+            account=manager_account,
+            owner=manager_audit,
+            request_status=PaymentRequestStatus.PENDING,
+        )
+
+        # Test Action & Expected Results
+        self.assertEqual(self._render(manager).count, 1)
+
+        payment.request_status = PaymentRequestStatus.APPROVED
+        payment.save()
+        self.assertEqual(self._render(manager).count, 0)
+
+    def test_render_keeps_badge_on_status_log(self):
+        """
+        Test should only recalculate the badge count when accounts change.
+
+        Results:
+            1. Writing the update status of a section keeps the cached count.
+            2. Charging the tax accounts recalculates the count.
+        """
+        # Test Data
+        request = self.factory.get("/")
+        request.user = self.user
+        menu_item = TaxSystemMenuItem()
+        menu_item.render(request)
+        manager = UpdateManager(
+            owner=self.audit,
+            update_section=CorporationUpdateSection,
+            update_status=CorporationUpdateStatus,
+        )
+
+        # Test Action & Expected Results
+        manager.update_section_log(
+            section=CorporationUpdateSection.PAYMENTS,
+            result=UpdateSectionResult(is_changed=True, is_updated=True),
+        )
+        with self.assertNumQueries(0):
+            menu_item.render(request)
+
+        PaymentDeadlineProcessor(self.audit).run()
+        with self.assertNumQueries(1):
+            menu_item.render(request)
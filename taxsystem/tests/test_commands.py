@@ -1,11 +1,13 @@
 # Standard Library
+import csv
 from io import StringIO
 
 # Django
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.utils import timezone
 
 # AA TaxSystem
+from taxsystem.models.corporation import CorporationPaymentAccount
 from taxsystem.models.helpers.textchoices import AccountStatus, PaymentRequestStatus
 
 # AA Tax System
@@ -60,3 +62,93 @@ class TestMigratePayments(TaxSystemTestCase):
             f"Migration report for {self.audit.eve_corporation.corporation_name}: 1 entries migrated.",
             output,
         )
+
+
+class TestBackfillPaymentState(TaxSystemTestCase):
+    """Test Tax System Payment State Backfill Command."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = CorporationOwnerFactory(user=cls.user, tax_period=30)
+        cls.last_paid = timezone.now() - timezone.timedelta(days=10)
+        cls.tax_account = CorporationTaxAccountFactory(
+            name=cls.user_character.character_name,
+            owner=cls.audit,
+            user=cls.user,
+            status=AccountStatus.ACTIVE,
+            deposit=0,
+            last_paid=cls.last_paid,
+        )
+
+    def test_should_backfill(self):
+        """
+        Test should calculate the payment state of existing accounts.
+
+        Results:
+            1. Dry run does not change the account.
+            2. The payment state is written from last_paid and the tax period.
+        """
+        # Test Data
+        CorporationPaymentAccount.objects.filter(pk=self.tax_account.pk).update(
+            next_due=None, paid_until=None
+        )
+        out = StringIO()
+
+        # Test Action
+        call_command("taxsystem_backfill_payment_state", "--dry-run", stdout=out)
+        self.assertIn(
+            "Would update the payment state of 1 tax account(s)", out.getvalue()
+        )
+        self.assertIsNone(
+            CorporationPaymentAccount.objects.get(pk=self.tax_account.pk).next_due
+        )
+
+        call_command("taxsystem_backfill_payment_state", stdout=out)
+
+        # Expected Result
+        self.assertIn(
+            "Successfully updated the payment state of 1 tax account(s)", out.getvalue()
+        )
+        account = CorporationPaymentAccount.objects.get(pk=self.tax_account.pk)
+        expected = self.last_paid + timezone.timedelta(days=30)
+        self.assertEqual(account.next_due, expected)
+        self.assertEqual(account.paid_until, expected)
+        self.assertIsNone(account.next_notification_at)
+
+
+class TestExport(TaxSystemTestCase):
+    """Test Tax System Export Command."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = CorporationOwnerFactory(user=cls.user)
+        cls.division = DivisionFactory(corporation=cls.audit)
+        cls.journal_entries = [
+            CorporationJournalFactory(division=cls.division) for _ in range(3)
+        ]
+
+    def test_should_export(self):
+        """
+        Test should write the wallet journal of an owner as CSV.
+
+        Results:
+            1. Every journal entry is exported with a header line.
+            2. An unknown owner raises an error.
+        """
+        # Test Data
+        out = StringIO()
+
+        # Test Action
+        call_command("taxsystem_export", "journal", self.audit.eve_id, stdout=out)
+
+        # Expected Result
+        rows = list(csv.DictReader(out.getvalue().splitlines()))
+        self.assertEqual(
+            sorted(int(row["entry_id"]) for row in rows),
+            sorted(entry.entry_id for entry in self.journal_entries),
+        )
+
+        with self.assertRaises(CommandError):
+            call_command("taxsystem_export", "journal", 1, stdout=out)
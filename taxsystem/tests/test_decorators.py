@@ -1,30 +1,174 @@
+# Standard Library
+from unittest.mock import Mock, patch
+
+# Django
+from django.urls import reverse
+from django.utils import timezone
+
 # Alliance Auth
-from allianceauth.services.hooks import get_extension_logger
+from esi.signals import esi_request_statistics
 
 # AA TaxSystem
-from taxsystem import __title__
-from taxsystem.decorators import (
-    log_timing,
+from taxsystem.decorators import instrument
+from taxsystem.helpers.instrumentation import (
+    Measurement,
+    measure,
+    render_prometheus,
 )
-from taxsystem.providers import AppLogger
-from taxsystem.tests import NoSocketsTestCase
+from taxsystem.models.general import EveEntity, MetricRollup
+from taxsystem.tests import NoSocketsTestCase, TaxSystemTestCase
+from taxsystem.tests.testdata.factory import CorporationOwnerFactory
 
-DECORATOR_PATH = "taxsystem.decorators."
+INSTRUMENTATION_PATH = "taxsystem.helpers.instrumentation"
 
 
+@patch(INSTRUMENTATION_PATH + ".get_sinks")
 class TestDecorators(NoSocketsTestCase):
-    def test_log_timing(self):
+    def test_instrument(self, mock_get_sinks):
         """
-        Test should log execution time of decorated function.
+        Test should measure each call of the decorated function.
         """
         # given
-        logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
+        sink = Mock()
+        mock_get_sinks.return_value = [sink]
+
+        @instrument()
+        def trigger_instrument(owner_id: int):
+            return "Instrument"
+
+        # when
+        result = trigger_instrument(owner_id=98000001)
+        # then
+        self.assertEqual(result, "Instrument")
+        measurement = sink.emit.call_args.args[0]
+        self.assertEqual(measurement.name, "trigger_instrument")
+        self.assertEqual(measurement.owner_id, 98000001)
+        self.assertTrue(measurement.is_success)
 
-        @log_timing(logger)
-        def trigger_log_timing():
-            return "Log Timing"
 
+class TestInstrumentOperation(TaxSystemTestCase):
+    def test_api_operation_is_measured(self):
+        """
+        Test should add API requests to the rollup of their operation and owner.
+
+        Results:
+            1. API requests are not stored by default.
+            2. API requests are stored when the api prefix is not excluded.
+        """
+        # given
+        audit = CorporationOwnerFactory(user=self.user)
+        self.client.force_login(self.superuser)
+        url = reverse("taxsystem:api:get_admin_history", args=[audit.eve_id])
+        # when
+        self.client.get(url)
+        # then
+        self.assertFalse(MetricRollup.objects.exists())
         # when
-        result = trigger_log_timing()
+        with patch(INSTRUMENTATION_PATH + ".TAXSYSTEM_METRICS_DATABASE_EXCLUDE", []):
+            self.client.get(url)
         # then
-        self.assertEqual(result, "Log Timing")
+        rollup = MetricRollup.objects.get(name="api.get_admin_history")
+        self.assertEqual(rollup.owner_id, audit.eve_id)
+        self.assertEqual(rollup.runs, 1)
+        self.assertGreater(rollup.queries, 0)
+
+
+@patch(INSTRUMENTATION_PATH + ".get_sinks")
+class TestInstrumentation(NoSocketsTestCase):
+    def test_measure(self, mock_get_sinks):
+        """
+        Test should count queries, written rows and ESI calls of a measured block.
+
+        # Test Scenarios:
+            1. Queries and the written rows of the measuring thread are counted.
+            2. Only ESI requests that were not answered from the cache are counted.
+        """
+        # Test Data
+        sink = Mock()
+        mock_get_sinks.return_value = [sink]
+
+        # Test Action
+        with measure("section.test", owner_id=1) as measurement:
+            EveEntity.objects.bulk_create(
+                [
+                    EveEntity(id=1, name="One", category="character"),
+                    EveEntity(id=2, name="Two", category="character"),
+                ]
+            )
+            list(EveEntity.objects.all())
+            esi_request_statistics.send(sender=None, status_code=200, headers={})
+            esi_request_statistics.send(sender=None, status_code=0, headers={})
+
+        # Expected Result
+        sink.emit.assert_called_once_with(measurement)
+        self.assertEqual(measurement.queries, 2)
+        self.assertEqual(measurement.rows_written, 2)
+        self.assertEqual(measurement.esi_calls, 1)
+        self.assertTrue(measurement.is_success)
+        self.assertGreater(measurement.duration, 0)
+
+    def test_measure_failure(self, mock_get_sinks):
+        """
+        Test should record failed runs and ignore failing sinks.
+
+        # Test Scenarios:
+            1. An exception marks the measurement as failed and is raised.
+            2. A failing sink does not stop the other sinks.
+        """
+        # Test Data
+        failing_sink = Mock()
+        failing_sink.emit.side_effect = RuntimeError("Sink down")
+        sink = Mock()
+        mock_get_sinks.return_value = [failing_sink, sink]
+
+        # Test Action
+        with self.assertRaises(ValueError):
+            with measure("section.test"):
+                raise ValueError("Update failed")
+
+        # Expected Result
+        measurement = sink.emit.call_args.args[0]
+        self.assertFalse(measurement.is_success)
+
+    def test_database_sink(self, mock_get_sinks):
+        """
+        Test should sum the measurements of a name and owner per hour.
+
+        # Test Scenarios:
+            1. Two measurements are added to one rollup.
+            2. The summary renders as Prometheus text.
+        """
+        # Test Data
+        mock_get_sinks.return_value = []
+
+        # Test Action
+        MetricRollup.objects.record(
+            Measurement(name="section.wallet", owner_id=1, duration=2.0, queries=3)
+        )
+        MetricRollup.objects.record(
+            Measurement(
+                name="section.wallet",
+                owner_id=1,
+                duration=1.0,
+                esi_calls=4,
+                is_success=False,
+            )
+        )
+
+        # Expected Result
+        rollup = MetricRollup.objects.get()
+        self.assertEqual(rollup.runs, 2)
+        self.assertEqual(rollup.errors, 1)
+        self.assertEqual(rollup.duration, 3.0)
+        self.assertEqual(rollup.max_duration, 2.0)
+        self.assertEqual(rollup.queries, 3)
+        self.assertEqual(rollup.esi_calls, 4)
+
+        summary = MetricRollup.objects.summary(
+            timezone.now() - timezone.timedelta(hours=1)
+        )
+        text = render_prometheus(summary, {1: 'Corp "One"'})
+        self.assertIn(
+            'taxsystem_duration_seconds{name="section.wallet",owner_id="1",owner="Corp \\"One\\""} 3.0',
+            text,
+        )
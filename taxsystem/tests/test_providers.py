@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch
 from aiopenapi3 import RequestError
 
 # Django
+from django.core.cache import cache
 from django.test import override_settings
 from django.utils import timezone
 
@@ -20,7 +21,12 @@ from esi.exceptions import (
 
 # AA TaxSystem
 from taxsystem.errors import DownTimeError
-from taxsystem.providers import retry_task_on_esi_error
+from taxsystem.providers import (
+    get_esi_budget,
+    get_esi_error_limit_reset,
+    record_esi_budget,
+    retry_task_on_esi_error,
+)
 from taxsystem.tests import NoSocketsTestCase
 
 MODULE_PATH = "taxsystem.providers"
@@ -314,3 +320,50 @@ class TestRetryTaskOnESIError(NoSocketsTestCase):
                 str(call_kwargs["exc"]), str(DownTimeError("ESI is in daily downtime"))
             )
             self.assertEqual(call_kwargs["countdown"], 603)
+
+
+class TestESIBudget(NoSocketsTestCase):
+    """Tests for the ESI budget tracking."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_should_track_lowest_budget(self):
+        """
+        Test should remember the lowest remaining ESI budget.
+
+        Results:
+        - The budget is full when no response was seen.
+        - The lowest of the error and rate limit budget is returned.
+        - A reached error limit exhausts the budget.
+        """
+        # Test Action & Expected Result
+        self.assertEqual(get_esi_budget(), 1.0)
+
+        record_esi_budget(
+            {
+                "X-ESI-Error-Limit-Remain": "80",
+                "X-Ratelimit-Remaining": "50",
+                "X-Ratelimit-Limit": "200/15m",
+            }
+        )
+        self.assertEqual(get_esi_budget(), 0.25)
+
+        cache.set("esi_error_limit_reset", 30, 30)
+        self.assertEqual(get_esi_budget(), 0.0)
+        self.assertEqual(get_esi_error_limit_reset(), 30)
+
+    def test_should_ignore_invalid_headers(self):
+        """
+        Test should ignore responses without valid budget headers.
+
+        Results:
+        - The budget stays full.
+        """
+        # Test Action
+        record_esi_budget(None)
+        record_esi_budget({"X-Ratelimit-Remaining": "x", "X-Ratelimit-Limit": "0/1m"})
+
+        # Expected Result
+        self.assertEqual(get_esi_budget(), 1.0)
@@ -1,24 +1,32 @@
 """Tests for the providers module."""
 
 # Standard Library
+from decimal import Decimal
 from unittest.mock import MagicMock, PropertyMock, patch
 
+# Third Party
+from celery.exceptions import Retry
+
 # Django
 from django.test import override_settings
 from django.utils import timezone
 
+# Alliance Auth
+from esi.exceptions import HTTPServerError
+
 # AA TaxSystem
+from taxsystem import app_settings
 from taxsystem.models.alliance import AllianceUpdateStatus
 from taxsystem.models.corporation import CorporationUpdateStatus
 from taxsystem.models.general import UpdateSectionResult
 from taxsystem.tasks import (
-    _send_alliance_notification,
-    _send_corporation_notification,
+    _send_notification_digests,
     _update_ally_section,
     _update_corp_section,
     check_account_deposit,
     update_all_taxsytem,
     update_alliance,
+    update_corp_pipeline,
     update_corporation,
 )
 from taxsystem.tests import TaxSystemTestCase
@@ -29,6 +37,7 @@ from taxsystem.tests.testdata.factory import (
     CorporationOwnerFactory,
     CorporationTaxAccountFactory,
     CorporationUpdateStatusFactory,
+    UserMainFactory,
 )
 
 TASKS_PATH = "taxsystem.tasks"
@@ -66,6 +75,75 @@ class TestTasks(TaxSystemTestCase):
         self.assertTrue(mock_update_corporation.apply_async.called)
         self.assertTrue(mock_update_alliance.apply_async.called)
 
+    @patch(TASKS_PATH + ".get_esi_budget")
+    @patch(TASKS_PATH + ".update_corporation", spec=True)
+    @patch(TASKS_PATH + ".update_alliance", spec=True)
+    @patch(TASKS_PATH + ".CorporationUpdateSection.get_sections", lambda: ["wallet"])
+    def test_update_all_taxsystem_staggered(
+        self,
+        mock_update_alliance: MagicMock,
+        mock_update_corporation: MagicMock,
+        mock_get_esi_budget: MagicMock,
+    ):
+        """
+        Test 'update_all_taxsytem' task spreads the owner updates.
+
+        # Test Scenarios:
+            1. Owners without due sections are not queued.
+            2. Updates are spread over the shortest stale window.
+            3. A low ESI budget spaces the updates further apart.
+            4. Updates that do not fit into the stale window are deferred.
+        """
+        # Test Data
+        mock_get_esi_budget.return_value = 1.0
+        owners = [
+            CorporationOwnerFactory(user=user)
+            for user in (self.user, self.superuser, UserMainFactory())
+        ]
+        CorporationUpdateStatusFactory(
+            owner=owners[2],
+            section="wallet",
+            is_success=True,
+            last_run_at=timezone.now(),
+            last_run_finished_at=timezone.now(),
+            last_update_at=timezone.now(),
+            last_update_finished_at=timezone.now(),
+        )
+        window = min(app_settings.TAXSYSTEM_STALE_TYPES.values()) * 60
+
+        # Test Action
+        update_all_taxsytem(force_refresh=False)
+
+        # Expected Result
+        mock_update_alliance.apply_async.assert_not_called()
+        calls = mock_update_corporation.apply_async.call_args_list
+        self.assertEqual(
+            [call.kwargs["args"] for call in calls],
+            [[owners[0].eve_id], [owners[1].eve_id]],
+        )
+        self.assertEqual([call.kwargs["countdown"] for call in calls], [0, window // 2])
+
+        # Scenario 3: Three quarters of the ESI budget are left
+        mock_update_corporation.reset_mock()
+        mock_get_esi_budget.return_value = 0.75
+
+        update_all_taxsytem(force_refresh=False)
+
+        calls = mock_update_corporation.apply_async.call_args_list
+        self.assertEqual(
+            [call.kwargs["countdown"] for call in calls], [0, int(window / 1.5)]
+        )
+
+        # Scenario 4: Half of the ESI budget is left
+        mock_update_corporation.reset_mock()
+        mock_get_esi_budget.return_value = 0.5
+
+        update_all_taxsytem(force_refresh=False)
+
+        calls = mock_update_corporation.apply_async.call_args_list
+        self.assertEqual([call.kwargs["args"] for call in calls], [[owners[0].eve_id]])
+        self.assertEqual([call.kwargs["countdown"] for call in calls], [0])
+
     @patch(TASKS_PATH + ".logger")
     @patch(TASKS_PATH + ".update_corp_wallet")
     @patch(TASKS_PATH + ".CorporationUpdateSection.get_sections", lambda: ["wallet"])
@@ -167,6 +245,110 @@ class TestTasks(TaxSystemTestCase):
         self.assertEqual(new_update_status.has_token_error, False)
         self.assertEqual(new_update_status.is_success, True)
 
+    @patch(TASKS_PATH + ".app_settings.TAXSYSTEM_UPDATE_PIPELINE", True)
+    @patch(TASKS_PATH + ".update_corp_pipeline")
+    @patch(
+        TASKS_PATH + ".CorporationUpdateSection.get_sections",
+        lambda: ["wallet", "members"],
+    )
+    def test_update_corporation_pipeline(self, mock_update_corp_pipeline: MagicMock):
+        """
+        Test 'update_corporation' task in pipeline mode.
+
+        # Test Scenarios:
+            1. Task queues one pipeline task with the due sections only.
+        """
+        # Test Data
+        owner = CorporationOwnerFactory(user=self.user)
+        CorporationUpdateStatusFactory(
+            owner=owner,
+            section="wallet",
+            is_success=True,
+            last_run_at=timezone.now(),
+            last_run_finished_at=timezone.now(),
+            last_update_at=timezone.now(),
+            last_update_finished_at=timezone.now(),
+        )
+
+        # Test Action
+        update_corporation(owner_eve_id=owner.eve_id, force_refresh=False)
+
+        # Expected Result
+        mock_update_corp_pipeline.apply_async.assert_called_once_with(
+            kwargs={
+                "owner_eve_id": owner.eve_id,
+                "sections": ["members"],
+                "force_refresh": False,
+            },
+            priority=7,
+        )
+
+    @patch(MODELS_PATH + ".corporation.CorporationOwner.update_members")
+    @patch(MODELS_PATH + ".corporation.CorporationOwner.update_wallet")
+    def test_update_corp_pipeline(
+        self, mock_update_wallet: MagicMock, mock_update_members: MagicMock
+    ):
+        """
+        Test 'update_corp_pipeline' task.
+
+        # Test Scenarios:
+            1. All sections run and their status is written.
+            2. The last update time is kept for sections without changes.
+            3. An ESI error retries the task with the failed and remaining sections.
+        """
+        # Test Data
+        owner = CorporationOwnerFactory(user=self.user)
+        last_update = timezone.now() - timezone.timedelta(days=1)
+        CorporationUpdateStatusFactory(
+            owner=owner,
+            section="members",
+            is_success=True,
+            last_update_at=last_update,
+            last_update_finished_at=last_update,
+        )
+        mock_update_wallet.return_value = UpdateSectionResult(
+            is_changed=True, is_updated=True
+        )
+        mock_update_members.return_value = UpdateSectionResult(
+            is_changed=False, is_updated=False
+        )
+
+        # Test Action
+        update_corp_pipeline(
+            owner_eve_id=owner.eve_id,
+            sections=["wallet", "members"],
+            force_refresh=False,
+        )
+
+        # Expected Results
+        wallet = CorporationUpdateStatus.objects.get(owner=owner, section="wallet")
+        self.assertTrue(wallet.is_success)
+        self.assertIsNotNone(wallet.last_update_finished_at)
+        members = CorporationUpdateStatus.objects.get(owner=owner, section="members")
+        self.assertTrue(members.is_success)
+        self.assertIsNotNone(members.last_run_finished_at)
+        self.assertEqual(members.last_update_at, last_update)
+
+        # Scenario 3: ESI is down during the second section
+        mock_update_members.side_effect = HTTPServerError(502, {}, None)
+        with patch.object(
+            update_corp_pipeline, "retry", side_effect=Retry()
+        ) as mock_retry:
+            with self.assertRaises(Retry):
+                update_corp_pipeline(
+                    owner_eve_id=owner.eve_id,
+                    sections=["wallet", "members"],
+                    force_refresh=False,
+                )
+        self.assertEqual(
+            mock_retry.call_args.kwargs["kwargs"],
+            {
+                "owner_eve_id": owner.eve_id,
+                "sections": ["members"],
+                "force_refresh": False,
+            },
+        )
+
     @patch(TASKS_PATH + ".logger")
     @patch(TASKS_PATH + ".update_ally_deadlines")
     @patch(TASKS_PATH + ".AllianceUpdateSection.get_sections", lambda: ["deadlines"])
@@ -269,81 +451,149 @@ class TestTasks(TaxSystemTestCase):
         self.assertEqual(new_update_status.has_token_error, False)
         self.assertEqual(new_update_status.is_success, True)
 
-    @patch(TASKS_PATH + "._send_corporation_notification", return_value=None)
-    @patch(TASKS_PATH + "._send_alliance_notification", return_value=None)
+    @patch(TASKS_PATH + "._send_notification_digests")
     @patch(TASKS_PATH + ".logger")
     def test_check_accounts_deposit(
         self,
         mock_logger,
-        mock_send_alliance_notification,
-        mock_send_corporation_notification,
+        mock_send_digests,
     ):
         """
         Test the deposit check for tax accounts.
 
         Results:
-            - Sent notifications for accounts with insufficient deposit.
+            - One digest per user with the overdue accounts of all owners.
+            - Paid and already notified accounts are skipped.
+            - last_notification is set once the digest was sent.
         """
         # Test Data
-        audit = AllianceOwnerFactory(user=self.user)
-
-        AllianceTaxAccountFactory(
-            owner=audit, name="Test Account", user=self.user, deposit=-1000
-        )
-        # Test Action
-        check_account_deposit()
-
-        # Expected Result
-        mock_logger.info.assert_called_with(
-            "Queued %s notification tasks for overdue payments", 2
+        alliance_audit = AllianceOwnerFactory(user=self.user)
+        corporation_audit = alliance_audit.corporation
+        alliance_account = AllianceTaxAccountFactory(
+            owner=alliance_audit,
+            name="Test Account",
+            user=self.user,
+            deposit=-1000,
+            status="active",
         )
-
-    @patch(TASKS_PATH + ".send_user_notification")
-    def test_send_corporation_notification(self, mock_send):
-        """
-        Test sending corporation notification.
-
-        Results:
-            - Corporation notification is sent correctly.
-        """
-        # Test Data
-        audit = CorporationOwnerFactory(user=self.user)
-        CorporationTaxAccountFactory(
-            owner=audit,
+        corporation_account = CorporationTaxAccountFactory(
+            owner=corporation_audit,
             name="Test Account",
             user=self.user,
+            deposit=-500,
+            status="active",
+        )
+        other_user = UserMainFactory()
+        notified_account = CorporationTaxAccountFactory(
+            owner=CorporationOwnerFactory(user=other_user),
+            name="Notified Account",
+            user=other_user,
             deposit=-1000,
             status="active",
+            last_notification=timezone.now(),
         )
 
         # Test Action
-        _send_corporation_notification(
-            owner_eve_id=audit.eve_corporation.corporation_id
-        )
+        check_account_deposit()
 
         # Expected Result
-        mock_send.assert_called()
+        mock_send_digests.apply_async.assert_called_once()
+        digests = mock_send_digests.apply_async.call_args.kwargs["kwargs"]["digests"]
+        self.assertEqual(len(digests), 1)
+        self.assertEqual(digests[0]["user_id"], self.user.pk)
+        self.assertEqual(
+            sorted(Decimal(entry["deposit"]) for entry in digests[0]["entries"]),
+            [-1000, -500],
+        )
+        mock_logger.info.assert_called_with(
+            "Queued %s notification tasks for %s users with %s overdue accounts",
+            1,
+            1,
+            2,
+        )
+        self.assertEqual(
+            digests[0]["accounts"],
+            {
+                "alliance": [alliance_account.pk],
+                "corporation": [corporation_account.pk],
+            },
+        )
+        alliance_account.refresh_from_db()
+        self.assertIsNone(alliance_account.last_notification)
+        previous_notification = notified_account.last_notification
+        notified_account.refresh_from_db()
+        self.assertEqual(notified_account.last_notification, previous_notification)
+
+        # Sent accounts are skipped on the next run
+        with patch(TASKS_PATH + ".send_user_notification"):
+            _send_notification_digests(digests=digests)
+        for account in (alliance_account, corporation_account):
+            account.refresh_from_db()
+            self.assertIsNotNone(account.last_notification)
+            self.assertIsNotNone(account.next_notification_at)
+        mock_send_digests.reset_mock()
+        check_account_deposit()
+        mock_send_digests.apply_async.assert_not_called()
 
     @patch(TASKS_PATH + ".send_user_notification")
-    def test_send_alliance_notification(self, mock_send):
+    def test_send_notification_digests(self, mock_send):
         """
-        Test sending alliance notification.
+        Test sending notification digests.
 
         Results:
-            - Alliance notification is sent correctly.
+            - One notification is sent per user with all owners.
+            - The accounts of sent digests are marked as notified.
+            - The accounts of a failed digest are not marked.
         """
         # Test Data
-        audit = AllianceOwnerFactory(user=self.user)
-        AllianceTaxAccountFactory(
-            owner=audit,
-            name="Test Account",
+        corporation_account = CorporationTaxAccountFactory(
+            owner=CorporationOwnerFactory(user=self.user),
             user=self.user,
-            deposit=-1000,
-            status="active",
+            deposit=-500,
+        )
+        other_user = UserMainFactory()
+        other_account = CorporationTaxAccountFactory(
+            owner=CorporationOwnerFactory(user=other_user),
+            user=other_user,
+            deposit=-500,
         )
+        digests = [
+            {
+                "user_id": self.user.pk,
+                "entries": [
+                    {
+                        "owner": "Alliance",
+                        "tax_message": "Pay up.",
+                        "deposit": "-1000.00",
+                        "url": "http://localhost/alliance",
+                    },
+                    {
+                        "owner": "Corporation",
+                        "tax_message": "",
+                        "deposit": "-500.00",
+                        "url": "http://localhost/corporation",
+                    },
+                ],
+                "accounts": {"corporation": [corporation_account.pk]},
+            },
+            {
+                "user_id": other_user.pk,
+                "entries": [],
+                "accounts": {"corporation": [other_account.pk]},
+            },
+        ]
+        mock_send.side_effect = [None, RuntimeError("Discord down")]
 
         # Test Action
-        _send_alliance_notification(owner_eve_id=audit.eve_alliance.alliance_id)
+        with self.assertRaises(RuntimeError):
+            _send_notification_digests(digests=digests)
 
         # Expected Result
-        mock_send.assert_called()
+        message = mock_send.call_args_list[0].kwargs["message"]
+        self.assertIn("`Alliance`", message)
+        self.assertIn("`Corporation`", message)
+        self.assertIn("http://localhost/corporation", message)
+        corporation_account.refresh_from_db()
+        self.assertIsNotNone(corporation_account.last_notification)
+        other_account.refresh_from_db()
+        self.assertIsNone(other_account.last_notification)
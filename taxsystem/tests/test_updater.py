@@ -14,7 +14,11 @@ from esi.exceptions import HTTPClientError, HTTPNotModified, HTTPServerError
 
 # AA TaxSystem
 from taxsystem.models.corporation import CorporationUpdateStatus
-from taxsystem.models.general import UpdateSectionResult, _NeedsUpdate
+from taxsystem.models.general import (
+    MetricRollup,
+    UpdateSectionResult,
+    _NeedsUpdate,
+)
 from taxsystem.models.helpers.textchoices import (
     CorporationUpdateSection,
 )
@@ -324,6 +328,11 @@ class TestUpdateManager(TaxSystemTestCase):
         self.assertIsInstance(result, UpdateSectionResult)
         self.assertTrue(result.is_changed)
         self.assertTrue(result.is_updated)
+        # The run is added to the metric rollup of the section
+        rollup = MetricRollup.objects.get(name="section.wallet")
+        self.assertEqual(rollup.owner_id, self.audit.eve_id)
+        self.assertEqual(rollup.runs, 1)
+        self.assertEqual(rollup.errors, 0)
 
     def test_perform_update_status_token_error(self):
         """
@@ -361,6 +370,7 @@ class TestUpdateManager(TaxSystemTestCase):
         self.assertFalse(status_obj.is_success)
         self.assertFalse(status_obj.has_token_error)
         self.assertIn("ValueError: Token error occurred.", status_obj.error_message)
+        self.assertEqual(MetricRollup.objects.get(name="section.wallet").errors, 1)
 
     def test_perform_update_Status_httpserver_error(self):
         """
@@ -615,6 +615,7 @@ class CorporationPaymentHistoryFactory(
         django_get_or_create = ("payment", "user", "new_status", "action")
 
     payment = factory.SubFactory(CorporationPaymentsFactory)
+    owner = factory.SelfAttribute("payment.owner")
     new_status = factory.fuzzy.FuzzyChoice(PaymentRequestStatus.values)
     user = factory.SubFactory(UserMainFactory)
     date = factory.fuzzy.FuzzyDateTime(
@@ -635,6 +636,7 @@ class AlliancePaymentHistoryFactory(
         django_get_or_create = ("payment", "user", "new_status", "action")
 
     payment = factory.SubFactory(AlliancePaymentsFactory)
+    owner = factory.SelfAttribute("payment.owner")
     new_status = factory.fuzzy.FuzzyChoice(PaymentRequestStatus.values)
     user = factory.SubFactory(UserMainFactory)
     date = factory.fuzzy.FuzzyDateTime(
@@ -13,6 +13,7 @@ urlpatterns = [
     # -- Tax System
     path("", views.index, name="index"),
     path("admin/", views.admin, name="admin"),
+    path("metrics/", views.metrics, name="metrics"),
     # -- Add Corporation/Alliance
     path("corporation/add/", views.add_corp, name="add_corp"),
     path("alliance/add/", views.add_alliance, name="add_alliance"),
@@ -1,12 +1,18 @@
 """PvE Views"""
 
+# Standard Library
+import datetime as dt
+import hmac
+
 # Django
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.handlers.wsgi import WSGIRequest
 from django.db import IntegrityError, transaction
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 
@@ -27,7 +33,9 @@ from taxsystem.api.helpers.core import (
     get_manage_owner,
     get_owner,
 )
+from taxsystem.app_settings import TAXSYSTEM_METRICS_TOKEN
 from taxsystem.helpers import lazy
+from taxsystem.helpers.instrumentation import render_prometheus
 from taxsystem.models.alliance import (
     AllianceOwner,
 )
@@ -35,11 +43,34 @@ from taxsystem.models.corporation import (
     CorporationOwner,
     Members,
 )
+from taxsystem.models.general import MetricRollup
 from taxsystem.models.helpers.textchoices import AccountStatus, AdminActions
 from taxsystem.providers import AppLogger
 
 logger = AppLogger(get_extension_logger(__name__), __title__)
 
+# Time window of the metrics on the admin view and the Prometheus endpoint
+METRICS_SUMMARY_WINDOW = dt.timedelta(hours=24)
+# Number of metric rows shown on the admin view
+METRICS_SUMMARY_ROWS = 50
+
+
+def _get_metrics_summary() -> tuple[list[dict], dict[int, str]]:
+    """Get the metric summaries of the summary window and the names of their owners."""
+    rows = list(MetricRollup.objects.summary(timezone.now() - METRICS_SUMMARY_WINDOW))
+    owner_ids = {row["owner_id"] for row in rows}
+    owner_names = dict(
+        CorporationOwner.objects.filter(
+            eve_corporation__corporation_id__in=owner_ids
+        ).values_list("eve_corporation__corporation_id", "name")
+    )
+    owner_names.update(
+        AllianceOwner.objects.filter(
+            eve_alliance__alliance_id__in=owner_ids
+        ).values_list("eve_alliance__alliance_id", "name")
+    )
+    return rows, owner_names
+
 
 @login_required
 @permission_required("taxsystem.basic_access")
@@ -126,13 +157,40 @@ def admin(request: WSGIRequest):
         if request.POST.get("run_taxsystem_alliance_updates"):
             _handle_alliance_updates(force_refresh)
 
+    metric_rows, owner_names = _get_metrics_summary()
+    for row in metric_rows:
+        row["owner_name"] = owner_names.get(row["owner_id"], "")
+
     context = {
         "corporation_id": corporation_id,
         "title": _("Tax System Superuser Administration"),
+        "metrics": metric_rows[:METRICS_SUMMARY_ROWS],
     }
     return render(request, "taxsystem/admin.html", context=context)
 
 
+def metrics(request: WSGIRequest):
+    """
+    Prometheus metrics of the update sections and API requests
+
+    Superusers can always access the metrics,
+    scrapers authenticate with the TAXSYSTEM_METRICS_TOKEN as bearer token.
+    """
+    authorization = request.headers.get("Authorization", "")
+    # compare_digest only accepts ASCII strings, the header is sent by the client
+    has_token = bool(TAXSYSTEM_METRICS_TOKEN) and hmac.compare_digest(
+        authorization.encode(), f"Bearer {TAXSYSTEM_METRICS_TOKEN}".encode()
+    )
+    if not has_token and not request.user.is_superuser:
+        return HttpResponseForbidden()
+
+    rows, owner_names = _get_metrics_summary()
+    return HttpResponse(
+        render_prometheus(rows, owner_names),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @login_required
 @permission_required("taxsystem.basic_access")
 def index(request: WSGIRequest):  # pylint: disable=unused-argument
@@ -145,6 +203,12 @@ def index(request: WSGIRequest):  # pylint: disable=unused-argument
         HttpResponse: Rendered owner overview template with combined owner list
     """
     owner_list = []
+    can_manage_corporations = request.user.has_perm(
+        "taxsystem.manage_own_corp"
+    ) or request.user.has_perm("taxsystem.manage_corps")
+    can_manage_alliances = request.user.has_perm(
+        "taxsystem.manage_own_alliance"
+    ) or request.user.has_perm("taxsystem.manage_alliances")
 
     # Get all Corporations the user can see with their permissions
     corporations = (
@@ -152,6 +216,8 @@ def index(request: WSGIRequest):  # pylint: disable=unused-argument
         .select_related("eve_corporation")
         .order_by("eve_corporation__corporation_name")
     )
+    if can_manage_corporations:
+        corporations = corporations.annotate_open_invoices()
     for corporation in corporations:
         owner_list.append(
             {
@@ -166,9 +232,7 @@ def index(request: WSGIRequest):  # pylint: disable=unused-argument
                     as_html=True,
                 ),
                 "active": corporation.active,
-                "open_invoices": corporation.payment_model.objects.get_owner_open_invoices(
-                    user=request.user, owner=corporation
-                ),
+                "open_invoices": getattr(corporation, "open_invoices", 0),
                 "actions": "",
             }
         )
@@ -178,6 +242,8 @@ def index(request: WSGIRequest):  # pylint: disable=unused-argument
         .select_related("eve_alliance")
         .order_by("eve_alliance__alliance_name")
     )
+    if can_manage_alliances:
+        alliances = alliances.annotate_open_invoices()
     for alliance in alliances:
         owner_list.append(
             {
@@ -192,9 +258,7 @@ def index(request: WSGIRequest):  # pylint: disable=unused-argument
                     as_html=True,
                 ),
                 "active": alliance.active,
-                "open_invoices": alliance.payment_model.objects.get_owner_open_invoices(
-                    user=request.user, owner=alliance
-                ),
+                "open_invoices": getattr(alliance, "open_invoices", 0),
                 "actions": "",
             }
         )